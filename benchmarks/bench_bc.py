@@ -0,0 +1,66 @@
+"""
+Block engine: message hashing, signing and verification, single and multi-recipient
+encryption.
+"""
+import json
+import random
+
+from copy import deepcopy
+
+from .fixtures import get_engine, make_payload_output
+
+
+N_RECEIVERS = 10
+
+
+class SignVerify:
+  def setup(self):
+    self.engine = get_engine('node')
+    self.receiver = get_engine('receiver')
+    self.msg = make_payload_output(random.Random(0), node=self.engine.address)
+    self.signed = deepcopy(self.msg)
+    self.engine.sign(self.signed)
+    # as received from the network
+    self.received = json.loads(json.dumps(self.signed))
+    return
+
+  def time_compute_hash(self):
+    self.engine.compute_hash(self.msg)
+
+  def time_sign(self):
+    self.engine.sign(dict(self.msg))
+
+  def time_verify(self):
+    self.receiver.verify(self.received)
+
+
+class Encryption:
+  def setup(self):
+    self.sender = get_engine('node')
+    self.receivers = [get_engine('receiver_{}'.format(i)) for i in range(N_RECEIVERS)]
+    self.receiver = self.receivers[0]
+    self.addresses = [receiver.address for receiver in self.receivers]
+    # a deploy command sized plaintext
+    self.plaintext = json.dumps({
+      'PIPELINE': make_payload_output(random.Random(1), n_fields=100),
+      'PLUGINS': [make_payload_output(random.Random(i), n_fields=20) for i in range(5)],
+    })
+    self.encrypted = self.sender.encrypt(plaintext=self.plaintext, receiver_address=self.receiver.address)
+    self.encrypted_multi = self.sender.encrypt_for_multi(
+      plaintext=self.plaintext, receiver_addresses=self.addresses,
+    )
+    # the last receiver has to go through all the keys of the package
+    self.last_receiver = self.receivers[-1]
+    return
+
+  def time_encrypt(self):
+    self.sender.encrypt(plaintext=self.plaintext, receiver_address=self.receiver.address)
+
+  def time_decrypt(self):
+    self.receiver.decrypt(self.encrypted, self.sender.address)
+
+  def time_encrypt_for_multi(self):
+    self.sender.encrypt_for_multi(plaintext=self.plaintext, receiver_addresses=self.addresses)
+
+  def time_decrypt_for_multi(self):
+    self.last_receiver.decrypt_for_multi(self.encrypted_multi, self.sender.address)
@@ -0,0 +1,39 @@
+"""
+Remote custom code execution: `BaseCodeChecker.exec_code` on an already seen code blob
+(prepared code cache hit) and on a new one (decode, safety checks and compile).
+"""
+from ratio1.code_cheker.base import BaseCodeChecker
+
+
+CUSTOM_CODE = """
+data = [{'idx': i, 'value': (i * 7919) % 1000 / 10, 'type': 'person' if i % 3 else 'car'} for i in range(200)]
+persons = [d for d in data if d['type'] == 'person']
+cars = [d for d in data if d['type'] == 'car']
+stats = {}
+for group, items in [('persons', persons), ('cars', cars)]:
+  values = sorted(d['value'] for d in items)
+  stats[group] = {
+    'count': len(values),
+    'mean': sum(values) / len(values),
+    'median': values[len(values) // 2],
+    'max': values[-1],
+  }
+alerts = [d['idx'] for d in persons if d['value'] > 95]
+result = {'stats': stats, 'alerts': alerts}
+"""
+
+
+class ExecCode:
+  def setup(self):
+    self.checker = BaseCodeChecker()
+    self.b64code = self.checker.code_to_base64(CUSTOM_CODE)
+    result, errors, _ = self.checker.exec_code(self.b64code, modify=False)
+    assert errors is None and result['stats']['persons']['count'] > 0, errors
+    return
+
+  def time_exec_code_cached(self):
+    self.checker.exec_code(self.b64code, modify=False)
+
+  def time_exec_code_new(self):
+    self.checker.clear_code_cache()
+    self.checker.exec_code(self.b64code, modify=False)
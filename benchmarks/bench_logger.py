@@ -0,0 +1,32 @@
+"""
+Logger `P()` throughput: a log line recorded (and saved to the log file) without being shown,
+and formatted for display with the output discarded.
+"""
+import contextlib
+import os
+
+from .fixtures import get_logger
+
+
+N_LINES = 100
+
+
+class LoggerP:
+  def setup(self):
+    self.log = get_logger()
+    self.lines = ["Received payload {} from <0xai_bench_node:pipeline-{}>".format(i, i % 10) for i in range(N_LINES)]
+    self.devnull = open(os.devnull, 'w')
+    return
+
+  def teardown(self):
+    self.devnull.close()
+    return
+
+  def time_P_not_shown(self):
+    for line in self.lines:
+      self.log.P(line, show=False)
+
+  def time_P_shown(self):
+    with contextlib.redirect_stdout(self.devnull):
+      for line in self.lines:
+        self.log.P(line, color='g', show=True)
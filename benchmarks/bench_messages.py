@@ -0,0 +1,66 @@
+"""
+Receive path of the session: raw message -> (decrypt) -> formatter decode, and the v2
+heartbeat decode. Each call processes a batch of `N_MESSAGES` messages.
+"""
+import json
+
+from ratio1.base import GenericSession
+from ratio1.const import HB
+
+from .fixtures import (
+  get_engine, get_formatter, get_formatter_wrapper, get_logger,
+  make_heartbeat_messages, make_payload_messages,
+)
+
+
+N_MESSAGES = 100
+
+
+def make_parsing_session(engine):
+  """
+  A session object that is not started (no connection): `__parse_message` only uses the
+  block engine and the formatters.
+  """
+  session = GenericSession.__new__(GenericSession)
+  session.log = get_logger()
+  session.bc_engine = engine
+  session.formatter_wrapper = get_formatter_wrapper()
+  return session
+
+
+class ParseMessage:
+  def setup(self):
+    receiver = get_engine('receiver')
+    self.parse_message = make_parsing_session(receiver)._GenericSession__parse_message
+    self.payloads = make_payload_messages(N_MESSAGES)
+    self.encrypted_payloads = make_payload_messages(N_MESSAGES, encrypted_for=[receiver.address])
+    self.heartbeats = make_heartbeat_messages(N_MESSAGES)
+    self.log = get_logger()
+    return
+
+  def time_parse_payloads(self):
+    for message in self.payloads:
+      self.parse_message(json.loads(message))
+
+  def time_parse_encrypted_payloads(self):
+    for message in self.encrypted_payloads:
+      self.parse_message(json.loads(message))
+
+  def time_decode_heartbeats(self):
+    # same steps as the session: parse, then decompress the v2 heartbeat data
+    for message in self.heartbeats:
+      dict_msg = self.parse_message(json.loads(message))
+      data = json.loads(self.log.decompress_text(dict_msg[HB.ENCODED_DATA]))
+      dict_msg = {**dict_msg, **data}
+
+
+class FormatterDecode:
+  def setup(self):
+    self.formatter = get_formatter()
+    self.payloads = [json.loads(message) for message in make_payload_messages(N_MESSAGES)]
+    return
+
+  def time_decode_output(self):
+    # decoding works in place: only the two levels it changes are copied
+    for msg in self.payloads:
+      self.formatter.decode_output({**msg, 'DATA': dict(msg['DATA'])})
@@ -0,0 +1,66 @@
+"""
+Transactions: dispatching notifications to many open transactions (as the session does for
+every received notification) and resolving them.
+"""
+from ratio1.base.responses import PipelineOKResponse, PluginConfigOKResponse
+from ratio1.base.transaction import Transaction
+from ratio1.const import NOTIFICATION_CODES
+
+from .fixtures import get_logger, make_notification
+
+
+N_OPEN = 1000
+N_NOTIFICATIONS = 100
+N_RESOLVE = 100
+NODE = '0xai_bench_node'
+SIGNATURE = 'OBJECT_TRACKING_01'
+
+
+def create_transactions(log, n):
+  return [
+    Transaction(log, 'bench', lst_required_responses=[
+      PipelineOKResponse(NODE, 'pipeline-{}'.format(i)),
+      PluginConfigOKResponse(NODE, 'pipeline-{}'.format(i), SIGNATURE, 'inst-0'),
+    ])
+    for i in range(n)
+  ]
+
+
+def dispatch(open_transactions, notification):
+  # same steps as `GenericSession.__on_notification` and `__handle_open_transactions`
+  for transaction in open_transactions.copy():
+    transaction.handle_notification(notification)
+  solved = [i for i, transaction in enumerate(open_transactions) if transaction.is_solved()]
+  for idx in reversed(solved):
+    open_transactions[idx].callback()
+    open_transactions.pop(idx)
+  return
+
+
+class OpenTransactions:
+  def setup(self):
+    self.log = get_logger()
+    self.open_transactions = create_transactions(self.log, N_OPEN)
+    # notifications of running pipelines that do not solve any transaction
+    self.unrelated = [
+      make_notification(NODE, 'pipeline-{}'.format(i), NOTIFICATION_CODES.PIPELINE_DATA_OK)
+      for i in range(N_NOTIFICATIONS)
+    ]
+    self.resolving = []
+    for i in range(N_RESOLVE):
+      self.resolving.append(make_notification(NODE, 'pipeline-{}'.format(i), NOTIFICATION_CODES.PIPELINE_OK))
+      self.resolving.append(make_notification(
+        NODE, 'pipeline-{}'.format(i), NOTIFICATION_CODES.PLUGIN_CONFIG_OK, signature=SIGNATURE,
+      ))
+    # endfor
+    return
+
+  def time_dispatch_unrelated_notifications(self):
+    for notification in self.unrelated:
+      dispatch(self.open_transactions, notification)
+
+  def time_create_and_resolve_all(self):
+    open_transactions = create_transactions(self.log, N_RESOLVE)
+    for notification in self.resolving:
+      dispatch(open_transactions, notification)
+    assert len(open_transactions) == 0
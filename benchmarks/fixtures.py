@@ -0,0 +1,211 @@
+"""
+Synthetic but realistic fixtures shared by the benchmarks: a logger writing to a temporary
+folder, block engines with temporary keys, and network messages built the way the edge nodes
+build them (aixp1 formatted, signed, optionally encrypted, v2 heartbeats with compressed data).
+
+Everything is generated locally from a fixed seed - no network access is needed.
+"""
+import atexit
+import json
+import random
+import shutil
+import tempfile
+
+from ratio1 import Logger
+from ratio1.bc import DefaultBlockEngine
+from ratio1.const import HB, PAYLOAD_DATA
+from ratio1.io_formatter import IOFormatterWrapper
+
+
+SEED = 42
+FORMATTER = 'aixp1'
+
+_CACHE = {}
+
+
+def _cached(key, factory):
+  if key not in _CACHE:
+    _CACHE[key] = factory()
+  return _CACHE[key]
+
+
+def get_temp_folder():
+  def _create():
+    folder = tempfile.mkdtemp(prefix="ratio1_bench_")
+    atexit.register(shutil.rmtree, folder, ignore_errors=True)
+    return folder
+  return _cached('folder', _create)
+
+
+def get_logger():
+  return _cached('log', lambda: Logger(
+    "BENCH", base_folder=get_temp_folder(), app_folder="_local_cache", silent=True,
+  ))
+
+
+def get_engine(name):
+  """
+  A block engine with its own (temporary) private key.
+  """
+  return _cached('engine_' + name, lambda: DefaultBlockEngine(
+    log=get_logger(), name="bench_" + name, verbosity=0,
+    config={
+      "PEM_FILE": "bench_{}.pem".format(name),
+      "PASSWORD": None,
+      "PEM_LOCATION": "data",
+    },
+  ))
+
+
+def get_formatter_wrapper():
+  return _cached('formatter_wrapper', lambda: IOFormatterWrapper(get_logger()))
+
+
+def get_formatter():
+  return get_formatter_wrapper().get_formatter_by_name(FORMATTER)
+
+
+def make_payload_output(rnd, node="node-0", pipeline="pipeline-0", signature="OBJECT_TRACKING_01",
+                        instance="inst-0", n_fields=30):
+  """
+  A plugin output (before formatting): the envelope fields, the plugin and pipeline meta
+  (`_P_`/`_C_` prefixed) and the plugin specific fields.
+  """
+  output = {
+    PAYLOAD_DATA.EE_EVENT_TYPE: 'PAYLOAD',
+    'EE_MESSAGE_ID': "{:032x}".format(rnd.getrandbits(128)),
+    'EE_MESSAGE_SEQ': rnd.randint(1, 100000),
+    'EE_TOTAL_MESSAGES': rnd.randint(100000, 200000),
+    'EE_TIMESTAMP': '2025-03-01 10:00:{:02d}.{:06d}'.format(rnd.randint(0, 59), rnd.randint(0, 999999)),
+    'EE_TIMEZONE': 'UTC+2',
+    'EE_TZ': 'Europe/Bucharest',
+    'EE_VERSION': '2.7.50',
+    'EE_ID': node,
+    'STREAM_NAME': pipeline,
+    'SIGNATURE': signature,
+    'INSTANCE_ID': instance,
+    'STREAM': pipeline,
+    'PIPELINE': pipeline,
+    'SESSION_ID': None,
+    'INITIATOR_ID': 'bench',
+  }
+  for i in range(15):
+    output['_P_META_{}'.format(i)] = rnd.choice([rnd.random(), rnd.randint(0, 1000), 'value-{}'.format(i), None])
+  for i in range(10):
+    output['_C_META_{}'.format(i)] = rnd.choice([rnd.random(), 'rtsp://camera-{}.local/stream'.format(i), True])
+  for i in range(n_fields):
+    output['FIELD_{}'.format(i)] = rnd.choice([
+      rnd.random(),
+      rnd.randint(0, 10 ** 6),
+      'text-{}'.format(rnd.getrandbits(32)),
+      [rnd.random() for _ in range(8)],
+      {'TLBR_POS': [rnd.randint(0, 1080) for _ in range(4)], 'PROB_PRC': rnd.random(), 'TYPE': 'person'},
+    ])
+  # endfor fields
+  return output
+
+
+def make_heartbeat_data(rnd, node="node-0", n_pipelines=10):
+  """
+  The content of a (v2) heartbeat: node status, resources and the running pipelines.
+  """
+  data = {
+    'EE_ID': node,
+    'EE_ADDR': '0xai_' + node,
+    'CURRENT_TIME': '2025-03-01 10:00:00.000000',
+    'UPTIME': rnd.random() * 10 ** 6,
+    'VERSION': '2.7.50',
+    'CPU_USED': rnd.random() * 100,
+    'AVAILABLE_MEMORY': rnd.random() * 64,
+    'AVAILABLE_DISK': rnd.random() * 1000,
+    'GPUS': [{'NAME': 'GPU {}'.format(i), 'GPU_USED': rnd.random() * 100, 'TOTAL_MEM': 24.0} for i in range(2)],
+    'LOOPS_TIMINGS': {'LOOP_{}'.format(i): rnd.random() for i in range(20)},
+    HB.EE_WHITELIST: ['0xai_{:040x}'.format(rnd.getrandbits(160)) for _ in range(10)],
+    HB.CONFIG_STREAMS: [
+      {
+        'NAME': 'pipeline-{}'.format(p),
+        'TYPE': 'VideoStream',
+        'URL': 'rtsp://camera-{}.local/stream'.format(p),
+        'PLUGINS': [{
+          'SIGNATURE': 'OBJECT_TRACKING_01',
+          'INSTANCES': [{'INSTANCE_ID': 'inst-{}'.format(i), 'PROCESS_DELAY': 1} for i in range(3)],
+        }],
+      }
+      for p in range(n_pipelines)
+    ],
+  }
+  return data
+
+
+def _format_and_sign(output, sender, destination=None):
+  log = get_logger()
+  formatter = get_formatter()
+  path = [output.get('EE_ID'), output.get('STREAM_NAME'), output.get('SIGNATURE'), output.get('INSTANCE_ID')]
+  msg = formatter._encode_output(output)
+  msg[PAYLOAD_DATA.EE_EVENT_TYPE] = output[PAYLOAD_DATA.EE_EVENT_TYPE]
+  msg[PAYLOAD_DATA.EE_PAYLOAD_PATH] = path
+  msg[PAYLOAD_DATA.EE_FORMATTER] = FORMATTER
+  msg['EE_TIMESTAMP'] = output.get('EE_TIMESTAMP')
+  if destination is not None:
+    # the formatted message is encrypted for the destination, only the envelope stays clear
+    str_data = json.dumps({k: v for k, v in msg.items() if k == 'DATA'})
+    msg.pop('DATA')
+    msg[PAYLOAD_DATA.EE_IS_ENCRYPTED] = True
+    msg[PAYLOAD_DATA.EE_DESTINATION] = destination
+    msg[PAYLOAD_DATA.EE_ENCRYPTED_DATA] = sender.encrypt(
+      plaintext=str_data, receiver_address=destination if len(destination) > 1 else destination[0],
+    )
+  sender.sign(msg)
+  return log.safe_dumps_json(msg, replace_nan=False, ensure_ascii=False)
+
+
+def make_payload_messages(n, encrypted_for=None, seed=SEED):
+  """
+  `n` raw (JSON) payload messages signed by the "node" engine, optionally encrypted for the
+  given list of receiver addresses.
+  """
+  rnd = random.Random(seed)
+  node = get_engine('node')
+  return [
+    _format_and_sign(
+      make_payload_output(
+        rnd, node=node.address, pipeline='pipeline-{}'.format(i % 10), instance='inst-{}'.format(i % 3),
+      ),
+      sender=node, destination=encrypted_for,
+    )
+    for i in range(n)
+  ]
+
+
+def make_heartbeat_messages(n, n_pipelines=10, seed=SEED):
+  """
+  `n` raw (JSON) v2 heartbeats: the heartbeat data is compressed in `ENCODED_DATA`.
+  """
+  rnd = random.Random(seed)
+  log = get_logger()
+  node = get_engine('node')
+  messages = []
+  for _ in range(n):
+    output = {
+      PAYLOAD_DATA.EE_EVENT_TYPE: 'HEARTBEAT',
+      'EE_ID': node.address,
+      'EE_TIMESTAMP': '2025-03-01 10:00:00.000000',
+      HB.HEARTBEAT_VERSION: HB.V2,
+      HB.ENCODED_DATA: log.compress_text(json.dumps(make_heartbeat_data(rnd, n_pipelines=n_pipelines))),
+    }
+    messages.append(_format_and_sign(output, sender=node))
+  # endfor
+  return messages
+
+
+def make_notification(node, pipeline, code, signature='OBJECT_TRACKING_01', instance='inst-0'):
+  """
+  A decoded pipeline/plugin notification (see `NOTIFICATION_CODES`).
+  """
+  return {
+    PAYLOAD_DATA.EE_EVENT_TYPE: 'NOTIFICATION',
+    PAYLOAD_DATA.EE_PAYLOAD_PATH: [node, pipeline, signature, instance],
+    PAYLOAD_DATA.SESSION_ID: 'bench',
+    PAYLOAD_DATA.NOTIFICATION: 'Notification {} for {}'.format(code, pipeline),
+    'NOTIFICATION_CODE': code,
+  }
@@ -0,0 +1,186 @@
+"""
+Runs the benchmarks without any extra dependency and fully offline.
+
+The benchmarks follow the asv conventions: classes in the `bench_*.py` modules with optional
+`setup`/`teardown` methods and the timed `time_*` methods.
+
+Usage (from the repository root):
+  python -m benchmarks.run [-k FILTER] [--quick] [--save FILE] [--compare FILE] [--threshold RATIO]
+
+  -k FILTER       only the benchmarks whose name contains FILTER (e.g. `-k bc.Encryption`)
+  --quick         shorter runs, for a smoke check
+  --save FILE     save the results as JSON (e.g. as a baseline)
+  --compare FILE  compare with saved results; exits with code 1 if a benchmark is slower
+                  than the baseline by more than the threshold ratio (default 1.2)
+"""
+import argparse
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import platform
+import statistics
+import sys
+import time
+
+
+MIN_REPEAT_TIME = 0.2
+REPEATS = 5
+QUICK_MIN_REPEAT_TIME = 0.02
+QUICK_REPEATS = 2
+DEFAULT_THRESHOLD = 1.2
+
+
+def discover():
+  """
+  Returns the `(name, class)` of all the benchmark classes, e.g. `('bc.SignVerify', SignVerify)`.
+  """
+  package = importlib.import_module(__package__)
+  result = []
+  for module_info in sorted(pkgutil.iter_modules(package.__path__), key=lambda x: x.name):
+    if not module_info.name.startswith('bench_'):
+      continue
+    module = importlib.import_module('{}.{}'.format(__package__, module_info.name))
+    for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+      if cls.__module__ != module.__name__:
+        continue
+      if any(name.startswith('time_') for name in dir(cls)):
+        result.append(('{}.{}'.format(module_info.name[len('bench_'):], cls_name), cls))
+    # endfor classes
+  # endfor modules
+  return result
+
+
+def time_method(method, min_repeat_time, repeats):
+  """
+  Calibrates the number of calls so that a repeat takes at least `min_repeat_time` and
+  returns the per call timings of each repeat.
+  """
+  number = 1
+  while True:
+    start = time.perf_counter()
+    for _ in range(number):
+      method()
+    elapsed = time.perf_counter() - start
+    if elapsed >= min_repeat_time:
+      break
+    number = max(number * 2, int(number * min_repeat_time / max(elapsed, 1e-9) * 1.1))
+  # endwhile calibration
+  timings = [elapsed / number]
+  for _ in range(repeats - 1):
+    start = time.perf_counter()
+    for _ in range(number):
+      method()
+    timings.append((time.perf_counter() - start) / number)
+  # endfor repeats
+  return number, timings
+
+
+def format_time(seconds):
+  for unit, factor in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+    if seconds >= factor:
+      return '{:.3f} {}'.format(seconds / factor, unit)
+  return '{:.1f} ns'.format(seconds * 1e9)
+
+
+def run(name_filter=None, quick=False):
+  min_repeat_time = QUICK_MIN_REPEAT_TIME if quick else MIN_REPEAT_TIME
+  repeats = QUICK_REPEATS if quick else REPEATS
+  results = {}
+  for cls_name, cls in discover():
+    methods = sorted(name for name in dir(cls) if name.startswith('time_'))
+    methods = [m for m in methods if name_filter is None or name_filter in '{}.{}'.format(cls_name, m)]
+    if len(methods) == 0:
+      continue
+    bench = cls()
+    if hasattr(bench, 'setup'):
+      bench.setup()
+    try:
+      for method_name in methods:
+        name = '{}.{}'.format(cls_name, method_name)
+        number, timings = time_method(getattr(bench, method_name), min_repeat_time, repeats)
+        results[name] = {
+          'min': min(timings),
+          'median': statistics.median(timings),
+          'number': number,
+          'repeat': repeats,
+        }
+        print('{:<60} {:>12} (min {:>12}, {} x {})'.format(
+          name, format_time(results[name]['median']), format_time(results[name]['min']), number, repeats,
+        ), flush=True)
+      # endfor methods
+    finally:
+      if hasattr(bench, 'teardown'):
+        bench.teardown()
+  # endfor classes
+  return results
+
+
+def compare(results, baseline, threshold):
+  """
+  Prints the ratio of the current over the baseline minimum timings and returns the names
+  of the benchmarks slower than `threshold` times the baseline.
+  """
+  regressions = []
+  print('\n{:<60} {:>12} {:>12} {:>8}'.format('benchmark', 'baseline', 'current', 'ratio'))
+  for name, result in results.items():
+    base = baseline.get(name)
+    if base is None:
+      print('{:<60} {:>12} {:>12}'.format(name, '-', format_time(result['min'])))
+      continue
+    ratio = result['min'] / base['min']
+    flag = ''
+    if ratio > threshold:
+      flag = '  SLOWER'
+      regressions.append(name)
+    elif ratio < 1 / threshold:
+      flag = '  faster'
+    print('{:<60} {:>12} {:>12} {:>8.2f}{}'.format(
+      name, format_time(base['min']), format_time(result['min']), ratio, flag,
+    ))
+  # endfor results
+  return regressions
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Runs the ratio1 SDK benchmarks")
+  parser.add_argument('-k', dest='name_filter', default=None, help="only the benchmarks containing this text")
+  parser.add_argument('--quick', action='store_true', help="shorter runs, for a smoke check")
+  parser.add_argument('--save', default=None, help="save the results as JSON")
+  parser.add_argument('--compare', default=None, help="compare with results saved with --save")
+  parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="regression ratio for --compare")
+  args = parser.parse_args()
+
+  from ratio1 import version
+  print("ratio1 {} | Python {} | {} | {} CPUs".format(
+    version, platform.python_version(), platform.platform(), os.cpu_count(),
+  ))
+  results = run(name_filter=args.name_filter, quick=args.quick)
+
+  if args.save is not None:
+    with open(args.save, 'w') as fh:
+      json.dump({
+        'meta': {
+          'ratio1': version,
+          'python': platform.python_version(),
+          'platform': platform.platform(),
+          'cpus': os.cpu_count(),
+          'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        },
+        'results': results,
+      }, fh, indent=2)
+    print("Saved results to {}".format(args.save))
+
+  if args.compare is not None:
+    with open(args.compare) as fh:
+      baseline = json.load(fh)['results']
+    regressions = compare(results, baseline, args.threshold)
+    if len(regressions) > 0:
+      print("\n{} benchmark(s) slower than {:.2f}x the baseline".format(len(regressions), args.threshold))
+      sys.exit(1)
+  return
+
+
+if __name__ == '__main__':
+  main()
@@ -1,16 +1,40 @@
-from .base import Payload
-from .base import Pipeline
-from .base import Instance
-from .base import CustomPluginTemplate
-from .base import DistributedCustomCodePresets
-from .default import MqttSession as Session
-from .utils import load_dotenv
 from ._ver import __VER__ as version
 from ._ver import __VER__ as __version__
-from .base_decentra_object import BaseDecentrAIObject
-from .plugins_manager_mixin import _PluginsManagerMixin
-from .logging import Logger
-from .code_cheker import BaseCodeChecker
-from .const import PLUGIN_SIGNATURES, PAYLOAD_DATA
-from .const import HB as HEARTBEAT_DATA
-from .default.instance import PLUGIN_TYPES
+
+# The public API is imported on first access (PEP 562) so that `import ratio1` and the
+# r1ctl commands that do not need a session do not pay for pandas, web3, the logger
+# mixins etc.
+_LAZY_ATTRS = {
+  'Payload'                     : ('.base', 'Payload'),
+  'Pipeline'                    : ('.base', 'Pipeline'),
+  'Instance'                    : ('.base', 'Instance'),
+  'CustomPluginTemplate'        : ('.base', 'CustomPluginTemplate'),
+  'DistributedCustomCodePresets': ('.base', 'DistributedCustomCodePresets'),
+  'Session'                     : ('.default', 'MqttSession'),
+  'load_dotenv'                 : ('.utils', 'load_dotenv'),
+  'BaseDecentrAIObject'         : ('.base_decentra_object', 'BaseDecentrAIObject'),
+  '_PluginsManagerMixin'        : ('.plugins_manager_mixin', '_PluginsManagerMixin'),
+  'Logger'                      : ('.logging', 'Logger'),
+  'BaseCodeChecker'             : ('.code_cheker', 'BaseCodeChecker'),
+  'PLUGIN_SIGNATURES'           : ('.const', 'PLUGIN_SIGNATURES'),
+  'PAYLOAD_DATA'                : ('.const', 'PAYLOAD_DATA'),
+  'HEARTBEAT_DATA'              : ('.const', 'HB'),
+  'PLUGIN_TYPES'                : ('.default.instance', 'PLUGIN_TYPES'),
+}
+
+__all__ = ['version', '__version__', *_LAZY_ATTRS]
+
+
+def __getattr__(name):
+  target = _LAZY_ATTRS.get(name)
+  if target is None:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  import importlib
+  module_name, attr_name = target
+  value = getattr(importlib.import_module(module_name, __name__), attr_name)
+  globals()[name] = value  # next accesses are plain attribute lookups
+  return value
+
+
+def __dir__():
+  return sorted(set(globals()) | set(_LAZY_ATTRS))
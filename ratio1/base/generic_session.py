@@ -10,11 +10,10 @@ TODO:
 import json
 import os
 import traceback
-import pandas as pd
 
 from collections import deque, OrderedDict
 from datetime import datetime as dt
-from threading import Lock, Thread
+from threading import Condition, Lock, Thread
 from time import sleep
 from time import time as tm
 
@@ -29,10 +28,14 @@ from ..const import comms as comm_ct
 from ..io_formatter import IOFormatterWrapper
 from ..logging import Logger
 from ..utils import load_dotenv
+from ..utils.lazy_import import LazyImport
+from ..utils.sampling_profiler import DEFAULT_SAMPLE_RATE, DEFAULT_MAX_DEPTH
 from .payload import Payload
 from .pipeline import Pipeline
 from .webapp_pipeline import WebappPipeline
 from .transaction import Transaction
+from .node_registry import NodeRegistry
+from .network_snapshot import NetworkSnapshot
 from ..utils.config import (
   load_user_defined_config, get_user_config_file, get_user_folder, 
   seconds_to_short_format, log_with_color, set_client_alias,
@@ -41,6 +44,8 @@ from ..utils.config import (
 
 # from ..default.instance import PLUGIN_TYPES # circular import
 
+pd = LazyImport("pandas")
+
 
 
 DEBUG_MQTT_SERVER = "r9092118.ala.eu-central-1.emqxsl.com"
@@ -57,6 +62,8 @@ class GenericSession(BaseDecentrAIObject):
   """
   
   START_TIMEOUT = 30
+  # wait for live net-mon data when a network snapshot can answer meanwhile
+  SNAPSHOT_WAIT_TIMEOUT = 3
   
   
   default_config = {
@@ -108,6 +115,7 @@ class GenericSession(BaseDecentrAIObject):
               eth_enabled=True,
               auto_configuration=True,
               debug_env=False,              
+              network_snapshot=False,
               **kwargs
             ) -> None:
     """
@@ -205,6 +213,13 @@ class GenericSession(BaseDecentrAIObject):
     use_home_folder : bool, optional
         If True, the SDK will use the home folder as the base folder for the local cache.
         NOTE: if you need to use development style ./_local_cache, set this to False.
+
+    network_snapshot : bool, optional
+        If True, the session periodically saves a snapshot of the known nodes and of the supervisors
+        net-mon data in the local cache, and loads it at startup so that `get_network_known_nodes`
+        can answer from it (flagged as stale) until live data arrives: the startup then waits only
+        `SNAPSHOT_WAIT_TIMEOUT` seconds for the first net-mon. Restored nodes are not considered
+        online or peered. Defaults to False (r1ctl enables it for the network listings).
     """
     
     # TODO: clarify verbosity vs debug
@@ -229,6 +244,8 @@ class GenericSession(BaseDecentrAIObject):
     
     self.__at_least_one_node_peered = False
     self.__at_least_a_netmon_received = False
+    # signaled by the heartbeat, net-mon and net-config handlers so waits do not poll
+    self.__state_changed = Condition()
     
     # TODO: maybe read config from file?
     self._config = {**self.default_config, **config}
@@ -253,9 +270,11 @@ class GenericSession(BaseDecentrAIObject):
     self._dct_online_nodes_last_heartbeat: dict[str, dict] = {}
     self._dct_node_whitelist: dict[str, list] = {}
     self._dct_can_send_to_node: dict[str, bool] = {}
-    self._dct_node_last_seen_time = {} # key is node address
-    self.__dct_node_address_to_alias = {}
-    self.__dct_node_eth_addr_to_node_addr = {}
+    # address/alias/eth maps and the time-ordered last seen index of the nodes
+    self._node_registry = NodeRegistry()
+    self._dct_node_last_seen_time = self._node_registry.last_seen # key is node address
+    self.__dct_node_address_to_alias = self._node_registry.addr_to_alias
+    self.__dct_node_eth_addr_to_node_addr = self._node_registry.eth_to_addr
 
     self._dct_netconfig_pipelines_requests = {}
     
@@ -266,6 +285,12 @@ class GenericSession(BaseDecentrAIObject):
     # this is used to store data received from net-mon instances
     self.__current_network_statuses = {} 
 
+    # network snapshot - stale network listing loaded at startup until live net-mon arrives
+    self.__use_network_snapshot = network_snapshot
+    self.__network_snapshot : NetworkSnapshot = None
+    self.__network_snapshot_time = None
+    self.__stale_supervisors = set()
+
     self.__pwd = pwd or kwargs.get('password', kwargs.get('pass', None))
     self.__user = user or kwargs.get('username', None)
     self.__host = host or kwargs.get('hostname', None)
@@ -384,6 +409,8 @@ class GenericSession(BaseDecentrAIObject):
       self.log, plugin_search_locations=self.__formatter_plugins_locations
     )
     
+    self.__maybe_load_network_snapshot()
+
     obfuscated_pass = self._config[comm_ct.PASS][:3] + '*' * (len(self._config[comm_ct.PASS]) - 3) 
 
     msg = f"Connection to {self._config[comm_ct.USER]}:{obfuscated_pass}@{self._config[comm_ct.HOST]}:{self._config[comm_ct.PORT]} {'<secured>' if self._config[comm_ct.SECURED] else '<UNSECURED>'}"
@@ -569,7 +596,23 @@ class GenericSession(BaseDecentrAIObject):
       """
       return self.filter_workers is not None and node_addr not in self.filter_workers
 
-    def __track_online_node(self, node_addr, node_id, node_eth_address=None):
+    def _notify_state_change(self):
+      """
+      Wakes up all the threads waiting for nodes, configs or net-mon data.
+      """
+      with self.__state_changed:
+        self.__state_changed.notify_all()
+      return
+
+    def __wait_for_state(self, predicate, timeout):
+      """
+      Blocks until `predicate()` is True or `timeout` expires, re-evaluating it only
+      when a handler signals a state change. Returns the last value of the predicate.
+      """
+      with self.__state_changed:
+        return self.__state_changed.wait_for(predicate, timeout=max(timeout, 0))
+
+    def __track_online_node(self, node_addr, node_id, node_eth_address=None, notify=True):
       """
       Track the last time a node was seen online.
 
@@ -581,12 +624,13 @@ class GenericSession(BaseDecentrAIObject):
           The address of the Ratio1 edge node that sent the message.
       node_eth_address : str, optional
           The Ethereum address of the Ratio1 edge node that sent the message, by
+      notify : bool, optional
+          If True, wake up the waiting threads. Batch updates notify once at the end.
       """
-      self._dct_node_last_seen_time[node_addr] = tm()
-      self.__dct_node_address_to_alias[node_addr] = node_id
-      if node_eth_address is not None:
-        self.__dct_node_eth_addr_to_node_addr[node_eth_address] = node_addr
-      # endif node_eth address not provided - this is just for safety and it should not happen!
+      # node_eth address should always be provided - None is handled just for safety
+      self._node_registry.track(node_addr, alias=node_id, eth_address=node_eth_address)
+      if notify:
+        self._notify_state_change()
       return
 
     def __track_allowed_node_by_hb(self, node_addr, dict_msg):
@@ -742,10 +786,12 @@ class GenericSession(BaseDecentrAIObject):
       # end if whitelist present
       
       if node_online:
+        # the net-mon handler notifies once for the whole network map
         self.__track_online_node(
           node_addr=node_addr,
           node_id=node_alias,
-          node_eth_address=node_eth_address
+          node_eth_address=node_eth_address,
+          notify=False,
         )
       
       client_is_allowed = self.bc_engine.contains_current_address(node_whitelist)
@@ -781,8 +827,9 @@ class GenericSession(BaseDecentrAIObject):
           pipeline_name, None
         )
         if pipeline is not None:
+          # the pipeline compares with the previously received config and skips the sync if equal
           pipeline._sync_configuration_with_remote(
-            config={k.upper(): v for k, v in config.items()},
+            config=config,
             plugins_statuses=plugins_statuses,
           )
         else:
@@ -791,6 +838,7 @@ class GenericSession(BaseDecentrAIObject):
           )
           self._dct_online_nodes_pipelines[node_addr][pipeline_name] = pipeline
           new_pipelines.append(pipeline)
+      self._notify_state_change()
       return new_pipelines
 
     def __on_heartbeat(self, dict_msg: dict, msg_node_addr, msg_pipeline, msg_signature, msg_instance):
@@ -955,6 +1003,7 @@ class GenericSession(BaseDecentrAIObject):
         if current_network:
           self.__at_least_a_netmon_received = True
           self.__current_network_statuses[sender_addr] = current_network
+          self.__stale_supervisors.discard(sender_addr)
           online_addresses = []
           all_addresses = []
           lst_netconfig_request = []
@@ -996,6 +1045,7 @@ class GenericSession(BaseDecentrAIObject):
               color='g'
             )
           # end for each node in network map
+          self._notify_state_change()
         # end if current_network is valid
       # end if NET_MON_01
       return
@@ -1159,19 +1209,85 @@ class GenericSession(BaseDecentrAIObject):
       self.bc_engine.set_eth_flag(self._eth_enabled)
       return
 
+    def __maybe_load_network_snapshot(self):
+      """
+      Loads the last network snapshot (if any): the aliases and eth addresses of the known nodes
+      and the supervisors net-mon data, marked stale until live net-mon messages overwrite it.
+      The restored nodes are registered as never seen so they are not considered online.
+      """
+      if not self.__use_network_snapshot:
+        return
+      try:
+        scope = {
+          'network': self.bc_engine.evm_network,
+          'host': self._config.get(comm_ct.HOST),
+          'root': self.comms_root_topic,
+          'address': self.bc_engine.address,
+        }
+        path = os.path.join(self.log.get_data_folder(), 'network_snapshot.json')
+        self.__network_snapshot = NetworkSnapshot(path=path, scope=scope)
+        data = self.__network_snapshot.load()
+        if data is None:
+          return
+        S = NetworkSnapshot
+        for node_addr, (alias, eth_address, _) in data[S.K_NODES].items():
+          self._node_registry.track(node_addr, alias=alias, eth_address=eth_address, seen_time=0)
+        self.__current_network_statuses.update(data[S.K_SUPERVISORS])
+        self.__stale_supervisors.update(data[S.K_SUPERVISORS].keys())
+        self.__network_snapshot_time = data[S.K_SAVED_AT]
+        self.P(
+          f"Loaded network snapshot: {len(data[S.K_NODES])} nodes, {len(data[S.K_SUPERVISORS])} supervisors",
+          verbosity=2
+        )
+      except Exception as exc:
+        self.P(f"Failed to load network snapshot: {exc}", color='r', verbosity=2)
+      return
+
+    def __maybe_save_network_snapshot(self, force=False):
+      """
+      Periodically saves the live network state. Nothing is saved until live net-mon data
+      was received so a stale snapshot is never re-saved as fresh.
+      """
+      if self.__network_snapshot is None or not self.__at_least_a_netmon_received:
+        return
+      if not force and not self.__network_snapshot.is_due():
+        return
+      try:
+        registry = self._node_registry
+        # only the nodes seen live (the restored ones have no sighting)
+        nodes = {
+          addr: [registry.get_alias(addr), registry.get_eth_address(addr), last_seen]
+          for addr, last_seen in list(registry.last_seen.items())
+          if last_seen > 0
+        }
+        supervisors = {
+          addr: net_info for addr, net_info in list(self.__current_network_statuses.items())
+          if addr not in self.__stale_supervisors
+        }
+        self.__network_snapshot.save(nodes=nodes, supervisors=supervisors)
+      except Exception as exc:
+        self.P(f"Failed to save network snapshot: {exc}", color='r', verbosity=2)
+        # do not retry at every loop iteration
+        self.__network_snapshot.last_save_time = tm()
+      return
+
     def __start_main_loop_thread(self):
       self._main_loop_thread = Thread(target=self.__main_loop, daemon=True)
 
       self.__running_main_loop_thread = True
       self._main_loop_thread.start()
       
-      start_wait = tm()
-      while not self.__at_least_a_netmon_received:
-        if (tm() - start_wait) > self.START_TIMEOUT:
-          msg = "Timeout waiting for NET_MON_01 message. No connections. Exiting..."
-          self.P(msg, color='r', show=True)
-          break
-        sleep(0.1)
+      timeout = self.START_TIMEOUT
+      if self.__network_snapshot_time is not None:
+        timeout = self.SNAPSHOT_WAIT_TIMEOUT
+      received = self.__wait_for_state(lambda: self.__at_least_a_netmon_received, timeout)
+      if not received and self.__network_snapshot_time is not None:
+        age = tm() - self.__network_snapshot_time
+        self.P(f"No NET_MON_01 yet, using the network snapshot from {age:.0f}s ago until live data arrives.", color='y')
+        return
+      if not received:
+        msg = "Timeout waiting for NET_MON_01 message. No connections. Exiting..."
+        self.P(msg, color='r', show=True)
       if self.__at_least_a_netmon_received:
         self.P("Received at least one NET_MON_01 message. Resuming the main thread...", color='g')
       return
@@ -1250,6 +1366,9 @@ class GenericSession(BaseDecentrAIObject):
       if close_pipelines:
         self.__close_own_pipelines(wait=wait_close)
 
+      if getattr(self.log, 'profiler_running', False):
+        self.log.stop_profiler()
+
       self.__running_main_loop_thread = False
 
       # wait for the main loop thread to exit
@@ -1295,6 +1414,12 @@ class GenericSession(BaseDecentrAIObject):
       """
       raise NotImplementedError
 
+    def _get_communication_threads(self) -> dict:
+      """
+      The threads of the communication clients (e.g. the MQTT network loops), `{label: Thread}`.
+      """
+      return {}
+
     def _send_raw_message(self, to, msg, communicator='default'):
       """
       Send a message to a node.
@@ -1352,9 +1477,12 @@ class GenericSession(BaseDecentrAIObject):
       while self.__running_main_loop_thread:
         self.__maybe_reconnect()
         self.__handle_open_transactions()
+        self.__maybe_save_network_snapshot()
         sleep(0.1)
       # end while self.running
 
+      self.__maybe_save_network_snapshot(force=True)
+
       self.P("Main loop thread exiting...", verbosity=2)
       self.__release_callback_threads()
 
@@ -1651,8 +1779,7 @@ class GenericSession(BaseDecentrAIObject):
       """
       Convert the aliases to addresses.
       """
-      dct_aliases = {v: k for k, v in self.__dct_node_address_to_alias.items()}
-      return dct_aliases
+      return self._node_registry.alias_to_addr
 
     def __get_node_address(self, node):
       """
@@ -1670,18 +1797,8 @@ class GenericSession(BaseDecentrAIObject):
       str
           The address of the node.
       """
-      result = None
-      if node in self._dct_node_last_seen_time.keys():
-        # node seems to be already an address
-        result = node
-      elif node in self.__dct_node_eth_addr_to_node_addr.keys():
-        # node is an eth address
-        result = self.__dct_node_eth_addr_to_node_addr.get(node, None)
-      else:
-        # maybe node is a name
-        aliases = self.__aliases_to_addresses()
-        result = aliases.get(node, None)
-      return result
+      # node can be an address, an eth address or a name
+      return self._node_registry.resolve(node)
 
     def __prepare_message(
         self, msg_data, encrypt_message: bool = True,
@@ -1948,6 +2065,7 @@ class GenericSession(BaseDecentrAIObject):
         plugins=plugins,
         existing_config=pipeline_config,
         plugins_statuses=plugins_statuses,
+        remote_config=config,
       )
 
       return pipeline
@@ -1961,6 +2079,72 @@ class GenericSession(BaseDecentrAIObject):
       """
       return self._config[comm_ct.HOST]
 
+    def __get_profiled_threads(self):
+      threads = {
+        'main_loop': getattr(self, '_main_loop_thread', None),
+        'payloads': getattr(self, '_payload_thread', None),
+        'heartbeats': getattr(self, '_hb_thread', None),
+        'notifications': getattr(self, '_notif_thread', None),
+      }
+      threads.update(self._get_communication_threads())
+      return threads
+
+    def __log_has_profiler(self):
+      # custom loggers (not based on `ratio1.Logger`) may not have the profiler mixin
+      if not hasattr(self.log, 'start_profiler'):
+        self.P("The session logger does not support the sampling profiler", color='r')
+        return False
+      return True
+
+    def start_profiler(self, sample_rate=DEFAULT_SAMPLE_RATE, max_depth=DEFAULT_MAX_DEPTH):
+      """
+      Starts the (opt-in) sampling profiler of the session threads: the main loop, the payloads,
+      heartbeats and notifications processing threads and the communication threads. The stacks
+      are aggregated until `stop_profiler` and can be saved for flamegraph tools with
+      `save_profile`. Nothing is sampled while the profiler is not started.
+
+      Parameters
+      ----------
+      sample_rate : float, optional
+          Samples per second, by default 100.
+      max_depth : int, optional
+          Maximum number of frames kept for a stack, by default 128.
+      """
+      if not self.__log_has_profiler():
+        return None
+      return self.log.start_profiler(
+        threads=self.__get_profiled_threads, sample_rate=sample_rate, max_depth=max_depth,
+      )
+
+    def stop_profiler(self):
+      """
+      Stops the sampling profiler. The profiled stacks can still be saved with `save_profile`.
+      """
+      if getattr(self.log, 'profiler_running', False):
+        self.log.stop_profiler()
+      return
+
+    def save_profile(self, fn=None, threads=None):
+      """
+      Saves the profiled stacks in the flamegraph "folded" format
+      (e.g. `flamegraph.pl profile.folded > profile.svg` or load it in speedscope).
+
+      Parameters
+      ----------
+      fn : str, optional
+          The file path. By default a timestamped file in the logger output folder.
+      threads : list[str], optional
+          Only the stacks of these threads, e.g. `['payloads', 'mqtt_default']`.
+
+      Returns
+      -------
+      str
+          The path of the saved file (None if the logger does not support the profiler).
+      """
+      if not self.__log_has_profiler():
+        return None
+      return self.log.save_profiler_folded_stacks(fn=fn, threads=threads)
+
     def create_pipeline(self, *,
                         node,
                         name,
@@ -2122,7 +2306,10 @@ class GenericSession(BaseDecentrAIObject):
       str
           The eth address of the node.
       """
-      return self.bc_engine.node_address_to_eth_address(node_addr)
+      eth_address = self._node_registry.get_eth_address(node_addr)
+      if eth_address is None:
+        eth_address = self.bc_engine.node_address_to_eth_address(node_addr)
+      return eth_address
 
     def get_active_nodes(self):
       """
@@ -2135,7 +2322,7 @@ class GenericSession(BaseDecentrAIObject):
           List of addresses of all the ratio1 Edge Protocol edge nodes that are considered online
 
       """
-      return [k for k, v in self._dct_node_last_seen_time.items() if (tm() - v) < self.online_timeout]
+      return self._node_registry.get_online_nodes(self.online_timeout)
 
     def get_allowed_nodes(self):
       """
@@ -2147,8 +2334,11 @@ class GenericSession(BaseDecentrAIObject):
       list[str]
           List of names of all the active ratio1 Edge Protocol edge nodes to whom this session can send messages
       """
-      active_nodes = self.get_active_nodes()
-      return [node for node in self._dct_can_send_to_node if self._dct_can_send_to_node[node] and node in active_nodes]
+      is_online, timeout, now = self._node_registry.is_online, self.online_timeout, tm()
+      return [
+        node for node, can_send in list(self._dct_can_send_to_node.items()) 
+        if can_send and is_online(node, timeout, now=now)
+      ]
 
     def get_active_pipelines(self, node):
       """
@@ -2418,6 +2608,47 @@ class GenericSession(BaseDecentrAIObject):
         any_finished = any([self.are_transactions_finished(transactions) for transactions in lst_transactions])
       return
 
+    def wait_for_nodes_transactions(self, dct_node_transactions: dict, quorum=None, timeout=None):
+      """
+      Wait for the transactions of several nodes together (fan-out confirmation).
+
+      Parameters
+      ----------
+      dct_node_transactions : dict
+          Dictionary with the node as key and its list of transactions as value.
+      quorum : int, optional
+          If provided, stop waiting as soon as this many nodes have confirmed. Defaults to None (wait for all).
+      timeout : float, optional
+          Overall timeout in seconds. Defaults to None (each transaction has its own timeout).
+
+      Returns
+      -------
+      dict
+          Dictionary with the node as key and its outcome as value: 'confirmed', 'failed' or 'pending'.
+      """
+      start_time = tm()
+      while True:
+        outcomes = {}
+        for node, transactions in dct_node_transactions.items():
+          transactions = transactions or []
+          if any(t.is_finished() and t.is_successful() is False for t in transactions):
+            outcomes[node] = 'failed'
+          elif all(t.is_finished() for t in transactions):
+            outcomes[node] = 'confirmed'
+          else:
+            outcomes[node] = 'pending'
+        # endfor nodes
+        n_confirmed = sum(1 for outcome in outcomes.values() if outcome == 'confirmed')
+        if quorum is not None and n_confirmed >= quorum:
+          break
+        if 'pending' not in outcomes.values():
+          break
+        if timeout is not None and (tm() - start_time) > timeout:
+          break
+        sleep(0.1)
+      # endwhile
+      return outcomes
+
     def wait_for_any_node(self, timeout=15, verbose=True):
       """
       Wait for any node to appear online.
@@ -2436,11 +2667,7 @@ class GenericSession(BaseDecentrAIObject):
         self.P("Waiting for any node to appear online...")
 
       _start = tm()
-      found = len(self.get_active_nodes()) > 0
-      while (tm() - _start) < timeout and not found:
-        sleep(0.1)
-        found = len(self.get_active_nodes()) > 0
-      # end while
+      found = self.__wait_for_state(lambda: len(self.get_active_nodes()) > 0, timeout)
 
       if verbose:
         if found:
@@ -2470,11 +2697,7 @@ class GenericSession(BaseDecentrAIObject):
         self.Pd("Waiting for node '{}' to appear online...".format(short_addr))
 
       _start = tm()
-      found = self.check_node_online(node)
-      while (tm() - _start) < timeout and not found:
-        sleep(0.1)
-        found = self.check_node_online(node)
-      # end while
+      found = self.__wait_for_state(lambda: self.check_node_online(node), timeout)
 
       if verbose:
         if found:
@@ -2483,6 +2706,50 @@ class GenericSession(BaseDecentrAIObject):
           self.P("Node '{}' did not appear online in {:.1f}s.".format(short_addr, tm() - _start), color='r')
       return found
 
+    def wait_for_nodes(self, nodes, /, mode='all', timeout=15, verbose=True):
+      """
+      Wait for several nodes to appear online.
+
+      Parameters
+      ----------
+      nodes : list[str]
+          The addresses or names of the ratio1 Edge Protocol edge nodes.
+      mode : str, optional
+          'all' to wait for all the nodes or 'any' to return as soon as one is online, by default 'all'
+      timeout : int, optional
+          The timeout, by default 15
+
+      Returns
+      -------
+      bool
+          True if all (or any, depending on `mode`) of the nodes are online, False otherwise.
+      """
+      assert mode in ['all', 'any'], "`mode` must be either 'all' or 'any'"
+      if verbose:
+        self.Pd("Waiting for {} of {} nodes to appear online...".format(mode, len(nodes)))
+      pending = set(nodes)
+      online = set()
+
+      def _check():
+        found = [node for node in pending if self.check_node_online(node)]
+        pending.difference_update(found)
+        online.update(found)
+        if mode == 'any':
+          return len(online) > 0
+        return len(pending) == 0
+
+      _start = tm()
+      result = self.__wait_for_state(_check, timeout)
+
+      if verbose:
+        if result:
+          self.P("Nodes online after {:.1f}s: {}".format(tm() - _start, [self._shorten_addr(x) for x in online]))
+        else:
+          self.P("Nodes {} did not appear online in {:.1f}s.".format(
+            [self._shorten_addr(x) for x in pending], tm() - _start), color='r'
+          )
+      return result
+
     def wait_for_node_configs(
       self, node, /, 
       timeout=15, verbose=True, 
@@ -2509,18 +2776,16 @@ class GenericSession(BaseDecentrAIObject):
       self.P("Waiting for node '{}' to have its configurations loaded...".format(short_addr))
 
       _start = tm()
-      found = self.check_node_config_received(node)
-      additional_request_sent = False
-      request_time_thr = timeout / 2
-      while (tm() - _start) < timeout and not found:
-        sleep(0.1)
-        found = self.check_node_config_received(node)
-        if not found and not additional_request_sent and (tm() - _start) > request_time_thr and attempt_additional_requests:
-          self.P("Re-requesting configurations of node '{}'...".format(short_addr), show=True)
-          node_addr = self.__get_node_address(node)
-          self.__request_pipelines_from_net_config_monitor(node_addr)
-          additional_request_sent = True
-      # end while
+      request_time_thr = timeout / 2 if attempt_additional_requests else timeout
+      found = self.__wait_for_state(lambda: self.check_node_config_received(node), request_time_thr)
+      if not found and attempt_additional_requests:
+        self.P("Re-requesting configurations of node '{}'...".format(short_addr), show=True)
+        node_addr = self.__get_node_address(node)
+        self.__request_pipelines_from_net_config_monitor(node_addr)
+        found = self.__wait_for_state(
+          lambda: self.check_node_config_received(node), timeout - (tm() - _start)
+        )
+      # end if re-request
 
       if verbose:
         if found:
@@ -2596,7 +2861,7 @@ class GenericSession(BaseDecentrAIObject):
           True if the node is online, False otherwise.
       """
       node = self.__get_node_address(node)
-      return node in self.get_active_nodes()
+      return self._node_registry.is_online(node, self.online_timeout)
 
     def create_chain_dist_custom_job(
       self,
@@ -2719,6 +2984,9 @@ class GenericSession(BaseDecentrAIObject):
       ngrok_edge_label,
       endpoints=None,
       extra_debug=False,
+      deploy_timeout=10,
+      quorum=None,
+      return_outcomes=False,
       **kwargs
     ):
       """
@@ -2727,6 +2995,9 @@ class GenericSession(BaseDecentrAIObject):
       IMPORTANT: 
         The web app will be exposed using ngrok from multiple nodes that all will share the 
         same edge label so the ngrok_edge_label is mandatory.
+
+      The deploy commands are sent to all the nodes first and the confirmations are then
+      awaited together, so the whole deploy takes a single round-trip (or a single timeout).
       
       Parameters
       ----------
@@ -2746,9 +3017,22 @@ class GenericSession(BaseDecentrAIObject):
           
       endpoints : list[dict], optional
           A list of dictionaries defining the endpoint configuration. Defaults to None.
-          
-          
-      
+
+      deploy_timeout : float, optional
+          The timeout for each node deploy confirmation. Defaults to 10.
+
+      quorum : int, optional
+          Return as soon as this many nodes confirmed the deploy. The remaining confirmations
+          are still handled in the background. Defaults to None (wait for all nodes).
+
+      return_outcomes : bool, optional
+          If True, also return a dictionary with the deploy outcome of each node
+          ('confirmed', 'failed' or 'pending'). Defaults to False.
+
+      Returns
+      -------
+      tuple
+          `pipelines` and `instances` lists (plus the `outcomes` dict if `return_outcomes` is True).
       """
 
       ngrok_use_api = kwargs.pop('ngrok_use_api', True)
@@ -2759,6 +3043,7 @@ class GenericSession(BaseDecentrAIObject):
         raise ValueError("The `ngrok_edge_label` parameter is mandatory when creating a balanced web app, in order for all instances to respond to the same URL.")
 
       pipelines, instances = [], []
+      dct_node_transactions = {}
       
       for node in nodes:
         self.P("Creating web app on node {}...".format(node), color='b')
@@ -2786,10 +3071,21 @@ class GenericSession(BaseDecentrAIObject):
           # end for
         # end if we have endpoints defined in the call
 
-        pipeline.deploy()
+        # send the deploy command without blocking for this node's confirmation
+        dct_node_transactions[node] = pipeline.deploy(wait_confirmation=False, timeout=deploy_timeout)
         pipelines.append(pipeline)
         instances.append(instance)
       # end for
+
+      outcomes = self.wait_for_nodes_transactions(dct_node_transactions, quorum=quorum)
+      n_confirmed = sum(1 for outcome in outcomes.values() if outcome == 'confirmed')
+      self.P("Balanced web app <{}> confirmed on {}/{} nodes{}".format(
+        name, n_confirmed, len(outcomes),
+        "" if n_confirmed == len(outcomes) else ": {}".format(outcomes)
+        ), color='g' if n_confirmed == len(outcomes) else 'y'
+      )
+      if return_outcomes:
+        return pipelines, instances, outcomes
       return pipelines, instances
       
     
@@ -3157,19 +3453,20 @@ class GenericSession(BaseDecentrAIObject):
     ):
       # the following loop will wait for the desired number of supervisors to appear online
       # for the current session
-      start = tm()      
-      result = False
-      while (tm() - start) < timeout:
-        if supervisor is not None:
-          if supervisor in self.__current_network_statuses:
-            result = True
-            break
-        elif len(self.__current_network_statuses) >= min_supervisors:
-          result = True
-          break
-        sleep(0.1)
-      elapsed = tm() - start      
-      # end while
+      start = tm()
+      statuses, stale = self.__current_network_statuses, self.__stale_supervisors
+      # only live supervisors count - the ones restored from the network snapshot do not
+      if supervisor is not None:
+        predicate = lambda: supervisor in statuses and supervisor not in stale
+        has_stale_data = supervisor in stale
+      else:
+        predicate = lambda: sum(1 for x in list(statuses) if x not in stale) >= min_supervisors
+        has_stale_data = len(stale) > 0
+      if has_stale_data:
+        # the (stale) snapshot data can answer meanwhile
+        timeout = min(timeout, self.SNAPSHOT_WAIT_TIMEOUT)
+      result = self.__wait_for_state(predicate, timeout)
+      elapsed = tm() - start
       # done waiting for supervisors
       return result, elapsed
       
@@ -3285,12 +3582,28 @@ class GenericSession(BaseDecentrAIObject):
       
       if len(self.__current_network_statuses) > 0:
         best_info = {}
-        for supervisor, net_info in self.__current_network_statuses.items():
+        # live supervisors are preferred to the ones restored from the network snapshot
+        candidates = [
+          x for x in self.__current_network_statuses.items() if x[0] not in self.__stale_supervisors
+        ] or list(self.__current_network_statuses.items())
+        for supervisor, net_info in candidates:
           if len(net_info) > len(best_info):
             best_info = net_info
             best_super = supervisor
         best_super_alias = None
         # done found best supervisor
+        dct_eth_balances, dct_r1_balances = {}, {}
+        if eth or all_info:
+          # warm-start the process-wide node->eth cache for all rows in one go
+          dct_node_eth = self.bc_engine.node_addresses_to_eth_addresses([
+            x.get(PAYLOAD_DATA.NETMON_ADDRESS) for x in best_info.values()
+          ])
+          # then read all the balances in a few batched RPC requests instead of two per node
+          lst_eth_addrs = list(dct_node_eth.values())
+          if len(lst_eth_addrs) > 0:
+            dct_eth_balances = self.bc_engine.web3_get_balances_eth(lst_eth_addrs)
+            dct_r1_balances = self.bc_engine.web3_get_balances_r1(lst_eth_addrs)
+        # endif eth data
         for _, node_info in best_info.items():
           is_online = node_info.get(PAYLOAD_DATA.NETMON_STATUS_KEY, None) == PAYLOAD_DATA.NETMON_STATUS_ONLINE
           is_supervisor = node_info.get(PAYLOAD_DATA.NETMON_IS_SUPERVISOR, False)
@@ -3333,10 +3646,10 @@ class GenericSession(BaseDecentrAIObject):
                 eth_addr = val
                 add_balance = True
               if add_balance:
-                eth_balance = self.bc_engine.web3_get_balance_eth(eth_addr)
-                r1_balance = self.bc_engine.web3_get_balance_r1(eth_addr)
-                res['ETH'].append(round(eth_balance,4))
-                res['$R1'].append(round(r1_balance,4))
+                eth_balance = dct_eth_balances.get(eth_addr)
+                r1_balance = dct_r1_balances.get(eth_addr)
+                res['ETH'].append(None if eth_balance is None else round(eth_balance,4))
+                res['$R1'].append(None if r1_balance is None else round(r1_balance,4))
             elif key == PAYLOAD_DATA.NETMON_WHITELIST:
               val = client_is_allowed
             elif key in [PAYLOAD_DATA.NETMON_STATUS_KEY, PAYLOAD_DATA.NETMON_NODE_VERSION]:
@@ -3356,6 +3669,10 @@ class GenericSession(BaseDecentrAIObject):
         SESSION_CT.NETSTATS_REPORTER_ALIAS : best_super_alias,
         SESSION_CT.NETSTATS_NR_SUPERVISORS : len(self.__current_network_statuses),
         SESSION_CT.NETSTATS_ELAPSED : elapsed,
+        SESSION_CT.NETSTATS_STALE : best_super in self.__stale_supervisors,
+        SESSION_CT.NETSTATS_SNAPSHOT_AGE : (
+          None if self.__network_snapshot_time is None else tm() - self.__network_snapshot_time
+        ),
       })
       if debug:
         self.P(f"Peering:\n{json.dumps(self._dct_can_send_to_node, indent=2)}", color='y')
@@ -3409,6 +3726,176 @@ class GenericSession(BaseDecentrAIObject):
     return date
 
 
+  def __get_node_apps_records(self, node, apps, owner=None, show_full=False, as_json=False):
+    """
+    Converts the pipelines of a node to the records shown by `get_nodes_apps`.
+    """
+    records = []
+    # 5. Maybe exclude admin application.
+    if not show_full:
+      apps = {k: v for k, v in apps.items() if str(k).lower() != 'admin_pipeline'}
+      
+    # 6. Show the apps
+    if as_json:
+      # Will print a big JSON with all the app configurations.
+      records.append({k: v.get_full_config() for k, v in apps.items()})
+    else:
+      for pipeline_name, pipeline in apps.items():
+        pipeline_owner = pipeline.config.get("INITIATOR_ADDR")
+        if owner is not None and owner != pipeline_owner:
+          continue
+        pipeline_alias = pipeline.config.get("INITIATOR_ID")
+        for instance in pipeline.lst_plugin_instances:
+          instance_status = instance.get_status()
+          if len(instance_status) == 0:
+            # this instance is only present in config but is NOT loaded so ignore it
+            continue
+          start_time = instance_status.get(HB.ACTIVE_PLUGINS_INFO.INIT_TIMESTAMP)
+          last_probe = instance_status.get(HB.ACTIVE_PLUGINS_INFO.EXEC_TIMESTAMP)
+          last_data = instance_status.get(HB.ACTIVE_PLUGINS_INFO.LAST_PAYLOAD_TIME)
+          dates = [start_time, last_data]
+          error_dates = [
+            instance_status.get(HB.ACTIVE_PLUGINS_INFO.FIRST_ERROR_TIME),
+            instance_status.get(HB.ACTIVE_PLUGINS_INFO.LAST_ERROR_TIME),
+          ]
+          dates = [self.date_to_readable(x, check_none=False) for x in dates]
+          error_dates = [self.date_to_readable(x, check_none=False) for x in error_dates]
+          last_probe = self.date_to_readable(last_probe, check_none=True, start_time=start_time)
+
+          records.append({
+            'Node'  : node,
+            'Owner' : pipeline_owner,
+            'Alias' : pipeline_alias,
+            'App': pipeline_name,
+            'Plugin': instance.signature,
+            'Id': instance.instance_id,
+            'Start' : dates[0],
+            'Probe' : last_probe,
+            'Data' : dates[1],
+            'LastError': error_dates[1],
+          })
+        # endfor instances in app
+      # endfor apps
+    # endif as_json or as dict-for-df
+    return records
+
+  def iter_nodes_apps(
+    self,
+    node=None,
+    owner=None,
+    show_full=False,
+    as_json=False,
+    show_errors=False,
+    timeout=15,
+  ):
+    """
+    Concurrently waits for a set of nodes and yields their apps as soon as each node resolves.
+    The net-config requests are sent to all the nodes up front and a single overall deadline
+    is used for all of them, so slow or unauthorized nodes do not delay the others.
+
+    Parameters
+    ----------
+    node : str or list, optional
+        The address or name of the node (or a list of them). Defaults to None (all active nodes).
+
+    owner, show_full, as_json, show_errors : optional
+        See `get_nodes_apps`.
+
+    timeout : float, optional
+        The overall timeout in seconds for all the nodes. Defaults to 15.
+
+    Yields
+    ------
+    tuple
+        `(node, records, found)` where `records` is the list of app records of the node (None if the
+        node did not resolve) and `found` is True if the node was seen online.
+    """
+    if node is None:
+      nodes = self.get_active_nodes()
+    elif isinstance(node, (list, tuple, set)):
+      nodes = list(node)
+    else:
+      nodes = [node]
+    deadline = tm() + timeout
+    pending = list(nodes)
+
+    # 1. Request the configs of all the known peered nodes that did not send them yet
+    to_request = [
+      self.__get_node_address(x) for x in pending 
+      if self.is_peered(x) and not self.check_node_config_received(x)
+    ]
+    if len(to_request) > 0:
+      self.__request_pipelines_from_net_config_monitor(to_request)
+    additional_request_sent = False
+
+    while len(pending) > 0:
+      # 2. Collect the nodes that resolved: online and either not peered or with configs received
+      resolved = []
+      for x in pending:
+        if not self.check_node_online(x):
+          continue
+        if not self.is_peered(x) or self.check_node_config_received(x):
+          resolved.append(x)
+      # endfor pending
+
+      for x in resolved:
+        pending.remove(x)
+        short_addr = self._shorten_addr(x)
+        # 3. Check if the node is peered with the client
+        if not self.is_peered(x):
+          if show_errors:
+            log_with_color(f"Node {short_addr} is not peered with this client. Skipping..", color='r')
+          yield x, None, True
+          continue
+        apps = self.get_active_pipelines(x)
+        if apps is None:
+          if show_errors:
+            log_with_color(f"No apps found on node {short_addr}. Client might not be authorized", color='r')
+          yield x, None, True
+          continue
+        yield x, self.__get_node_apps_records(x, apps, owner=owner, show_full=show_full, as_json=as_json), True
+      # endfor resolved
+
+      remaining = deadline - tm()
+      if len(pending) == 0 or remaining <= 0:
+        break
+
+      if not additional_request_sent and remaining < timeout / 2:
+        to_request = [self.__get_node_address(x) for x in pending if self.is_peered(x)]
+        if len(to_request) > 0:
+          self.P("Re-requesting configurations of {} nodes...".format(len(to_request)), show=True)
+          self.__request_pipelines_from_net_config_monitor(to_request)
+        additional_request_sent = True
+        continue
+
+      # 4. Block until a heartbeat/net-mon/net-config lands (or the re-request time/deadline)
+      wait_time = remaining if additional_request_sent else remaining - timeout / 2
+      with self.__state_changed:
+        self.__state_changed.wait(timeout=max(wait_time, 0.01))
+    # endwhile pending
+
+    for x in pending:
+      found = self.check_node_online(x)
+      if show_errors:
+        if found:
+          log_with_color(f"Node {self._shorten_addr(x)} did not send configs in {timeout}s. Client might not be authorized!", color='r')
+        else:
+          log_with_color(f"Node {self._shorten_addr(x)} did not appear online in {timeout}s.", color='r')
+      yield x, None, found
+    return
+
+  def nodes_apps_to_df(self, lst_plugin_instance_data):
+    """
+    Builds the colored apps DataFrame from the records returned by `get_nodes_apps`/`iter_nodes_apps`.
+    """
+    color_condition = lambda x: (x['LastError'] != 'Never' or x['Probe'] == 'Error!')
+    df = self.log.colored_dataframe(lst_plugin_instance_data, color_condition=color_condition)
+    if not (df.empty or df.shape[0] == 0):
+      df['Node'] = df['Node'].apply(lambda x: self._shorten_addr(x))
+      df['Owner'] = df['Owner'].apply(lambda x: self._shorten_addr(x))
+    # end if not empty
+    return df
+
   def get_nodes_apps(
     self, 
     node=None, 
@@ -3416,7 +3903,8 @@ class GenericSession(BaseDecentrAIObject):
     show_full=False, 
     as_json=False, 
     show_errors=False, 
-    as_df=False
+    as_df=False,
+    timeout=15,
   ):
     """
     Get the workload status of a node.
@@ -3441,6 +3929,9 @@ class GenericSession(BaseDecentrAIObject):
     
     as_df : bool, optional  
         If True, will return the result as a Pandas DataFrame. Defaults to False.
+
+    timeout : float, optional
+        The overall timeout for all the nodes (they are awaited concurrently). Defaults to 15.
  
 
     Returns
@@ -3453,90 +3944,21 @@ class GenericSession(BaseDecentrAIObject):
         
     """
     lst_plugin_instance_data = []    
-    if node is None:
-      nodes = self.get_active_nodes()
-    else:
-      nodes = [node]
-    found_nodes = []
-    for node in nodes:
-      short_addr = self._shorten_addr(node)      
-      # 2. Wait for node to appear online    
-      node_found = self.wait_for_node(node)
-      if node_found:
-        found_nodes.append(node)
-      
-      # 3. Check if the node is peered with the client
-      is_allowed = self.is_peered(node)
-      if not is_allowed:
-        if show_errors:
-          log_with_color(f"Node {short_addr} is not peered with this client. Skipping..", color='r')
-        continue
-      
-      # 4. Wait for node to send the configuration.
-      self.wait_for_node_configs(node)
-      apps = self.get_active_pipelines(node)
-      if apps is None:
-        if show_errors:
-          log_with_color(f"No apps found on node {short_addr}. Client might not be authorized", color='r')
-        continue
-      
-      # 5. Maybe exclude admin application.
-      if not show_full:
-        apps = {k: v for k, v in apps.items() if str(k).lower() != 'admin_pipeline'}
-        
-      # 6. Show the apps
-      if as_json:
-        # Will print a big JSON with all the app configurations.
-        lst_plugin_instance_data.append({k: v.get_full_config() for k, v in apps.items()})
-      else:
-        for pipeline_name, pipeline in apps.items():
-          pipeline_owner = pipeline.config.get("INITIATOR_ADDR")
-          if owner is not None and owner != pipeline_owner:
-            continue
-          pipeline_alias = pipeline.config.get("INITIATOR_ID")
-          for instance in pipeline.lst_plugin_instances:
-            instance_status = instance.get_status()
-            if len(instance_status) == 0:
-              # this instance is only present in config but is NOT loaded so ignore it
-              continue
-            start_time = instance_status.get(HB.ACTIVE_PLUGINS_INFO.INIT_TIMESTAMP)
-            last_probe = instance_status.get(HB.ACTIVE_PLUGINS_INFO.EXEC_TIMESTAMP)
-            last_data = instance_status.get(HB.ACTIVE_PLUGINS_INFO.LAST_PAYLOAD_TIME)
-            dates = [start_time, last_data]
-            error_dates = [
-              instance_status.get(HB.ACTIVE_PLUGINS_INFO.FIRST_ERROR_TIME),
-              instance_status.get(HB.ACTIVE_PLUGINS_INFO.LAST_ERROR_TIME),
-            ]
-            dates = [self.date_to_readable(x, check_none=False) for x in dates]
-            error_dates = [self.date_to_readable(x, check_none=False) for x in error_dates]
-            last_probe = self.date_to_readable(last_probe, check_none=True, start_time=start_time)
-
-            lst_plugin_instance_data.append({
-              'Node'  : node,
-              'Owner' : pipeline_owner,
-              'Alias' : pipeline_alias,
-              'App': pipeline_name,
-              'Plugin': instance.signature,
-              'Id': instance.instance_id,
-              'Start' : dates[0],
-              'Probe' : last_probe,
-              'Data' : dates[1],
-              'LastError': error_dates[1],
-            })
-          # endfor instances in app
-        # endfor apps
-      # endif as_json or as dict-for-df
+    nodes, found_nodes = [], []
+    for node_addr, records, found in self.iter_nodes_apps(
+      node=node, owner=owner, show_full=show_full, as_json=as_json,
+      show_errors=show_errors, timeout=timeout,
+    ):
+      nodes.append(node_addr)
+      if found:
+        found_nodes.append(node_addr)
+      if records is not None:
+        lst_plugin_instance_data.extend(records)
     # endfor nodes  
     if len(found_nodes) == 0:
       log_with_color(f'Node(s) {nodes} not found. Please check the configuration.', color='r')
       return 
     if as_df:
-      color_condition = lambda x: (x['LastError'] != 'Never' or x['Probe'] == 'Error!')
-      df = self.log.colored_dataframe(lst_plugin_instance_data, color_condition=color_condition)
-      if not (df.empty or df.shape[0] == 0):
-        df['Node'] = df['Node'].apply(lambda x: self._shorten_addr(x))
-        df['Owner'] = df['Owner'].apply(lambda x: self._shorten_addr(x))
-      # end if not empty
-      return df
+      return self.nodes_apps_to_df(lst_plugin_instance_data)
     return lst_plugin_instance_data
   
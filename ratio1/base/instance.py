@@ -2,6 +2,13 @@ from ..const import PAYLOAD_DATA
 from .transaction import Transaction
 from .responses import PipelineOKResponse, PluginConfigOKResponse, PluginInstanceCommandOKResponse
 from time import time, sleep
+from types import MappingProxyType
+
+
+# shared empty (read-only) callback containers - the real list/dict is allocated on the first
+# registered callback, as most instances tracked by a session never get one
+NO_CALLBACKS = ()
+NO_TEMPORARY_CALLBACKS = MappingProxyType({})
 
 
 class Instance():
@@ -49,7 +56,7 @@ class Instance():
     self.log = log
     self.pipeline = pipeline
     self.instance_id = instance_id
-    self.last_known_status = None
+    self.__last_known_status = None
     self.signature = signature.upper()
     self.config = {}
     self.__debug = debug
@@ -64,15 +71,10 @@ class Instance():
     self.__staged_config = None
     self.__was_last_operation_successful = None
 
-    self.on_data_callbacks = []
-    self.temporary_on_data_callbacks = {}
-    self.on_notification_callbacks = []
-    self.temporary_on_notification_callbacks = {}
-
-    if on_data:
-      self.on_data_callbacks.append(on_data)
-    if on_notification:
-      self.on_notification_callbacks.append(on_notification)
+    self.on_data_callbacks = [on_data] if on_data else NO_CALLBACKS
+    self.temporary_on_data_callbacks = NO_TEMPORARY_CALLBACKS
+    self.on_notification_callbacks = [on_notification] if on_notification else NO_CALLBACKS
+    self.temporary_on_notification_callbacks = NO_TEMPORARY_CALLBACKS
 
     return
   
@@ -128,7 +130,7 @@ class Instance():
       callback : Callable[[Pipeline, dict], None]
           The callback to add
       """
-      self.on_data_callbacks.append(callback)
+      self.on_data_callbacks = [*self.on_data_callbacks, callback]
       return
 
     def _add_temporary_on_data_callback(self, attachment, callback):
@@ -144,6 +146,8 @@ class Instance():
       """
       # TODO: this can fail (very small chance, but still)
       # FIXME: make add / delete happen after callbacks
+      if self.temporary_on_data_callbacks is NO_TEMPORARY_CALLBACKS:
+        self.temporary_on_data_callbacks = {}
       self.temporary_on_data_callbacks[attachment] = callback
       return
 
@@ -164,7 +168,7 @@ class Instance():
       """
       Reset the list of callbacks that handle the data received from the instance.
       """
-      self.on_data_callbacks = []
+      self.on_data_callbacks = NO_CALLBACKS
       return
 
     def _add_on_notification_callback(self, callback):
@@ -176,7 +180,7 @@ class Instance():
       callback : Callable[[Pipeline, dict], None]
           The callback to add
       """
-      self.on_notification_callbacks.append(callback)
+      self.on_notification_callbacks = [*self.on_notification_callbacks, callback]
       return
 
     def _add_temporary_on_notification_callback(self, attachment, callback):
@@ -190,6 +194,8 @@ class Instance():
       callback : Callable[[Pipeline, dict], None]
           The callback to add
       """
+      if self.temporary_on_notification_callbacks is NO_TEMPORARY_CALLBACKS:
+        self.temporary_on_notification_callbacks = {}
       self.temporary_on_notification_callbacks[attachment] = callback
       return
 
@@ -210,7 +216,7 @@ class Instance():
       """
       Reset the list of callbacks that handle the notifications received from the instance.
       """
-      self.on_notification_callbacks = []
+      self.on_notification_callbacks = NO_CALLBACKS
       return
 
   # Utils
@@ -422,6 +428,21 @@ class Instance():
     
   # API
   if True:
+    @property
+    def last_known_status(self) -> dict:
+      """
+      The last status of the instance received from the node (None if not received yet).
+      It is resolved from the plugins statuses stored by the pipeline when accessed.
+      """
+      if self.pipeline is not None:
+        self.pipeline._update_plugin_status(self)
+      return self.__last_known_status
+
+    @last_known_status.setter
+    def last_known_status(self, value):
+      self.__last_known_status = value
+      return
+
     @property
     def was_last_operation_successful(self) -> bool:
       """
@@ -707,7 +728,8 @@ class Instance():
     }
     ```    
     """
-    result = {} if self.last_known_status is None else self.last_known_status
-    if self.last_known_status is None:
+    status = self.last_known_status
+    result = {} if status is None else status
+    if status is None:
       self.Pd(f'Instance <{self.instance_id}> has no status yet')
     return result
\ No newline at end of file
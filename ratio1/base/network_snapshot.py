@@ -0,0 +1,84 @@
+import json
+import os
+
+from time import time as tm
+
+
+NETWORK_SNAPSHOT_VERSION = 2
+NETWORK_SNAPSHOT_INTERVAL = 60        # seconds between two saves
+NETWORK_SNAPSHOT_MAX_AGE = 6 * 3600   # older snapshots are ignored
+
+
+class NetworkSnapshot:
+  """
+  Compact on-disk snapshot of the network state known by a session: the node registry
+  (aliases and eth addresses) and the latest net-mon data of each supervisor. Pipeline
+  configs, whitelists and peering are never saved. The file is readable only by its owner.
+
+  A new session loads it as stale state that is only shown by the network listing (flagged
+  as stale) until the live net-mon messages overwrite it - restored nodes are never
+  considered online or peered.
+
+  Parameters
+  ----------
+  path : str
+      The snapshot file.
+  scope : dict
+      Values that must match for a snapshot to be used (e.g. network, server, root topic).
+  """
+  K_VERSION = 'version'
+  K_SAVED_AT = 'saved_at'
+  K_SCOPE = 'scope'
+  K_NODES = 'nodes'                 # addr -> [alias, eth address, last seen]
+  K_SUPERVISORS = 'supervisors'     # supervisor addr -> net-mon current network
+
+  def __init__(self, path, scope):
+    self.path = path
+    self.scope = scope
+    self.last_save_time = 0
+    return
+
+  def save(self, nodes, supervisors):
+    data = {
+      self.K_VERSION: NETWORK_SNAPSHOT_VERSION,
+      self.K_SAVED_AT: tm(),
+      self.K_SCOPE: self.scope,
+      self.K_NODES: nodes,
+      self.K_SUPERVISORS: supervisors,
+    }
+    folder = os.path.dirname(self.path)
+    if folder:
+      os.makedirs(folder, exist_ok=True)
+    tmp_path = self.path + '.tmp'
+    if os.path.exists(tmp_path):
+      # leftover of a failed save - recreate it so the mode below applies
+      os.remove(tmp_path)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as fh:
+      json.dump(data, fh, separators=(',', ':'))
+    # atomic replace so a concurrent reader never sees a partial file
+    os.replace(tmp_path, self.path)
+    self.last_save_time = tm()
+    return
+
+  def load(self, max_age=NETWORK_SNAPSHOT_MAX_AGE):
+    """
+    Returns the snapshot dict or None if missing, unreadable, too old or for another scope.
+    """
+    if not os.path.isfile(self.path):
+      return None
+    try:
+      with open(self.path, 'r') as fh:
+        data = json.load(fh)
+    except Exception:
+      return None
+    if not isinstance(data, dict) or data.get(self.K_VERSION) != NETWORK_SNAPSHOT_VERSION:
+      return None
+    if data.get(self.K_SCOPE) != self.scope:
+      return None
+    if tm() - data.get(self.K_SAVED_AT, 0) > max_age:
+      return None
+    return data
+
+  def is_due(self, interval=NETWORK_SNAPSHOT_INTERVAL):
+    return (tm() - self.last_save_time) >= interval
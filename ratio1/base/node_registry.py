@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from threading import Lock
+from time import time as tm
+
+
+class NodeRegistry:
+  """
+  Registry of the nodes seen by a session.
+
+  Keeps the address/alias/eth-address maps in both directions and the last-seen
+  time of each node. The last-seen map is kept ordered by time (each new sighting
+  moves the node to the end) so that:
+    - "is node online now" is a single dict lookup,
+    - the set of online nodes is the suffix of the ordering that did not expire,
+      so bulk queries only touch the online nodes and never scan the offline ones.
+  """
+
+  def __init__(self):
+    self.last_seen = OrderedDict()    # node address -> last seen time, ordered by time
+    self.addr_to_alias = {}
+    self.alias_to_addr = {}
+    self.eth_to_addr = {}
+    self.addr_to_eth = {}
+    self.__lock = Lock()
+    return
+
+  def __set_last_seen(self, node_addr, seen_time):
+    last_seen = self.last_seen
+    if len(last_seen) > 0 and seen_time < last_seen[next(reversed(last_seen))]:
+      # out-of-order sighting (e.g. restored state) - reinsert keeping the time order
+      last_seen[node_addr] = seen_time
+      items = sorted(last_seen.items(), key=lambda x: x[1])
+      last_seen.clear()
+      last_seen.update(items)
+    else:
+      last_seen[node_addr] = seen_time
+      last_seen.move_to_end(node_addr)
+    return
+
+  def track(self, node_addr, alias=None, eth_address=None, seen_time=None):
+    """
+    Records a sighting of a node.
+
+    Parameters
+    ----------
+    node_addr : str
+        The address of the node.
+    alias : str, optional
+        The alias of the node.
+    eth_address : str, optional
+        The Ethereum address of the node.
+    seen_time : float, optional
+        When the node was seen. Defaults to now.
+    """
+    if seen_time is None:
+      seen_time = tm()
+    with self.__lock:
+      self.__set_last_seen(node_addr, seen_time)
+      if alias is not None:
+        old_alias = self.addr_to_alias.get(node_addr)
+        if old_alias != alias:
+          if old_alias is not None and self.alias_to_addr.get(old_alias) == node_addr:
+            del self.alias_to_addr[old_alias]
+          self.addr_to_alias[node_addr] = alias
+        self.alias_to_addr[alias] = node_addr
+      # endif alias
+      if eth_address is not None:
+        self.eth_to_addr[eth_address] = node_addr
+        self.addr_to_eth[node_addr] = eth_address
+      # endif eth address
+    return
+
+  def resolve(self, node):
+    """
+    Returns the address of a node given its address, eth address or alias (None if unknown).
+    """
+    if node in self.last_seen:
+      return node
+    result = self.eth_to_addr.get(node)
+    if result is None:
+      result = self.alias_to_addr.get(node)
+    return result
+
+  def get_alias(self, node_addr):
+    return self.addr_to_alias.get(node_addr)
+
+  def get_eth_address(self, node_addr):
+    return self.addr_to_eth.get(node_addr)
+
+  def get_last_seen(self, node_addr, default_value=None):
+    return self.last_seen.get(node_addr, default_value)
+
+  def is_online(self, node_addr, timeout, now=None):
+    """
+    O(1) check if the node was seen in the last `timeout` seconds.
+    """
+    seen_time = self.last_seen.get(node_addr)
+    if seen_time is None:
+      return False
+    if now is None:
+      now = tm()
+    return (now - seen_time) < timeout
+
+  def get_online_nodes(self, timeout, now=None):
+    """
+    Returns the addresses of the nodes seen in the last `timeout` seconds, ordered by last seen
+    time. Only the online nodes (plus the first expired one) are visited.
+    """
+    if now is None:
+      now = tm()
+    min_time = now - timeout
+    result = []
+    with self.__lock:
+      for node_addr in reversed(self.last_seen):
+        if self.last_seen[node_addr] <= min_time:
+          break
+        result.append(node_addr)
+    result.reverse()
+    return result
+
+  def __len__(self):
+    return len(self.last_seen)
+
+  def __contains__(self, node_addr):
+    return node_addr in self.last_seen
@@ -1,37 +1,65 @@
-import base64
-import io
 from collections import UserDict
 
-import numpy as np
+from ...utils.image_utils import b64_to_np_image, b64_to_pil_image, decode_images
+
+
+def _load_pil_image(base64_img):
+  image = b64_to_pil_image(base64_img)
+  image.load()  # decode now (possibly on a pool thread) instead of on first use
+  return image
 
 
 class Payload(UserDict):
   """
   This class enriches the default python dict, providing
   helpful methods to process the payloads received from ratio1 Edge Protocol edge nodes.
+
+  The decoded images are memoized on the payload, so repeated calls of `get_images_as_np`
+  or `get_images_as_PIL` decode each frame only once (as long as the key is not reassigned).
   """
+  _INTERNAL_ATTRS = ('data', '_decoded_np', '_decoded_pil')
 
-  def get_images_as_np(self, key='IMG') -> list:
+  def __get_decoded(self, cache_name, key, decode_func, workers):
+    cache = self.__dict__.get(cache_name)
+    if cache is None:
+      cache = {}
+      super().__setattr__(cache_name, cache)
+    source = self.data.get(key, None)
+    if source is None:
+      return [None]
+    cached = cache.get(key)
+    if cached is not None and cached[0] is source:
+      return cached[1]
+    if isinstance(source, list):
+      images = decode_images(source, decode_func, workers=workers)
+    else:
+      images = [decode_func(source)]
+    cache[key] = (source, images)
+    return images
+
+  def get_images_as_np(self, key='IMG', workers=None) -> list:
     """
     Extract the image from the payload.
-    The image is returned as a numpy array.
+    The image is returned as a numpy array (RGB), decoded straight from the
+    base64 data (with OpenCV if installed, PIL otherwise).
 
     Parameters
     ----------
     key : str, optional
         The key from which to extract the image, by default 'IMG'.
         Can be modified if the user wants to extract an image from a different key
+    workers : int, optional
+        Decode a list of images on the shared image pool, with at most this many threads. Default None (sequential).
 
     Returns
     -------
-    NDArray[Any] | None
-        The image if it was found or None otherwise.
+    List[NDArray[Any]] | None
+        A list of images if there were any or None otherwise. The arrays are memoized
+        on the payload, so in-place changes are visible in subsequent calls.
     """
-    images = self.get_images_as_PIL(key)
-    images = [np.array(image) if image is not None else None for image in images]
-    return images
+    return self.__get_decoded('_decoded_np', key, b64_to_np_image, workers)
 
-  def get_images_as_PIL(self, key='IMG') -> list:
+  def get_images_as_PIL(self, key='IMG', workers=None) -> list:
     """
     Extract the image from the payload.
     The image is returned as a PIL image.
@@ -41,30 +69,19 @@ class Payload(UserDict):
     key : str, optional
         The key from which to extract the image, by default 'IMG'.
         Can be modified if the user wants to extract an image from a different key
+    workers : int, optional
+        Decode a list of images on the shared image pool, with at most this many threads. Default None (sequential).
 
     Returns
     -------
     List[Image] | None
         A list of images if there were any or None otherwise.
     """
-    base64_img = self.data.get(key, None)
-    if base64_img is None:
-      return [None]
-    if isinstance(base64_img, list):
-      return [self._image_from_b64(b64) if b64 is not None else None for b64 in base64_img]
-    return [self._image_from_b64(base64_img)]
+    return self.__get_decoded('_decoded_pil', key, _load_pil_image, workers)
 
   def _image_from_b64(self, base64_img):
-    image = None
-    try:
-      from PIL import Image
+    return b64_to_pil_image(base64_img)
 
-      base64_decoded = base64.b64decode(base64_img)
-      image = Image.open(io.BytesIO(base64_decoded))
-    except ModuleNotFoundError:
-      raise "This functionality requires the PIL library. To use this feature, please install it using 'pip install pillow'"
-    return image
-  
   def __getattr__(self, key):
     try:
       return self.data[key]
@@ -73,7 +90,7 @@ class Payload(UserDict):
 
   def __setattr__(self, key, value):
     # If we're setting 'data' itself, just call super()
-    if key == 'data':
+    if key in self._INTERNAL_ATTRS:
       super().__setattr__(key, value)
     else:
       self.data[key] = value  
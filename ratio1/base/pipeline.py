@@ -1,11 +1,12 @@
 # TODO: for custom plugin, do the plugin verification locally too
 import os
+from threading import RLock
 from time import sleep, time
 
 from ..code_cheker.base import BaseCodeChecker
 from ..const import PAYLOAD_DATA
 from .distributed_custom_code_presets import DistributedCustomCodePresets
-from .instance import Instance
+from .instance import Instance, NO_CALLBACKS
 from .responses import PipelineArchiveResponse, PipelineOKResponse
 from .transaction import Transaction
 
@@ -42,6 +43,7 @@ class Pipeline(BaseCodeChecker):
     existing_config=None, 
     plugins_statuses=None,
     debug=False,
+    remote_config=None,
     **kwargs
   ) -> None:
     """
@@ -94,6 +96,8 @@ class Pipeline(BaseCodeChecker):
     is_attached : bool
         This is used internally to allow the user to create or attach to a pipeline, and then use the same
         objects in the same way, by default True
+    remote_config : dict, optional
+        Used internally for attached pipelines: the configuration as received from the network.
     **kwargs : dict
         The user can provide the configuration of the acquisition source directly as kwargs.
     """
@@ -118,41 +122,75 @@ class Pipeline(BaseCodeChecker):
       self.proposed_config = {k.upper(): v for k, v in self.proposed_config.items()}
       self.proposed_config = self.__pop_ignored_keys_from_config(self.proposed_config)
     self.__staged_config = None
-
+    # the last configuration received from the network - the same object the session keeps,
+    # see `_sync_configuration_with_remote`
+    self.__remote_config = remote_config
 
     self.__update_plugins_statuses_data(plugins_statuses)    
 
     self.__was_last_operation_successful = None
 
-    self.proposed_remove_instances = []
-    self.__staged_remove_instances = []
+    # the containers below are allocated on first use: a session tracks a `Pipeline` for each
+    # pipeline of each node in the network and most of them never get callbacks or removals
+    self.proposed_remove_instances = NO_CALLBACKS
+    self.__staged_remove_instances = NO_CALLBACKS
 
-    self.on_data_callbacks = []
-    self.on_notification_callbacks = []
+    self.on_data_callbacks = NO_CALLBACKS
+    self.on_notification_callbacks = NO_CALLBACKS
 
     if on_data is not None:
       if isinstance(on_data, list):
-        for cb in on_data:
-          if cb is not None:
-            self.on_data_callbacks.append(cb)
+        self.on_data_callbacks = [cb for cb in on_data if cb is not None]
       elif callable(on_data):
-        self.on_data_callbacks.append(on_data)
+        self.on_data_callbacks = [on_data]
       else:
         raise ValueError("on_data should be a callable or a list of callables")
       
     if on_notification is not None:
       if isinstance(on_notification, list):
-        for cb in on_data:
-          if cb is not None:
-            self.on_notification_callbacks.append(cb)
+        self.on_notification_callbacks = [cb for cb in on_notification if cb is not None]
       elif callable(on_notification):
-        self.on_notification_callbacks.append(on_notification)
+        self.on_notification_callbacks = [on_notification]
       else:
         raise ValueError("on_notification should be a callable or a list of callables")
 
-    self.lst_plugin_instances: list[Instance] = []
+    self.__lst_plugin_instances: list[Instance] = []
+    # attached (remote) pipelines keep only a reference to the plugins configuration received
+    # from the network and create their `Instance` objects on first use
+    self.__pending_plugins = None
+    # guards the lazy creation of the instances and the pending plugins swaps, as the net-config
+    # syncs (payload thread) race with the users of the instances (user/main threads)
+    self.__instances_lock = RLock()
+    self.__initializing_plugins = False
+
+    if is_attached:
+      self.__pending_plugins = plugins
+    else:
+      self.__init_plugins(plugins, is_attached)
+    return
 
-    self.__init_plugins(plugins, is_attached)
+  @property
+  def lst_plugin_instances(self) -> list:
+    # `__initializing_plugins` is set before `__pending_plugins` is cleared so other threads
+    # always wait for the creation to finish instead of seeing a partial list
+    if self.__pending_plugins is not None or self.__initializing_plugins:
+      with self.__instances_lock:
+        # the instances may have been created while waiting for the lock
+        if self.__pending_plugins is not None:
+          self.__initializing_plugins = True
+          plugins, self.__pending_plugins = self.__pending_plugins, None
+          try:
+            self.__init_plugins(plugins, is_attached=True)
+          finally:
+            self.__initializing_plugins = False
+        # endif pending
+    return self.__lst_plugin_instances
+
+  @lst_plugin_instances.setter
+  def lst_plugin_instances(self, value):
+    with self.__instances_lock:
+      self.__pending_plugins = None
+      self.__lst_plugin_instances = value
     return
   
   def Pd(self, *args, **kwargs):
@@ -225,9 +263,7 @@ class Pipeline(BaseCodeChecker):
         for dct_instance in instances:
           config = {k.upper(): v for k, v in dct_instance.items()}
           instance_id = config.pop('INSTANCE_ID')
-          instance_object = self.__init_instance(signature, instance_id, config, None, None, is_attached=is_attached)
-          # now we update the status of the plugin instance with the last known status
-          self._update_plugin_status(instance_object)
+          self.__init_instance(signature, instance_id, config, None, None, is_attached=is_attached)
         # end for dct_instance
       # end for dct_signature_instances
       return
@@ -239,6 +275,8 @@ class Pipeline(BaseCodeChecker):
       else:
         self.last_plugins_statuses = None
         self.last_plugins_statuses_time = 0
+      # `(statuses, index)` - rebuilt on the first lookup so the net-config refreshes stay cheap
+      self.__plugins_statuses_index = (None, {})
       return
 
 
@@ -246,17 +284,19 @@ class Pipeline(BaseCodeChecker):
       """
       Get the most recent status of a plugin instance.
       """
-      result = None
-      if self.last_plugins_statuses is not None:
-        for plugin_status in self.last_plugins_statuses:
-          if (
-            plugin_status['SIGNATURE'] == signature and 
-            plugin_status['INSTANCE_ID'] == instance_id and
-            plugin_status['STREAM_ID'] == self.name
-          ):
-            result = plugin_status
-            break
-      return result
+      statuses = self.last_plugins_statuses
+      indexed_statuses, index = self.__plugins_statuses_index
+      # the index is tied to the list it was built from, so a concurrent refresh cannot leave it stale
+      if indexed_statuses is not statuses:
+        index = {}
+        for plugin_status in statuses or []:
+          if plugin_status['STREAM_ID'] == self.name:
+            key = (plugin_status['SIGNATURE'], plugin_status['INSTANCE_ID'])
+            if key not in index:
+              index[key] = plugin_status
+        # endfor plugins statuses
+        self.__plugins_statuses_index = (statuses, index)
+      return index.get((signature, instance_id))
     
 
     def _update_plugin_status(self, instance_object : Instance):
@@ -664,7 +704,7 @@ class Pipeline(BaseCodeChecker):
         instance.config = None
         self.lst_plugin_instances.remove(instance)
 
-      self.__staged_remove_instances = []
+      self.__staged_remove_instances = NO_CALLBACKS
       return
 
     def __discard_staged_config(self, fail_reason: str):
@@ -676,7 +716,7 @@ class Pipeline(BaseCodeChecker):
       self.__was_last_operation_successful = False
 
       self.__staged_config = None
-      self.__staged_remove_instances = []
+      self.__staged_remove_instances = NO_CALLBACKS
       return
 
     def __stage_proposed_config(self):
@@ -694,8 +734,9 @@ class Pipeline(BaseCodeChecker):
       for instance in self.lst_plugin_instances:
         instance._stage_proposed_config()
 
-      self.__staged_remove_instances.extend(self.proposed_remove_instances)
-      self.proposed_remove_instances = []
+      if len(self.proposed_remove_instances) > 0:
+        self.__staged_remove_instances = [*self.__staged_remove_instances, *self.proposed_remove_instances]
+      self.proposed_remove_instances = NO_CALLBACKS
 
       self.__was_last_operation_successful = None
       return
@@ -836,14 +877,14 @@ class Pipeline(BaseCodeChecker):
       callback : Callable[[Pipeline, str, str, dict], None]
           The callback to add
       """
-      self.on_data_callbacks.append(callback)
+      self.on_data_callbacks = [*self.on_data_callbacks, callback]
       return
 
     def _reset_on_data_callback(self):
       """
       Reset the list of callbacks that handle the data received from the pipeline.
       """
-      self.on_data_callbacks = []
+      self.on_data_callbacks = NO_CALLBACKS
       return
 
     def _add_on_notification_callback(self, callback):
@@ -855,14 +896,14 @@ class Pipeline(BaseCodeChecker):
       callback : Callable[[Pipeline, dict], None]
           The callback to add
       """
-      self.on_notification_callbacks.append(callback)
+      self.on_notification_callbacks = [*self.on_notification_callbacks, callback]
       return
 
     def _reset_on_notification_callback(self):
       """
       Reset the list of callbacks that handle the notifications received from the pipeline.
       """
-      self.on_notification_callbacks = []
+      self.on_notification_callbacks = NO_CALLBACKS
       return
 
     def __call_instance_on_data_callbacks(self, signature, instance_id, data):
@@ -1012,7 +1053,7 @@ class Pipeline(BaseCodeChecker):
       """
 
       self.__remove_plugin_instance(instance)
-      self.proposed_remove_instances.append(instance)
+      self.proposed_remove_instances = [*self.proposed_remove_instances, instance]
       return
 
     def create_custom_plugin_instance(self, *, instance_id, custom_code: callable, config={}, on_data=None, on_notification=None, **kwargs) -> Instance:
@@ -1560,41 +1601,81 @@ class Pipeline(BaseCodeChecker):
       return instance
     
     
+    @staticmethod
+    def __get_remote_plugins(config):
+      for k, v in config.items():
+        if k.upper() == 'PLUGINS':
+          return v or []
+      return []
+
+    def __get_remote_instances(self, config):
+      if config is None:
+        return {}
+      return {
+        (dct_signature_instances['SIGNATURE'].upper(), dct_instance['INSTANCE_ID']): dct_instance
+        for dct_signature_instances in self.__get_remote_plugins(config)
+        for dct_instance in dct_signature_instances['INSTANCES']
+      }
+
     def _sync_configuration_with_remote(self, config={}, plugins_statuses : list = None):
       """
-      Given a configuration, update the pipeline configuration and the 
+      Given a configuration received from the network, update the pipeline configuration and the 
       instances configuration.
-            
-      """
-      config.pop('NAME', None)
-      config.pop('TYPE', None)
-      plugins = config.pop('PLUGINS', {})
 
-      self.config = {**self.config, **config}
-      
-      self.__update_plugins_statuses_data(plugins_statuses)
-
-      active_plugins = []
-      for dct_signature_instances in plugins:
-        signature = dct_signature_instances['SIGNATURE']
-        instances = dct_signature_instances['INSTANCES']
-        for dct_instance in instances:
-          instance_id = dct_instance.pop('INSTANCE_ID')
-          active_plugins.append((signature, instance_id))
-          instance_object = self.__get_instance_object(signature, instance_id)
-          if instance_object is None:
-            instance_object = self.__init_instance(signature, instance_id, dct_instance, None, None, is_attached=True) # here the plugin status is updated if data is available
-          else:
-            instance_object._sync_configuration_with_remote(dct_instance) 
-          # next we update the plugin status from known plugins statuses
-          self._update_plugin_status(instance_object)
-        # end for dct_instance
-      # end for dct_signature_instances
-
-      for instance in self.lst_plugin_instances:
-        if (instance.signature, instance.instance_id) not in active_plugins:
-          self.__remove_plugin_instance(instance)
-      # end for instance
+      The received objects are not modified, and are compared with the previously received ones:
+      unchanged configurations (the steady state of the net-config refreshes) only refresh the
+      plugins statuses, otherwise only the instances whose configuration changed are updated.
+      """
+      with self.__instances_lock:
+        self.__update_plugins_statuses_data(plugins_statuses)
+        previous_config, self.__remote_config = self.__remote_config, config
+        if config is previous_config or config == previous_config:
+          if self.__pending_plugins is not None:
+            # point to the newest (equal) objects so the previous message can be released
+            self.__pending_plugins = self.__get_remote_plugins(config)
+          return
+
+        dct_config = {}
+        for k, v in config.items():
+          k = k.upper()
+          if k not in ('NAME', 'TYPE', 'PLUGINS'):
+            dct_config[k] = v
+        # endfor config
+        self.config = {**self.config, **dct_config}
+
+        plugins = self.__get_remote_plugins(config)
+        if self.__pending_plugins is not None:
+          # the instances were not created yet so just keep the newest plugins configuration
+          self.__pending_plugins = plugins
+          return
+
+        dct_previous_instances = self.__get_remote_instances(previous_config)
+        dct_instances = {
+          (instance.signature, instance.instance_id): instance for instance in self.lst_plugin_instances
+        }
+        active_plugins = set()
+        for dct_signature_instances in plugins:
+          signature = dct_signature_instances['SIGNATURE'].upper()
+          instances = dct_signature_instances['INSTANCES']
+          for dct_instance in instances:
+            key = (signature, dct_instance['INSTANCE_ID'])
+            active_plugins.add(key)
+            instance_object = dct_instances.get(key)
+            if instance_object is not None and dct_previous_instances.get(key) == dct_instance:
+              continue
+            instance_config = {k: v for k, v in dct_instance.items() if k != 'INSTANCE_ID'}
+            if instance_object is None:
+              self.__init_instance(signature, key[1], instance_config, None, None, is_attached=True)
+            else:
+              instance_object._sync_configuration_with_remote(instance_config)
+          # end for dct_instance
+        # end for dct_signature_instances
+
+        for key, instance in dct_instances.items():
+          if key not in active_plugins:
+            self.__remove_plugin_instance(instance)
+        # end for instance
+      # endwith instances lock
       return
 
     def update_full_configuration(self, config={}):
@@ -2,6 +2,9 @@ from ..const.payload import NOTIFICATION_CODES, PAYLOAD_DATA
 
 
 class Response():
+  # responses are created for each deploy/command - keep them small
+  __slots__ = ('__is_solved', '__is_good', '__log', '__fail_reason')
+
   def __init__(self) -> None:
     self.__is_solved = False
     self.__is_good = None
@@ -61,6 +64,8 @@ class Response():
 
 
 class PipelineGenericNotificationResponse(Response):
+  __slots__ = ('node', 'pipeline_name', 'success_code', 'fail_code')
+
   def __init__(self, node, pipeline_name, success_code, fail_code) -> None:
     super(PipelineGenericNotificationResponse, self).__init__()
 
@@ -99,13 +104,14 @@ class PipelineGenericNotificationResponse(Response):
 
 
 class InstanceGenericNotificationResponse(Response):
+  __slots__ = ('node', 'pipeline_name', 'signature', 'instance_id', 'success_code', 'fail_code')
+
   def __init__(self, node, pipeline_name, signature, instance_id, success_code, fail_code) -> None:
     super(InstanceGenericNotificationResponse, self).__init__()
 
     self.node = node
     self.pipeline_name = pipeline_name
-    if signature is not None:
-      self.signature = signature.upper()
+    self.signature = signature.upper() if signature is not None else None
     self.instance_id = instance_id
 
     self.success_code = success_code
@@ -149,6 +155,8 @@ class InstanceGenericNotificationResponse(Response):
 
 
 class PipelineOKResponse(PipelineGenericNotificationResponse):
+  __slots__ = ()
+
   def __init__(self, node, pipeline_name) -> None:
     super(PipelineOKResponse, self).__init__(
       node=node,
@@ -160,6 +168,8 @@ class PipelineOKResponse(PipelineGenericNotificationResponse):
 
 
 class PipelineArchiveResponse(PipelineGenericNotificationResponse):
+  __slots__ = ()
+
   def __init__(self, node, pipeline_name) -> None:
     super(PipelineArchiveResponse, self).__init__(
       node=node,
@@ -171,6 +181,8 @@ class PipelineArchiveResponse(PipelineGenericNotificationResponse):
 
 
 class PluginConfigInPauseOKResponse(InstanceGenericNotificationResponse):
+  __slots__ = ()
+
   def __init__(self, node, pipeline_name, signature, instance_id) -> None:
     super(PluginConfigInPauseOKResponse, self).__init__(
       node=node,
@@ -184,6 +196,8 @@ class PluginConfigInPauseOKResponse(InstanceGenericNotificationResponse):
 
 
 class PluginConfigOKResponse(InstanceGenericNotificationResponse):
+  __slots__ = ()
+
   def __init__(self, node, pipeline_name, signature, instance_id) -> None:
     super(PluginConfigOKResponse, self).__init__(
       node=node,
@@ -197,6 +211,8 @@ class PluginConfigOKResponse(InstanceGenericNotificationResponse):
 
 
 class PluginInstanceCommandOKResponse(InstanceGenericNotificationResponse):
+  __slots__ = ()
+
   def __init__(self, node, pipeline_name, signature, instance_id) -> None:
     super(PluginInstanceCommandOKResponse, self).__init__(
       node=node,
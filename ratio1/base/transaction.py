@@ -4,6 +4,12 @@ from time import time, sleep
 
 
 class Transaction():
+  __slots__ = (
+    'log', 'session_id', 'lst_required_responses', 'timeout',
+    'on_success_callback', 'on_failure_callback', 'resolved_callback',
+    '__is_solved', '__is_finished', '__is_successful', 'start_time',
+  )
+
   def __init__(self, log, session_id: str, *, lst_required_responses: list[Response] = None, timeout: int = 0, on_success_callback: callable = None, on_failure_callback: callable = None) -> None:
     self.log = log
     self.session_id = session_id
@@ -16,6 +22,7 @@ class Transaction():
     self.resolved_callback = None
     self.__is_solved = False
     self.__is_finished = False
+    self.__is_successful = None
 
     self.start_time = time()
     for response in self.lst_required_responses:
@@ -55,6 +62,7 @@ class Transaction():
       self.__is_solved = True
 
       all_responses_good = all([response.is_good_response() for response in self.lst_required_responses])
+      self.__is_successful = all_responses_good
       if all_responses_good:
         self.resolved_callback = self.on_success_callback
       else:
@@ -74,6 +82,7 @@ class Transaction():
     if self.timeout > 0 and elapsed_time > self.timeout:
       # Timeout occurred
       self.__is_solved = True
+      self.__is_successful = False
 
       fail_reason = f"Transaction timeout ({self.timeout}s). Responses not received: "
       fail_reason += ", ".join([str(response) for response in self.lst_required_responses if not response.is_solved()])
@@ -98,6 +107,18 @@ class Transaction():
     """
     return self.__is_finished
 
+  def is_successful(self):
+    """
+    Returns whether the transaction was solved with all the required responses being good.
+
+    Returns
+    -------
+    bool | None
+        True if all responses were good, False if any failed or the transaction timed out,
+        None if the transaction is not solved yet.
+    """
+    return self.__is_successful
+
   def handle_payload(self, payload: dict) -> None:
     """
     This method is called when a payload is received from the server.
@@ -1,15 +1,17 @@
 import json
 import os
+import numpy as np
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from threading import Lock
 
 from datetime import timezone, datetime
 
-from eth_account import Account
-from eth_utils import keccak, to_checksum_address
-from eth_account.messages import encode_defunct
+import requests
 
 from ..const.base import EE_VPN_IMPL_ENV_KEY, dAuth
+from ..utils.lazy_import import LazyImport
+from .evm_batch import BatchCall, TTLCache, Web3BatchReader, ETH_BALANCE_SIGNATURE
 
 EE_VPN_IMPL = str(os.environ.get(EE_VPN_IMPL_ENV_KEY, False)).lower() in [
   'true', '1', 'yes', 'y', 't', 'on'
@@ -29,8 +31,14 @@ Web3Vars = namedtuple(
 )
 
 
+# the eth/web3 stack is heavy so it is only imported on first use
+Account = LazyImport("eth_account", "Account")
+encode_defunct = LazyImport("eth_account.messages", "encode_defunct")
+keccak = LazyImport("eth_utils", "keccak")
+to_checksum_address = LazyImport("eth_utils", "to_checksum_address")
+
 if not EE_VPN_IMPL:
-  from web3 import Web3
+  Web3 = LazyImport("web3", "Web3")
 else:
   class Web3:
     """
@@ -147,6 +155,132 @@ GET_NODE_INFO_ABI = [
 ]
 
 
+NODE_ETH_ADDRESS_CACHE_SIZE = 65536
+
+
+class _NodeEthAddressCache:
+  """
+  Process-wide, bounded and thread-safe memo of the node address to ETH address
+  derivation (point decompression + keccak + checksum) with the reverse index.
+  Node addresses are stored without prefix.
+  """
+  def __init__(self, max_size=NODE_ETH_ADDRESS_CACHE_SIZE):
+    self.max_size = max_size
+    self.__node_to_eth = OrderedDict()
+    self.__eth_to_node = {}
+    self.__lock = Lock()
+    return
+
+  def get_eth(self, node_address):
+    with self.__lock:
+      eth_address = self.__node_to_eth.get(node_address)
+      if eth_address is not None:
+        self.__node_to_eth.move_to_end(node_address)
+    return eth_address
+
+  def get_node(self, eth_address):
+    with self.__lock:
+      return self.__eth_to_node.get(eth_address)
+
+  def put(self, node_address, eth_address):
+    with self.__lock:
+      self.__node_to_eth[node_address] = eth_address
+      self.__node_to_eth.move_to_end(node_address)
+      self.__eth_to_node[eth_address] = node_address
+      while len(self.__node_to_eth) > self.max_size:
+        old_node, old_eth = self.__node_to_eth.popitem(last=False)
+        if self.__eth_to_node.get(old_eth) == old_node:
+          del self.__eth_to_node[old_eth]
+    return
+
+  def __len__(self):
+    return len(self.__node_to_eth)
+
+
+_NODE_ETH_CACHE = _NodeEthAddressCache()
+
+# short-TTL cache of the batched on-chain reads keyed by (network, address, method)
+_WEB3_READ_CACHE = TTLCache()
+
+WEB3_HTTP_POOL_CONNECTIONS = 4
+WEB3_HTTP_POOL_MAXSIZE = 32
+
+
+class _Web3Registry:
+  """
+  Process-wide registry of the per-network Web3 objects: one `Web3` (and `Web3BatchReader`)
+  per network, all sharing a keep-alive `requests.Session`, the pre-parsed `Web3Vars` and the
+  contract objects built lazily per (network, address, ABI). This way repeated (cross-network)
+  queries do not pay the TCP/TLS setup, genesis date parsing and ABI processing each time.
+  """
+  def __init__(self):
+    self.__session = None
+    self.__web3 = {}        # (network, rpc_url) -> Web3
+    self.__vars = {}        # network -> Web3Vars
+    self.__contracts = {}   # (network, address, id(abi)) -> (contract, abi)
+    self.__readers = {}     # network -> Web3BatchReader
+    self.__lock = Lock()
+    return
+
+  def get_session(self):
+    with self.__lock:
+      if self.__session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+          pool_connections=WEB3_HTTP_POOL_CONNECTIONS,
+          pool_maxsize=WEB3_HTTP_POOL_MAXSIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.__session = session
+    return self.__session
+
+  def get_web3(self, network, rpc_url):
+    key = (network, rpc_url)
+    w3 = self.__web3.get(key)
+    if w3 is None:
+      session = self.get_session()
+      with self.__lock:
+        w3 = self.__web3.get(key)
+        if w3 is None:
+          w3 = Web3(Web3.HTTPProvider(rpc_url, session=session))
+          self.__web3[key] = w3
+    return w3
+
+  def get_vars(self, network):
+    return self.__vars.get(network)
+
+  def set_vars(self, network, w3vars):
+    with self.__lock:
+      self.__vars[network] = w3vars
+    return
+
+  def get_contract(self, w3vars, address, abi):
+    key = (w3vars.network, address, id(abi))
+    entry = self.__contracts.get(key)
+    if entry is None:
+      contract = w3vars.w3.eth.contract(address=address, abi=abi)
+      with self.__lock:
+        # the abi is kept in the entry so its id cannot be reused while cached
+        entry = self.__contracts.setdefault(key, (contract, abi))
+    return entry[0]
+
+  def get_batch_reader(self, w3vars, cache):
+    reader = self.__readers.get(w3vars.network)
+    if reader is None or reader.w3 is not w3vars.w3:
+      reader = Web3BatchReader(w3vars.w3, w3vars.network, cache=cache)
+      with self.__lock:
+        self.__readers[w3vars.network] = reader
+    return reader
+
+
+_WEB3_REGISTRY = _Web3Registry()
+
+_EPOCH_PARAMS = {}  # network -> (genesis as datetime64[us], epoch length in microseconds)
+
+NODE_LICENSE_DETAILS_TYPE = "(uint8,uint256,address,address,uint256,uint256,uint256,uint256,address,bool)"
+
+
 class _EVMMixin:
   
   # EVM address methods
@@ -231,8 +365,57 @@ class _EVMMixin:
       str
           The Ethereum address.
       """
-      public_key = self._address_to_pk(address)
-      return self._get_eth_address(pk=public_key)
+      simple_address = self._remove_prefix(address)
+      eth_address = _NODE_ETH_CACHE.get_eth(simple_address)
+      if eth_address is None:
+        public_key = self._address_to_pk(simple_address)
+        eth_address = self._get_eth_address(pk=public_key)
+        _NODE_ETH_CACHE.put(simple_address, eth_address)
+      return eth_address
+
+
+    def node_addresses_to_eth_addresses(self, addresses):
+      """
+      Bulk conversion (and cache warm-start) of node addresses to Ethereum addresses.
+      Only the addresses not already known are derived.
+
+      Parameters
+      ----------
+      addresses : list[str]
+          The node addresses to convert.
+
+      Returns
+      -------
+      dict
+          Dictionary with the node address (as received) as key and the Ethereum address as value.
+      """
+      result = {}
+      for address in addresses:
+        if address is None or address in result:
+          continue
+        result[address] = self.node_address_to_eth_address(address)
+      return result
+
+
+    def eth_address_to_node_address(self, eth_address):
+      """
+      Returns the node address (with prefix) for an Ethereum address if the node address was
+      previously converted (or warm-started) in this process, otherwise None.
+
+      Parameters
+      ----------
+      eth_address : str
+          The Ethereum address.
+
+      Returns
+      -------
+      str or None
+          The node address.
+      """
+      simple_address = _NODE_ETH_CACHE.get_node(eth_address)
+      if simple_address is None:
+        return None
+      return self._add_prefix(simple_address)
 
 
     def is_node_address_in_eth_addresses(self, node_address: str, lst_eth_addrs) -> bool:
@@ -290,7 +473,7 @@ class _EVMMixin:
         self.current_evm_network = network
         network_data = self.get_network_data(network)
         rpc_url = network_data[dAuth.EvmNetData.DAUTH_RPC_KEY]
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.web3 = _WEB3_REGISTRY.get_web3(network, rpc_url)
         self.P(f"Resetting Web3 for {network=} via {rpc_url=}...")
       return network
     
@@ -323,10 +506,10 @@ class _EVMMixin:
     def _get_web3_vars(self, network=None) -> Web3Vars:
       if network is None:
         network = self.evm_network
-        w3 = self.web3
-      else:
-        w3 = None
-        
+      w3vars = _WEB3_REGISTRY.get_vars(network)
+      if w3vars is not None:
+        return w3vars
+
       network_data = self.get_network_data(network)
       nd_contract_address = network_data[dAuth.EvmNetData.DAUTH_ND_ADDR_KEY]
       rpc_url = network_data[dAuth.EvmNetData.DAUTH_RPC_KEY]
@@ -339,10 +522,8 @@ class _EVMMixin:
         network_data[dAuth.EvmNetData.EE_EPOCH_INTERVALS_KEY]
       )
 
-      if w3 is None:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        self.P(f"Created temporary Web3 for {network=} via {rpc_url=}...", verbosity=2)
-      #end if
+      w3 = _WEB3_REGISTRY.get_web3(network, rpc_url)
+      self.P(f"Created pooled Web3 for {network=} via {rpc_url=}...", verbosity=2)
       
       result = Web3Vars(
         w3=w3, 
@@ -354,8 +535,16 @@ class _EVMMixin:
         r1_contract_address=r1_contract_address, 
         proxy_contract_address=proxy_contract_address,        
       )
+      _WEB3_REGISTRY.set_vars(network, result)
       return result
 
+
+    def _get_web3_contract(self, w3vars, address, abi):
+      """
+      Returns the (cached) contract object for the given network, address and ABI.
+      """
+      return _WEB3_REGISTRY.get_contract(w3vars, address, abi)
+
   # Epoch handling
   if True:    
     def get_epoch_id(self, date : any, network: str = None):
@@ -404,6 +593,110 @@ class _EVMMixin:
       Returns the current epoch id using `get_time_epoch`.
       """
       return self.get_time_epoch()    
+
+
+    def _get_epoch_params(self, network=None):
+      """
+      Returns the genesis date as naive UTC `datetime64[us]` and the epoch length in microseconds.
+      """
+      w3vars = self._get_web3_vars(network)
+      params = _EPOCH_PARAMS.get(w3vars.network)
+      if params is None:
+        genesis = np.datetime64(w3vars.genesis_date.replace(tzinfo=None), 'us')
+        params = (genesis, int(w3vars.epoch_length_seconds * 1_000_000))
+        _EPOCH_PARAMS[w3vars.network] = params
+      return params
+
+
+    def _dates_to_datetime64(self, dates):
+      """
+      Converts a list of str/datetime, a numpy datetime64 array or a pandas Series to a naive UTC
+      `datetime64[us]` array. Strings and naive datetimes are considered UTC.
+      """
+      dt_accessor = getattr(dates, 'dt', None)
+      if dt_accessor is not None and getattr(dt_accessor, 'tz', None) is not None:
+        # tz-aware pandas Series
+        dates = dt_accessor.tz_convert('UTC').dt.tz_localize(None)
+      if hasattr(dates, 'to_numpy'):
+        dates = dates.to_numpy()
+      arr = np.asarray(dates)
+      if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[us]')
+      values = []
+      for date in arr.ravel().tolist():
+        if isinstance(date, str):
+          # remove milliseconds from string as in `get_epoch_id`
+          values.append(date.split('.')[0])
+        elif isinstance(date, datetime):
+          if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+          values.append(date)
+        else:
+          values.append(date)
+      # endfor
+      try:
+        result = np.array(values, dtype='datetime64[us]')
+      except ValueError:
+        # non-ISO strings - parse them one by one
+        result = np.array([
+          self.log.str_to_date(x) if isinstance(x, str) else x for x in values
+        ], dtype='datetime64[us]')
+      return result.reshape(arr.shape)
+
+
+    def get_epoch_ids(self, dates, network: str = None):
+      """
+      Vectorized version of `get_epoch_id`.
+
+      Parameters
+      ----------
+      dates : list, np.ndarray or pd.Series
+        The dates as strings, datetimes or numpy `datetime64` values. Naive values are UTC.
+
+      network : str, optional
+        The network. Default is the current network.
+
+      Returns
+      -------
+      np.ndarray
+        The epoch ids as int64 array with the same shape as `dates`.
+      """
+      genesis, epoch_length_us = self._get_epoch_params(network)
+      arr = self._dates_to_datetime64(dates)
+      elapsed_us = (arr - genesis).astype(np.int64)
+      # truncation (not floor) to match `int(elapsed_seconds / epoch_length_seconds)`
+      return np.trunc(elapsed_us / epoch_length_us).astype(np.int64)
+
+
+    def epoch_to_interval(self, epoch_ids, network: str = None):
+      """
+      Returns the start and end (inclusive, last second) of the given epoch(s) in UTC.
+
+      Parameters
+      ----------
+      epoch_ids : int or list or np.ndarray
+        The epoch id(s).
+
+      network : str, optional
+        The network. Default is the current network.
+
+      Returns
+      -------
+      tuple
+        (start, end) as timezone-aware datetimes for a single epoch id or as naive UTC
+        `datetime64[s]` arrays for multiple epoch ids.
+      """
+      genesis, epoch_length_us = self._get_epoch_params(network)
+      ids = np.asarray(epoch_ids, dtype=np.int64)
+      starts = genesis + ids * np.timedelta64(epoch_length_us, 'us')
+      ends = starts + np.timedelta64(epoch_length_us, 'us') - np.timedelta64(1, 's')
+      starts, ends = starts.astype('datetime64[s]'), ends.astype('datetime64[s]')
+      if ids.ndim == 0:
+        return (
+          starts.item().replace(tzinfo=timezone.utc),
+          ends.item().replace(tzinfo=timezone.utc),
+        )
+      return starts, ends
     
   ## End Epoch handling
       
@@ -609,7 +902,7 @@ class _EVMMixin:
         self.P(f"Checking if {address} ({network}) is allowed...")
       
       contract_abi = dAuth.DAUTH_ABI_IS_NODE_ACTIVE
-      contract = w3vars.w3.eth.contract(address=w3vars.nd_contract_address, abi=contract_abi)
+      contract = self._get_web3_contract(w3vars, w3vars.nd_contract_address, contract_abi)
 
       result = contract.functions.isNodeActive(address).call()
       return result
@@ -636,9 +929,7 @@ class _EVMMixin:
         self.P(f"Getting oracles for {w3vars.network} via {w3vars.rpc_url}...")
       
       contract_abi = dAuth.DAUTH_ABI_GET_SIGNERS
-      contract = w3vars.w3.eth.contract(
-        address=w3vars.nd_contract_address, abi=contract_abi
-      )
+      contract = self._get_web3_contract(w3vars, w3vars.nd_contract_address, contract_abi)
 
       result = contract.functions.getSigners().call()
       return result    
@@ -768,6 +1059,8 @@ class _EVMMixin:
       
       # Broadcast the signed transaction.
       tx_hash = w3vars.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+      _WEB3_READ_CACHE.invalidate(network=network, address=from_address)
+      _WEB3_READ_CACHE.invalidate(network=network, address=to_address)
       
       if wait_for_tx:
         # Wait for the transaction receipt with the specified timeout.
@@ -802,9 +1095,7 @@ class _EVMMixin:
       assert self.is_valid_eth_address(address), "Invalid Ethereum address"
       w3vars = self._get_web3_vars(network)
 
-      token_contract = w3vars.w3.eth.contract(
-        address=w3vars.r1_contract_address, abi=ERC20_ABI
-      )
+      token_contract = self._get_web3_contract(w3vars, w3vars.r1_contract_address, ERC20_ABI)
 
       try:
         decimals = token_contract.functions.decimals().call()
@@ -871,9 +1162,7 @@ class _EVMMixin:
       network = w3vars.network
       
       # Create the token contract instance.
-      token_contract = w3vars.w3.eth.contract(
-        address=w3vars.r1_contract_address, abi=ERC20_ABI
-      )
+      token_contract = self._get_web3_contract(w3vars, w3vars.r1_contract_address, ERC20_ABI)
       
       # Get the token's decimals (default to 18 if not available).
       try:
@@ -932,6 +1221,8 @@ class _EVMMixin:
       
       # Broadcast the transaction.
       tx_hash = w3vars.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+      _WEB3_READ_CACHE.invalidate(network=w3vars.network, address=self.eth_address)
+      _WEB3_READ_CACHE.invalidate(network=w3vars.network, address=to_address)
       
       if wait_for_tx:
         # Wait for the transaction receipt if required.
@@ -983,16 +1274,31 @@ class _EVMMixin:
       # Create the contract instance for retrieving node info.
       # Assuming you have a specific contract address in w3vars (e.g. license_contract_address),
       # or you may adapt this code if your contract address is stored differently.
-      contract = w3vars.w3.eth.contract(
-        address=w3vars.proxy_contract_address,  # or the relevant address from your environment
-        abi=GET_NODE_INFO_ABI
-      )
+      contract = self._get_web3_contract(w3vars, w3vars.proxy_contract_address, GET_NODE_INFO_ABI)
 
       self.P(f"`getNodeLicenseDetails` on {network} via {w3vars.rpc_url}", verbosity=2)
 
       # Call the contract function to get details.
       result_tuple = contract.functions.getNodeLicenseDetails(node_address).call()
 
+      details = self._license_details_to_dict(network, result_tuple)
+
+      self.P(f"Node Info:\n{json.dumps(details, indent=2)}", verbosity=2)
+
+      if not details['isValid']:
+        if raise_if_issue:
+          msg = f"Node {node_address} is not valid."
+          raise Exception(msg)
+        else:
+          pass
+      #end if
+      return details
+
+
+    def _license_details_to_dict(self, network, result_tuple):
+      """
+      Converts the `getNodeLicenseDetails` result tuple to a dict and validates it.
+      """
       # Unpack the tuple into a dictionary for readability.
       details = {
         "network": network,
@@ -1019,14 +1325,161 @@ class _EVMMixin:
       )
       
       details['isValid'] = is_valid
+      return details
 
-      self.P(f"Node Info:\n{json.dumps(details, indent=2)}", verbosity=2)
+  # Batched EVM reads
+  if True:
+    def _get_web3_batch_reader(self, network=None):
+      w3vars = self._get_web3_vars(network)
+      reader = _WEB3_REGISTRY.get_batch_reader(w3vars, cache=_WEB3_READ_CACHE)
+      return w3vars, reader
 
-      if not is_valid:
-        if raise_if_issue:
-          msg = f"Node {node_address} is not valid."
-          raise Exception(msg)
-        else:
-          pass
-      #end if
-      return details
\ No newline at end of file
+
+    def web3_clear_read_cache(self, network=None, address=None):
+      """
+      Drops the cached batched reads for the given network and/or address (all if none given).
+      """
+      _WEB3_READ_CACHE.invalidate(network=network, address=address)
+      return
+
+
+    def web3_get_balances_eth(self, addresses, network=None, use_cache=True):
+      """
+      Get the ETH balances of multiple addresses with as few RPC requests as possible
+      (Multicall3 `getEthBalance` or a JSON-RPC batch of `eth_getBalance`).
+
+      Parameters
+      ----------
+      addresses : list[str]
+          The addresses to check.
+      network : str, optional
+          The network to use. Default is None.
+      use_cache : bool, optional
+          Use the short-TTL read cache. Default is True.
+
+      Returns
+      -------
+      dict
+          Dictionary with the address as key and the balance (or None if the read failed) as value.
+      """
+      addresses = list(dict.fromkeys(addresses))
+      for address in addresses:
+        assert self.is_valid_eth_address(address), f"Invalid Ethereum address {address}"
+      w3vars, reader = self._get_web3_batch_reader(network)
+      calls = [
+        BatchCall(None, ETH_BALANCE_SIGNATURE, ["address"], [address], ["uint256"], address, "eth_balance")
+        for address in addresses
+      ]
+      results = reader.execute(calls, use_cache=use_cache)
+      return {
+        address: None if value is None else float(w3vars.w3.from_wei(value, 'ether'))
+        for address, value in zip(addresses, results)
+      }
+
+
+    def web3_get_balances_r1(self, addresses, network=None, use_cache=True):
+      """
+      Get the R1 balances of multiple addresses in batched requests.
+
+      Parameters
+      ----------
+      addresses : list[str]
+          The addresses to check.
+      network : str, optional
+          The network to use. Default is None.
+      use_cache : bool, optional
+          Use the short-TTL read cache. Default is True.
+
+      Returns
+      -------
+      dict
+          Dictionary with the address as key and the balance (or None if the read failed) as value.
+      """
+      addresses = list(dict.fromkeys(addresses))
+      for address in addresses:
+        assert self.is_valid_eth_address(address), f"Invalid Ethereum address {address}"
+      w3vars, reader = self._get_web3_batch_reader(network)
+      token = w3vars.r1_contract_address
+      calls = [BatchCall(token, "decimals()", [], [], ["uint8"], token, "decimals")]
+      calls += [
+        BatchCall(token, "balanceOf(address)", ["address"], [address], ["uint256"], address, "r1_balance")
+        for address in addresses
+      ]
+      results = reader.execute(calls, use_cache=use_cache)
+      decimals = results[0] if results[0] is not None else 18  # default to 18 if the decimals call fails
+      return {
+        address: None if value is None else float(value / (10 ** decimals))
+        for address, value in zip(addresses, results[1:])
+      }
+
+
+    def web3_are_nodes_licensed(self, addresses, network=None, use_cache=True):
+      """
+      Batched version of `web3_is_node_licensed`.
+
+      Parameters
+      ----------
+      addresses : list[str]
+          The node Ethereum addresses to check.
+      network : str, optional
+          The network to use. Default is None.
+      use_cache : bool, optional
+          Use the short-TTL read cache. Default is True.
+
+      Returns
+      -------
+      dict
+          Dictionary with the address as key and the license status (None if the read failed) as value.
+      """
+      if EE_VPN_IMPL:
+        self.P("VPN implementation. Skipping Ethereum check.", color='r')
+        return {address: False for address in addresses}
+      addresses = list(dict.fromkeys(addresses))
+      for address in addresses:
+        assert self.is_valid_eth_address(address), f"Invalid Ethereum address {address}"
+      w3vars, reader = self._get_web3_batch_reader(network)
+      calls = [
+        BatchCall(
+          w3vars.nd_contract_address, "isNodeActive(address)", ["address"], [address], ["bool"],
+          address, "isNodeActive"
+        )
+        for address in addresses
+      ]
+      results = reader.execute(calls, use_cache=use_cache)
+      return dict(zip(addresses, results))
+
+
+    def web3_get_nodes_info(self, addresses, network=None, use_cache=True):
+      """
+      Batched version of `web3_get_node_info`.
+
+      Parameters
+      ----------
+      addresses : list[str]
+          The node Ethereum addresses.
+      network : str, optional
+          The network to use. Default is None.
+      use_cache : bool, optional
+          Use the short-TTL read cache. Default is True.
+
+      Returns
+      -------
+      dict
+          Dictionary with the address as key and the license details dict (None if the read failed) as value.
+      """
+      addresses = list(dict.fromkeys(addresses))
+      for address in addresses:
+        assert self.is_valid_eth_address(address), f"Invalid Ethereum address {address}"
+      w3vars, reader = self._get_web3_batch_reader(network)
+      calls = [
+        BatchCall(
+          w3vars.proxy_contract_address, "getNodeLicenseDetails(address)", ["address"], [address],
+          [NODE_LICENSE_DETAILS_TYPE], address, "getNodeLicenseDetails"
+        )
+        for address in addresses
+      ]
+      results = reader.execute(calls, use_cache=use_cache)
+      return {
+        address: None if value is None else self._license_details_to_dict(w3vars.network, value)
+        for address, value in zip(addresses, results)
+      }
@@ -0,0 +1,315 @@
+"""
+Batched read-only EVM calls.
+
+Many `eth_call`s (balances, licenses, node info) are aggregated into Multicall3
+`aggregate3` requests - one RPC round-trip per `batch_size` calls instead of one per
+call. When the chain (e.g. a bare local Anvil/Hardhat node) has no Multicall3 deployed
+(checked once with `eth_getCode`) the reader falls back to a single JSON-RPC batch request
+of plain `eth_call`s and, if the provider does not support batching either, to individual
+calls. Other Multicall3 failures (timeouts, rate limits) only make the current chunk fall
+back, and Multicall3 is retried after a short backoff.
+
+Results are kept in a short-TTL cache keyed by `(network, address, method)` so that
+successive listings (e.g. `get_network_known_nodes(eth=True)` refreshes) do not hit the
+RPC again for the same data.
+"""
+from collections import namedtuple
+from threading import Lock
+from time import time as tm
+
+from ..utils.lazy_import import LazyImport
+
+keccak = LazyImport("eth_utils", "keccak")
+
+
+# Multicall3 is deployed at the same address on all the major EVM chains (incl. Base)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+  {
+    "inputs": [
+      {
+        "components": [
+          {"internalType": "address", "name": "target", "type": "address"},
+          {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+          {"internalType": "bytes", "name": "callData", "type": "bytes"}
+        ],
+        "internalType": "struct Multicall3.Call3[]",
+        "name": "calls",
+        "type": "tuple[]"
+      }
+    ],
+    "name": "aggregate3",
+    "outputs": [
+      {
+        "components": [
+          {"internalType": "bool", "name": "success", "type": "bool"},
+          {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+        ],
+        "internalType": "struct Multicall3.Result[]",
+        "name": "returnData",
+        "type": "tuple[]"
+      }
+    ],
+    "stateMutability": "payable",
+    "type": "function"
+  },
+]
+
+# calls with `target=None` and this signature are native balance reads: `getEthBalance` on
+# Multicall3 or `eth_getBalance` when falling back to plain JSON-RPC
+ETH_BALANCE_SIGNATURE = "getEthBalance(address)"
+
+WEB3_READ_CACHE_TTL = 15  # seconds
+WEB3_BATCH_SIZE = 200
+WEB3_MULTICALL_RETRY_BACKOFF = 30  # seconds
+
+
+BatchCall = namedtuple(
+  "BatchCall", [
+    "target",         # contract address (None for ETH balance reads)
+    "signature",      # e.g. "balanceOf(address)"
+    "arg_types",      # e.g. ["address"]
+    "args",           # e.g. ["0x..."]
+    "output_types",   # e.g. ["uint256"]
+    "cache_address",  # the address the result refers to (used in the cache key)
+    "method",         # the method name used in the cache key
+  ]
+)
+
+
+class TTLCache:
+  """
+  Thread-safe cache with a fixed time-to-live for each entry.
+  """
+  def __init__(self, ttl=WEB3_READ_CACHE_TTL):
+    self.ttl = ttl
+    self.__data = {}
+    self.__lock = Lock()
+    return
+
+  @staticmethod
+  def make_key(network, address, method):
+    return (network, str(address).lower(), method)
+
+  def get(self, key, default_value=None):
+    with self.__lock:
+      entry = self.__data.get(key)
+      if entry is None:
+        return default_value
+      expires_at, value = entry
+      if expires_at < tm():
+        del self.__data[key]
+        return default_value
+    return value
+
+  def put(self, key, value, ttl=None):
+    ttl = self.ttl if ttl is None else ttl
+    with self.__lock:
+      self.__data[key] = (tm() + ttl, value)
+    return
+
+  def invalidate(self, network=None, address=None):
+    """
+    Drops the entries matching the given network and/or address (all if none given).
+    """
+    address = None if address is None else str(address).lower()
+    with self.__lock:
+      if network is None and address is None:
+        self.__data.clear()
+      else:
+        keys = [
+          k for k in self.__data
+          if (network is None or k[0] == network) and (address is None or k[1] == address)
+        ]
+        for k in keys:
+          del self.__data[k]
+      # endif
+    return
+
+  def __len__(self):
+    return len(self.__data)
+
+
+_SELECTORS = {}
+
+
+def get_selector(signature):
+  """
+  Returns the 4-byte function selector of a signature such as "balanceOf(address)".
+  """
+  selector = _SELECTORS.get(signature)
+  if selector is None:
+    selector = keccak(text=signature)[:4]
+    _SELECTORS[signature] = selector
+  return selector
+
+
+class Web3BatchReader:
+  """
+  Executes many read-only contract calls with as few RPC round-trips as possible.
+
+  Parameters
+  ----------
+  w3 : Web3
+      The Web3 instance of the network.
+  network : str
+      The network name (used in the cache keys).
+  cache : TTLCache, optional
+      The cache of the results. No caching if None.
+  multicall_address : str, optional
+      The address of the Multicall3 contract. None disables Multicall3.
+  batch_size : int, optional
+      Maximum number of calls aggregated in one request.
+  """
+  def __init__(self, w3, network, cache=None, multicall_address=MULTICALL3_ADDRESS, batch_size=WEB3_BATCH_SIZE):
+    self.w3 = w3
+    self.network = network
+    self.cache = cache
+    self.multicall_address = multicall_address
+    self.batch_size = batch_size
+    self.n_requests = 0
+    self.__multicall = None
+    # None until the contract code is checked, then True/False
+    self.__multicall_deployed = None if multicall_address is not None else False
+    self.__multicall_retry_at = 0
+    return
+
+  def __is_multicall_usable(self):
+    if self.__multicall_deployed is False or tm() < self.__multicall_retry_at:
+      return False
+    if self.__multicall_deployed is None:
+      try:
+        code = self.w3.eth.get_code(self.w3.to_checksum_address(self.multicall_address))
+      except Exception:
+        # cannot tell now - plain calls for this chunk, check again later
+        self.__multicall_retry_at = tm() + WEB3_MULTICALL_RETRY_BACKOFF
+        return False
+      self.__multicall_deployed = len(code) > 0
+    return self.__multicall_deployed
+
+  def __get_multicall(self):
+    if self.__multicall is None:
+      self.__multicall = self.w3.eth.contract(
+        address=self.w3.to_checksum_address(self.multicall_address), abi=MULTICALL3_ABI
+      )
+    return self.__multicall
+
+  def encode(self, call):
+    return get_selector(call.signature) + self.w3.codec.encode(list(call.arg_types), list(call.args))
+
+  def decode(self, call, data):
+    values = self.w3.codec.decode(list(call.output_types), bytes(data))
+    return values[0] if len(values) == 1 else values
+
+  def __get_target(self, call):
+    target = call.target if call.target is not None else self.multicall_address
+    return self.w3.to_checksum_address(target)
+
+  def __call_multicall(self, calls, lst_data):
+    lst_call3 = [(self.__get_target(call), True, data) for call, data in zip(calls, lst_data)]
+    self.n_requests += 1
+    results = self.__get_multicall().functions.aggregate3(lst_call3).call()
+    return [bytes(ret) if ok else None for ok, ret in results]
+
+  @staticmethod
+  def __raw_to_bytes(call, raw):
+    if raw is None:
+      return None
+    if call.target is None:
+      # eth_getBalance returns a quantity - encode it as the uint256 `getEthBalance` would
+      value = raw if isinstance(raw, int) else int(raw, 16)
+      return value.to_bytes(32, "big")
+    if isinstance(raw, str):
+      return bytes.fromhex(raw[2:] if raw.startswith("0x") else raw)
+    return bytes(raw)
+
+  def __call_rpc_batch(self, calls, lst_data):
+    provider = self.w3.provider
+    lst_requests = []
+    for call, data in zip(calls, lst_data):
+      if call.target is None:
+        lst_requests.append(("eth_getBalance", [self.w3.to_checksum_address(call.args[0]), "latest"]))
+      else:
+        lst_requests.append(
+          ("eth_call", [{"to": self.__get_target(call), "data": "0x" + data.hex()}, "latest"])
+        )
+    # endfor build requests
+    if hasattr(provider, "make_batch_request"):
+      try:
+        self.n_requests += 1
+        responses = provider.make_batch_request(lst_requests)
+        return [
+          self.__raw_to_bytes(call, resp.get("result") if isinstance(resp, dict) else None)
+          for call, resp in zip(calls, responses)
+        ]
+      except Exception:
+        pass
+    # no batching support - one request each
+    result = []
+    for call, (method, params) in zip(calls, lst_requests):
+      self.n_requests += 1
+      try:
+        resp = provider.make_request(method, params)
+        result.append(self.__raw_to_bytes(call, resp.get("result")))
+      except Exception:
+        result.append(None)
+    return result
+
+  def __execute_chunk(self, calls):
+    lst_data = [self.encode(call) for call in calls]
+    raw_results = None
+    if self.__is_multicall_usable():
+      try:
+        raw_results = self.__call_multicall(calls, lst_data)
+      except Exception:
+        # transient RPC error (Multicall3 is deployed) - plain calls for a while
+        self.__multicall_retry_at = tm() + WEB3_MULTICALL_RETRY_BACKOFF
+    if raw_results is None:
+      raw_results = self.__call_rpc_batch(calls, lst_data)
+    results = []
+    for call, raw in zip(calls, raw_results):
+      value = None
+      if raw:
+        try:
+          value = self.decode(call, raw)
+        except Exception:
+          value = None
+      results.append(value)
+    return results
+
+  def execute(self, calls, use_cache=True):
+    """
+    Executes the calls and returns the decoded results in the same order
+    (None for the failed calls).
+
+    Parameters
+    ----------
+    calls : list[BatchCall]
+        The calls to execute.
+    use_cache : bool, optional
+        Use (and refresh) the TTL cache. Default True.
+    """
+    results = [None] * len(calls)
+    pending = []
+    for i, call in enumerate(calls):
+      if use_cache and self.cache is not None:
+        key = TTLCache.make_key(self.network, call.cache_address, call.method)
+        value = self.cache.get(key)
+        if value is not None:
+          results[i] = value
+          continue
+      pending.append(i)
+    # endfor check cache
+
+    for start in range(0, len(pending), self.batch_size):
+      chunk_idxs = pending[start:start + self.batch_size]
+      chunk_results = self.__execute_chunk([calls[i] for i in chunk_idxs])
+      for i, value in zip(chunk_idxs, chunk_results):
+        results[i] = value
+        if value is not None and self.cache is not None:
+          call = calls[i]
+          self.cache.put(TTLCache.make_key(self.network, call.cache_address, call.method), value)
+      # endfor chunk results
+    # endfor chunks
+    return results
@@ -117,6 +117,9 @@ def main():
     initialized = maybe_init_config()
 
     if initialized:
+      from ratio1.cli.daemon import maybe_run_via_daemon
+      if maybe_run_via_daemon(sys.argv[1:]):
+        return
       parser = build_parser()
       args = parser.parse_args()
 
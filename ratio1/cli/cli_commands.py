@@ -9,16 +9,38 @@ and it is used by cli.py
 
 """
 
-from ratio1.cli.nodes import (
-  get_nodes, get_supervisors, 
-  restart_node, shutdown_node,
-  get_apps
-)
-from ratio1.cli.oracles import get_availability
-from ratio1.utils.config import (
-  show_config, reset_config, show_address, get_set_network,
-  get_networks, get_set_alias, get_eth_addr
-)
+import importlib
+
+
+def _lazy_handler(module_name, func_name):
+  """
+  Returns a handler that imports `module_name` only when the command is dispatched,
+  so each r1ctl invocation imports just what its own command needs.
+  """
+  def _handler(args):
+    func = getattr(importlib.import_module(module_name), func_name)
+    return func(args)
+  _handler.__name__ = func_name
+  _handler.__qualname__ = func_name
+  return _handler
+
+
+get_nodes = _lazy_handler("ratio1.cli.nodes", "get_nodes")
+get_supervisors = _lazy_handler("ratio1.cli.nodes", "get_supervisors")
+restart_node = _lazy_handler("ratio1.cli.nodes", "restart_node")
+shutdown_node = _lazy_handler("ratio1.cli.nodes", "shutdown_node")
+get_apps = _lazy_handler("ratio1.cli.nodes", "get_apps")
+get_availability = _lazy_handler("ratio1.cli.oracles", "get_availability")
+show_config = _lazy_handler("ratio1.utils.config", "show_config")
+reset_config = _lazy_handler("ratio1.utils.config", "reset_config")
+show_address = _lazy_handler("ratio1.utils.config", "show_address")
+get_set_network = _lazy_handler("ratio1.utils.config", "get_set_network")
+get_networks = _lazy_handler("ratio1.utils.config", "get_networks")
+get_set_alias = _lazy_handler("ratio1.utils.config", "get_set_alias")
+get_eth_addr = _lazy_handler("ratio1.utils.config", "get_eth_addr")
+daemon_start = _lazy_handler("ratio1.cli.daemon", "daemon_start")
+daemon_stop = _lazy_handler("ratio1.cli.daemon", "daemon_stop")
+daemon_status = _lazy_handler("ratio1.cli.daemon", "daemon_status")
 
 # Define the available commands
 CLI_COMMANDS = {
@@ -125,5 +147,19 @@ CLI_COMMANDS = {
         "params": {
             "node": "The node to shutdown"
         }
-    }
+    },
+    "daemon": {
+        "start": {
+            "func": daemon_start,
+            "description": "Start the background agent that keeps a warm session for the network commands",
+        },
+        "stop": {
+            "func": daemon_stop,
+            "description": "Stop the background agent",
+        },
+        "status": {
+            "func": daemon_status,
+            "description": "Show the status of the background agent",
+        },
+    },
 }
@@ -0,0 +1,354 @@
+"""
+daemon.py
+=========
+
+Optional long-lived r1ctl agent. It keeps one warm `Session` (connected, with the
+network map already received) and serves the network commands of the CLI over a
+local Unix socket, so `r1ctl get nodes` & co. return in milliseconds instead of
+connecting and waiting for the supervisors on every call.
+
+Protocol: one JSON request line per connection, one JSON response line back.
+  {"op": "ping"}                          -> {"ok": true, "pid": ..., "network": ..., "uptime": ...}
+  {"op": "stop"}                          -> {"ok": true}
+  {"op": "run", "argv": [...], "network": ...}
+                                          -> {"ok": true, "output": "..."} or {"ok": false, "error": "..."}
+
+When the agent is not running (or runs on another network) the CLI falls back to
+executing the command in-process as before.
+"""
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import traceback
+
+from contextlib import contextmanager
+from time import time, sleep
+
+from ratio1.utils.config import get_user_folder, log_with_color
+
+
+DAEMON_SOCKET_NAME = "r1ctl.sock"
+DAEMON_LOG_NAME = "r1ctl_daemon.log"
+DAEMON_START_TIMEOUT = 60
+DAEMON_REQUEST_TIMEOUT = 180
+
+# (command, subcommand) pairs that are served by the agent - the config commands
+# change the local configuration so they always run in-process
+DAEMON_COMMANDS = {
+  ("get", "nodes"),
+  ("get", "supervisors"),
+  ("get", "apps"),
+  ("restart", None),
+  ("shutdown", None),
+}
+
+
+def get_socket_path():
+  return os.path.join(str(get_user_folder()), DAEMON_SOCKET_NAME)
+
+
+def get_current_network():
+  from ratio1.const.base import dAuth
+  return os.environ.get(dAuth.DAUTH_NET_ENV_KEY, dAuth.DAUTH_SDK_NET_DEFAULT)
+
+
+def _send_json(conn, data):
+  conn.sendall(json.dumps(data).encode("utf-8") + b"\n")
+  return
+
+
+def _recv_json(conn):
+  chunks = []
+  while True:
+    chunk = conn.recv(65536)
+    if not chunk:
+      break
+    chunks.append(chunk)
+    if chunk.endswith(b"\n"):
+      break
+  if len(chunks) == 0:
+    return None
+  return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+class DaemonRequestError(Exception):
+  """
+  The agent accepted the request but did not answer it (e.g. timeout) - the request may
+  have been executed so it must not be re-run.
+  """
+  pass
+
+
+def request_daemon(request, timeout=DAEMON_REQUEST_TIMEOUT, socket_path=None):
+  """
+  Sends a request to the agent. Returns the response dict or None if the agent is not running.
+  Raises `DaemonRequestError` if the request was sent but no valid response was received.
+  """
+  if not hasattr(socket, "AF_UNIX"):
+    return None
+  socket_path = socket_path or get_socket_path()
+  if not os.path.exists(socket_path):
+    return None
+  with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+    conn.settimeout(timeout)
+    try:
+      conn.connect(socket_path)
+    except OSError:
+      # stale socket file left by a killed agent (connection refused) or no agent
+      return None
+    try:
+      _send_json(conn, request)
+      return _recv_json(conn)
+    except socket.timeout:
+      raise DaemonRequestError(f"no response from the r1ctl agent in {timeout}s")
+    except (OSError, ValueError) as exc:
+      raise DaemonRequestError(f"the r1ctl agent did not answer: {exc}")
+
+
+def _get_command(argv):
+  positional = [x for x in argv if not x.startswith("-")]
+  command = positional[0] if len(positional) > 0 else None
+  subcommand = positional[1] if len(positional) > 1 else None
+  return command, subcommand
+
+
+def maybe_run_via_daemon(argv):
+  """
+  Runs the CLI command on the agent if it is running and serves this command and network.
+
+  Returns
+  -------
+  bool
+      True if the command was executed by the agent.
+  """
+  command, subcommand = _get_command(argv)
+  if (command, subcommand) not in DAEMON_COMMANDS and (command, None) not in DAEMON_COMMANDS:
+    return False
+  try:
+    response = request_daemon({"op": "run", "argv": list(argv), "network": get_current_network()})
+  except DaemonRequestError as exc:
+    # the command may have been executed by the agent (e.g. a restart) - never run it again
+    log_with_color(f"Error: {exc}. The command may or may not have been executed.", color='r')
+    return True
+  if response is None or not response.get("ok"):
+    return False
+  output = response.get("output", "")
+  if output:
+    print(output, end="" if output.endswith("\n") else "\n")
+  return True
+
+
+class _ThreadCaptureStream:
+  """
+  Installed as `sys.stdout`/`sys.stderr` in the agent: what a thread writes while capturing
+  goes to its own buffer, everything else (e.g. the shared session threads) to the original
+  stream - so the output of the background threads never ends up in a client response.
+  """
+  def __init__(self, stream):
+    self.stream = stream
+    self.__local = threading.local()
+    return
+
+  @contextmanager
+  def capture(self, buffer):
+    self.__local.buffer = buffer
+    try:
+      yield buffer
+    finally:
+      self.__local.buffer = None
+    return
+
+  def write(self, text):
+    buffer = getattr(self.__local, 'buffer', None)
+    return (self.stream if buffer is None else buffer).write(text)
+
+  def flush(self):
+    buffer = getattr(self.__local, 'buffer', None)
+    (self.stream if buffer is None else buffer).flush()
+    return
+
+  def __getattr__(self, name):
+    return getattr(self.stream, name)
+
+
+class R1ctlDaemon:
+  """
+  The agent: one warm session serving the CLI requests one at a time.
+  """
+  def __init__(self, socket_path=None, silent=True):
+    self.socket_path = socket_path or get_socket_path()
+    self.silent = silent
+    self.network = None
+    self.session = None
+    self.start_time = None
+    self.__running = False
+    self.__stdout = None
+    self.__stderr = None
+    return
+
+  def __run_cli(self, argv):
+    from ratio1.cli.cli import build_parser
+    parser = build_parser()
+    output = io.StringIO()
+    with self.__stdout.capture(output), self.__stderr.capture(output):
+      try:
+        args = parser.parse_args(argv)
+        args.func(args)
+      except SystemExit:
+        # argparse errors/help
+        pass
+      except Exception as exc:
+        log_with_color(f"Error: {exc}:\n{traceback.format_exc()}", color='r')
+    return output.getvalue()
+
+  def handle(self, request):
+    op = request.get("op")
+    if op == "ping":
+      return {
+        "ok": True, "pid": os.getpid(), "network": self.network,
+        "uptime": time() - self.start_time,
+      }
+    if op == "stop":
+      self.__running = False
+      return {"ok": True}
+    if op == "run":
+      if request.get("network") != self.network:
+        return {"ok": False, "error": f"agent runs on '{self.network}'"}
+      return {"ok": True, "output": self.__run_cli(request.get("argv", []))}
+    return {"ok": False, "error": f"unknown op '{op}'"}
+
+  def serve_forever(self):
+    from ratio1 import Session
+    from ratio1.cli import nodes
+    from ratio1.utils.config import load_user_defined_config
+
+    try:
+      other_agent = request_daemon({"op": "ping"}, timeout=5, socket_path=self.socket_path) is not None
+    except DaemonRequestError:
+      other_agent = True  # it accepted the connection (busy with another request)
+    if other_agent:
+      log_with_color(f"Another r1ctl agent is already serving on {self.socket_path}.", color='r')
+      return
+    if os.path.exists(self.socket_path):
+      # stale socket file left by a killed agent
+      os.remove(self.socket_path)
+
+    sys.stdout = self.__stdout = _ThreadCaptureStream(sys.stdout)
+    sys.stderr = self.__stderr = _ThreadCaptureStream(sys.stderr)
+    load_user_defined_config()
+    self.network = get_current_network()
+    # the warm session keeps the snapshot fresh for the commands run without the agent
+    self.session = Session(silent=self.silent, network_snapshot=True)
+    nodes._SHARED_SESSION = self.session
+    self.start_time = time()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(self.socket_path)
+    os.chmod(self.socket_path, 0o600)  # only the current user can talk to the agent
+    server.listen(8)
+    server.settimeout(1)
+    self.__running = True
+    log_with_color(f"r1ctl agent (pid {os.getpid()}) serving '{self.network}' on {self.socket_path}", color='g')
+    try:
+      while self.__running:
+        try:
+          conn, _ = server.accept()
+        except socket.timeout:
+          continue
+        with conn:
+          try:
+            conn.settimeout(DAEMON_REQUEST_TIMEOUT)
+            request = _recv_json(conn)
+            if request is not None:
+              _send_json(conn, self.handle(request))
+          except Exception as exc:
+            log_with_color(f"Request failed: {exc}", color='r')
+        # endwith connection
+      # endwhile
+    finally:
+      server.close()
+      if os.path.exists(self.socket_path):
+        os.remove(self.socket_path)
+      self.session.close()
+      sys.stdout, sys.stderr = self.__stdout.stream, self.__stderr.stream
+    log_with_color("r1ctl agent stopped.", color='y')
+    return
+
+
+def daemon_start(args):
+  """
+  Starts the r1ctl agent in the background (no-op if already running).
+  """
+  try:
+    response = request_daemon({"op": "ping"}, timeout=5)
+  except DaemonRequestError as exc:
+    log_with_color(f"r1ctl agent already running but busy: {exc}.", color='y')
+    return
+  if response is not None:
+    log_with_color(f"r1ctl agent already running (pid {response['pid']}, network '{response['network']}').", color='y')
+    return
+  if not hasattr(socket, "AF_UNIX"):
+    log_with_color("The r1ctl agent requires Unix domain sockets.", color='r')
+    return
+  log_path = os.path.join(str(get_user_folder()), DAEMON_LOG_NAME)
+  with open(log_path, "a") as log_file:
+    subprocess.Popen(
+      [sys.executable, "-m", "ratio1.cli.daemon"],
+      stdin=subprocess.DEVNULL, stdout=log_file, stderr=log_file,
+      start_new_session=True,
+    )
+  t0 = time()
+  while time() - t0 < DAEMON_START_TIMEOUT:
+    try:
+      response = request_daemon({"op": "ping"}, timeout=5)
+    except DaemonRequestError:
+      response = None
+    if response is not None:
+      log_with_color(f"r1ctl agent started (pid {response['pid']}) in {time() - t0:.1f}s.", color='g')
+      return
+    sleep(0.5)
+  log_with_color(f"r1ctl agent did not start in {DAEMON_START_TIMEOUT}s, see {log_path}", color='r')
+  return
+
+
+def daemon_stop(args):
+  """
+  Stops the r1ctl agent.
+  """
+  try:
+    response = request_daemon({"op": "stop"}, timeout=10)
+  except DaemonRequestError as exc:
+    log_with_color(f"Error: {exc}.", color='r')
+    return
+  if response is None:
+    log_with_color("r1ctl agent is not running.", color='y')
+  else:
+    log_with_color("r1ctl agent stopped.", color='g')
+  return
+
+
+def daemon_status(args):
+  """
+  Shows the status of the r1ctl agent.
+  """
+  try:
+    response = request_daemon({"op": "ping"}, timeout=5)
+  except DaemonRequestError as exc:
+    log_with_color(f"r1ctl agent running but not responding: {exc}.", color='y')
+    return
+  if response is None:
+    log_with_color("r1ctl agent is not running.", color='y')
+  else:
+    log_with_color(
+      f"r1ctl agent running: pid {response['pid']}, network '{response['network']}', "
+      f"uptime {response['uptime']:.0f}s, socket {get_socket_path()}", color='g'
+    )
+  return
+
+
+if __name__ == "__main__":
+  R1ctlDaemon().serve_forever()
@@ -9,6 +9,16 @@ from ratio1._ver import __VER__ as version
 from pandas import DataFrame
 from datetime import datetime
 
+# set by the r1ctl agent (`r1ctl daemon start`) so the commands reuse its warm session
+_SHARED_SESSION = None
+
+
+def _get_session(silent=True, network_snapshot=False):
+  if _SHARED_SESSION is not None:
+    return _SHARED_SESSION
+  from ratio1 import Session
+  return Session(silent=silent, network_snapshot=network_snapshot)
+
 
 def _get_netstats(
   silent=True,
@@ -19,11 +29,11 @@ def _get_netstats(
   return_session=False,
   eth=False,
   all_info=False,
-  wait_for_node=None
+  wait_for_node=None,
+  network_snapshot=False,
 ):
   t1 = time()
-  from ratio1 import Session
-  sess = Session(silent=silent)
+  sess = _get_session(silent=silent, network_snapshot=network_snapshot)
   found = None
   if wait_for_node:
     sess.P("Waiting for node '{}' to appear...".format(wait_for_node), color='y')
@@ -42,6 +52,12 @@ def _get_netstats(
   super_alias = dct_info[SESSION_CT.NETSTATS_REPORTER_ALIAS]
   nr_supers = dct_info[SESSION_CT.NETSTATS_NR_SUPERVISORS]
   _elapsed = dct_info[SESSION_CT.NETSTATS_ELAPSED] # computed on call
+  if dct_info.get(SESSION_CT.NETSTATS_STALE):
+    snapshot_age = dct_info.get(SESSION_CT.NETSTATS_SNAPSHOT_AGE) or 0
+    log_with_color(
+      f"No live network data yet - showing the local network snapshot from {snapshot_age:.0f}s ago.",
+      color='y'
+    )
   elapsed = time() - t1 # elapsed=_elapsed
   if return_session:
     return df, supervisor, super_alias, nr_supers, elapsed, sess  
@@ -73,6 +89,7 @@ def get_nodes(args):
     eth=args.eth,
     all_info=wide,
     return_session=True,
+    network_snapshot=True,  # listing only - answered from the local snapshot until live data arrives
   )
   df, supervisor, super_alias, nr_supers, elapsed, sess = res
   if args.online:
@@ -109,6 +126,7 @@ def get_supervisors(args):
     online_only=True,
     supervisors_only=True,
     return_session=True,
+    network_snapshot=True,
   )
   df, supervisor, super_alias, nr_supers, elapsed, sess = res
   FILTERED = ['Oracle', 'State']
@@ -126,6 +144,32 @@ def get_supervisors(args):
   return
 
 
+def _get_apps_streamed(sess, node=None, owner=None, show_full=False):
+  """
+  Collects the apps of all the requested nodes while they resolve concurrently, reporting
+  each node as soon as its configuration arrives, and builds the DataFrame once at the end.
+  """
+  t1 = time()
+  records, found_nodes, nodes = [], [], []
+  for node_addr, node_records, found in sess.iter_nodes_apps(node=node, owner=owner, show_full=show_full):
+    nodes.append(node_addr)
+    if found:
+      found_nodes.append(node_addr)
+    if node_records is not None:
+      records.extend(node_records)
+    if node is None:
+      # fleet-wide query: show progress as each node resolves
+      status = "{} apps".format(len(node_records)) if node_records is not None else "no apps available"
+      log_with_color("  <{}> '{}': {} ({:.1f}s)".format(
+        sess._shorten_addr(node_addr), sess.get_node_alias(node_addr), status, time() - t1), color='d'
+      )
+  # endfor nodes
+  if len(found_nodes) == 0:
+    log_with_color(f'Node(s) {nodes} not found. Please check the configuration.', color='r')
+    return None
+  return sess.nodes_apps_to_df(records)
+
+
 def get_apps(args):
   """
   Shows the apps running on a given node, if the client is allowed on that node.
@@ -142,15 +186,15 @@ def get_apps(args):
   owner = args.owner
 
   # 1. Init session
-  from ratio1 import Session
-  sess = Session(
-    silent=not verbose
-  )
+  sess = _get_session(silent=not verbose)
   
-  res = sess.get_nodes_apps(
-    node=node, owner=owner, show_full=show_full, 
-    as_json=as_json, as_df=not as_json
-  )
+  if as_json:
+    res = sess.get_nodes_apps(
+      node=node, owner=owner, show_full=show_full, 
+      as_json=as_json, as_df=not as_json
+    )
+  else:
+    res = _get_apps_streamed(sess, node=node, owner=owner, show_full=show_full)
   if res is not None:
     network = sess.bc_engine.evm_network
     node_alias = sess.get_node_alias(node) if node else None
@@ -1,4 +1,5 @@
 import io
+import os
 import zlib
 import sys
 import base64
@@ -8,13 +9,18 @@ import inspect
 import ctypes
 import threading
 import queue
+import hashlib
+
+from collections import OrderedDict
 
 try:
-  from .checker import ASTChecker, CheckerConstants
+  from .checker import ASTChecker, CheckerConstants, UnallowedTable
+  from .process_pool import CodeExecutionProcessPool
 except:
-  from ratio1.code_cheker.checker import ASTChecker, CheckerConstants
+  from ratio1.code_cheker.checker import ASTChecker, CheckerConstants, UnallowedTable
+  from ratio1.code_cheker.process_pool import CodeExecutionProcessPool
 
-__VER__ = '0.6.1'
+__VER__ = '0.6.2'
 
 UNALLOWED_DICT = {
   'import ': {
@@ -113,19 +119,137 @@ UNALLOWED_DICT = {
   }
 }
 
+# precomputed once - the 'import' entries are handled by the AST import nodes
+UNALLOWED_TABLE = UnallowedTable(UNALLOWED_DICT)
+
 RESULT_VARS = ['__result', '_result', 'result']
 
+CODE_CACHE_MAX_SIZE = 256
+FUNC_CODE_CACHE_MAX_SIZE = 1024
+
 
 class CodeExecutionTimeoutError(Exception):
   pass
 
 
+class CompiledCodeCache:
+  """
+  Bounded, thread-safe LRU cache for remote custom code.
+
+  Each entry is keyed by the hash of the received base64 blob (plus the preparation
+  options and the checker scope) and holds the validation errors (if any), the final prepared source and
+  the compiled `code` object, so repeated executions of the same blob skip the
+  decoding, AST checking, rewriting and compilation steps.
+  The same LRU is also used to memoize the source extraction and encoding of the
+  callables sent to the nodes (see `BaseCodeChecker.get_function_source_code`).
+  """
+
+  def __init__(self, max_size=CODE_CACHE_MAX_SIZE):
+    self.max_size = max_size
+    self.__data = OrderedDict()
+    self.__lock = threading.Lock()
+    self.__hits = 0
+    self.__misses = 0
+    self.__evictions = 0
+    return
+
+  @staticmethod
+  def make_key(str_b64code, *options):
+    """
+    Computes the cache key for a base64 code blob and its preparation options.
+    Returns None if the blob cannot be hashed (in which case it is not cached).
+    """
+    if isinstance(str_b64code, str):
+      b_code = str_b64code.encode('utf-8')
+    elif isinstance(str_b64code, (bytes, bytearray)):
+      b_code = bytes(str_b64code)
+    else:
+      return None
+    return (hashlib.sha256(b_code).hexdigest(),) + tuple(options)
+
+  def get(self, key):
+    if key is None:
+      return None
+    with self.__lock:
+      entry = self.__data.get(key)
+      if entry is None:
+        self.__misses += 1
+        return None
+      self.__data.move_to_end(key)
+      self.__hits += 1
+    return entry
+
+  def put(self, key, entry):
+    if key is None or self.max_size <= 0:
+      return
+    with self.__lock:
+      self.__data[key] = entry
+      self.__data.move_to_end(key)
+      while len(self.__data) > self.max_size:
+        self.__data.popitem(last=False)
+        self.__evictions += 1
+    return
+
+  def clear(self):
+    with self.__lock:
+      self.__data.clear()
+      self.__hits = 0
+      self.__misses = 0
+      self.__evictions = 0
+    return
+
+  def stats(self):
+    with self.__lock:
+      total = self.__hits + self.__misses
+      return {
+        'hits': self.__hits,
+        'misses': self.__misses,
+        'evictions': self.__evictions,
+        'size': len(self.__data),
+        'max_size': self.max_size,
+        'hit_rate': self.__hits / total if total > 0 else 0.0,
+      }
+
+
+# process-wide cache as the same blob is usually received by many plugin instances
+_CODE_CACHE = CompiledCodeCache()
+# source/base64 of local callables and of plain code sent to the nodes
+_FUNC_CODE_CACHE = CompiledCodeCache(max_size=FUNC_CODE_CACHE_MAX_SIZE)
+_ENCODED_CODE_CACHE = CompiledCodeCache(max_size=FUNC_CODE_CACHE_MAX_SIZE)
+
+
+def _get_func_cache_key(func, *options):
+  """
+  Returns a cache key for a callable based on its code object, the modification time
+  of its source file and its default values, or None if the callable has no code object.
+  """
+  code = getattr(func, '__code__', None)
+  if code is None:
+    return None
+  try:
+    mtime = os.path.getmtime(code.co_filename)
+  except OSError:
+    mtime = None
+  defaults = (getattr(func, '__defaults__', None), getattr(func, '__kwdefaults__', None))
+  try:
+    hash(defaults[0])
+    defaults = (defaults[0], tuple(sorted((defaults[1] or {}).items())))
+    hash(defaults)
+  except TypeError:
+    # unhashable default values - the signature uses their repr anyway
+    defaults = repr(defaults)
+  return (code, mtime, defaults) + options
+
+
 class BaseCodeChecker:
   """
   This class should be used either as a associated object for code checking or
   as a mixin for running code
   """
 
+  # optional process pool used for isolated execution (see `enable_process_execution`)
+  _exec_process_pool = None
+
   def __init__(self):
     super(BaseCodeChecker, self).__init__()
     self.printed_lines = []
@@ -149,8 +273,17 @@ class BaseCodeChecker:
         return True
     return False
 
+  def _get_code_check_scope(self):
+    """
+    Returns the part of the code cache keys that identifies how this checker validates
+    code, so that code accepted by a more lenient checker is never served from the cache
+    to a stricter one. Subclasses whose checks depend on the instance configuration
+    (e.g. configured safe imports) must extend it.
+    """
+    return (type(self),)
+
   def _check_unsafe_code(self, code, safe_imports=None):
-    checker = ASTChecker(UNALLOWED_DICT, safe_imports)
+    checker = ASTChecker(UNALLOWED_TABLE, safe_imports)
     errors = checker.validate(code)
     if len(errors) == 0:
       return None
@@ -180,13 +313,22 @@ class BaseCodeChecker:
   def code_to_base64(self, code, verbose=False, compress=True, return_errors=False):
     if verbose:
       self.__msg("Processing:\n{}".format(code), color='y')
+    cache_key = None if verbose else _ENCODED_CODE_CACHE.make_key(code, compress, self._get_code_check_scope())
+    entry = _ENCODED_CODE_CACHE.get(cache_key)
+    if entry is not None:
+      str_encoded, err_msg = entry
+      if err_msg is not None:
+        self.__msg(err_msg, color='r')
+      return str_encoded if not return_errors else (str_encoded, err_msg)
     errors = self._check_unsafe_code(code)
     if errors is not None:
       err_msg = "Cannot serialize code due to: '{}'".format(errors)
       self.__msg(err_msg, color='r')
+      _ENCODED_CODE_CACHE.put(cache_key, (None, err_msg))
       return None if not return_errors else (None, err_msg)
     self.__msg("Code checking succeeded", color='g')
     str_encoded = self.str_to_base64(code, verbose=verbose, compress=compress)
+    _ENCODED_CODE_CACHE.put(cache_key, (str_encoded, None))
     return str_encoded if not return_errors else (str_encoded, None)
 
   def base64_to_code(self, b64code, decompress=True):
@@ -328,10 +470,58 @@ class BaseCodeChecker:
       ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(tid), 0)
       raise SystemError("PyThreadState_SetAsyncExc failed")
 
-  def execute_code_with_timeout(self, code, timeout, local_vars=None):
+  def enable_process_execution(self, n_workers=None, max_memory_mb=None, max_cpu_seconds=None, pool=None):
+    """
+    Switches `exec_code` to process-isolated execution backed by a pool of warm workers.
+    Timeouts are then enforced by killing the worker and executions run in parallel.
+    The executed code has no access to this object (`self_var` is bound to None).
+
+    Parameters
+    ----------
+    n_workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    max_memory_mb : int, optional
+        Memory (address space) each worker may allocate on top of its initial image.
+    max_cpu_seconds : float, optional
+        CPU time allowed for each execution.
+    pool : CodeExecutionProcessPool, optional
+        An existing pool to share between several checkers.
+
+    Returns
+    -------
+    CodeExecutionProcessPool
+        The pool in use.
+    """
+    if pool is None:
+      pool = CodeExecutionProcessPool(
+        n_workers=n_workers,
+        max_memory_mb=max_memory_mb,
+        max_cpu_seconds=max_cpu_seconds,
+      )
+    self._exec_process_pool = pool
+    return pool
+
+  def disable_process_execution(self, shutdown=True):
+    """
+    Reverts `exec_code` to the in-process thread-based execution.
+    """
+    pool = self._exec_process_pool
+    self._exec_process_pool = None
+    if shutdown and pool is not None:
+      pool.shutdown()
+    return
+
+  def execute_code_with_timeout(self, code, timeout, local_vars=None, result_vars=None):
     if local_vars is None:
       local_vars = {}
 
+    if self._exec_process_pool is not None:
+      return self._exec_process_pool.execute(
+        code, timeout=timeout,
+        local_vars=local_vars,
+        result_vars=result_vars or local_vars.get('exec_code__result_vars', RESULT_VARS),
+      )
+
     # Queue to collect output
     output_queue = queue.Queue()
     print_queue = queue.Queue()
@@ -380,41 +570,125 @@ class BaseCodeChecker:
       "error": "No result returned."
     }
 
+  def get_code_cache_stats(self):
+    """
+    Returns the hit/miss statistics of the process-wide compiled code cache.
+
+    Returns
+    -------
+    dict
+        Dictionary with `hits`, `misses`, `evictions`, `size`, `max_size` and `hit_rate`.
+    """
+    return _CODE_CACHE.stats()
+
+  def clear_code_cache(self):
+    """
+    Clears the process-wide compiled code cache and resets its statistics.
+    """
+    _CODE_CACHE.clear()
+    return
+
+  def get_function_code_cache_stats(self):
+    """
+    Returns the statistics of the caches used when encoding local callables and code.
+
+    Returns
+    -------
+    dict
+        Dictionary with the `functions` (source and method data) and `encoded` (base64) cache stats.
+    """
+    return {
+      'functions': _FUNC_CODE_CACHE.stats(),
+      'encoded': _ENCODED_CODE_CACHE.stats(),
+    }
+
+  def _prepare_exec_code(self, str_b64code, result_vars, self_var, modify):
+    """
+    Decodes, validates, rewrites and compiles the received custom code. The outcome
+    (including validation errors) is cached so that the same blob is processed only once.
+
+    Returns
+    -------
+    tuple
+        (code, source, errors) where `code` is the compiled code object (or the source
+        if compilation failed, so that `exec` reports the error) and `source` is the
+        final prepared source text.
+    """
+    cache_key = _CODE_CACHE.make_key(
+      str_b64code, modify, self_var, tuple(result_vars), self._get_code_check_scope()
+    )
+    entry = _CODE_CACHE.get(cache_key)
+    if entry is not None:
+      return entry
+
+    exec_code__code, exec_code__errors = self.prepare_b64code(str_b64code, result_vars=result_vars)
+    if exec_code__errors:
+      entry = (None, None, exec_code__errors)
+      _CODE_CACHE.put(cache_key, entry)
+      return entry
+
+    # Optionally modify the code
+    if modify:
+      exec_code__code = self._add_line_after_each_line(code=exec_code__code)
+
+    # Handle encapsulating the code in a method if needed
+    if self._can_encapsulate_code_in_method(exec_code__code):
+      exec_code__code = self._encapsulate_code_in_method(exec_code__code, exec_code__arguments=[self_var])
+      exec_code__code = f"{exec_code__code}\nresult = __exec_code__({self_var})"
+
+    try:
+      exec_code__compiled = compile(exec_code__code, '<custom_code>', 'exec')
+    except Exception:
+      # let `exec` surface the error in the execution thread and do not cache
+      return exec_code__code, exec_code__code, None
+
+    entry = (exec_code__compiled, exec_code__code, None)
+    _CODE_CACHE.put(cache_key, entry)
+    return entry
+
   def exec_code(self, str_b64code, debug=False, result_vars=None, self_var=None, modify=True, return_printed=False, timeout=None):
     exec_code__result_vars = result_vars or RESULT_VARS
     exec_code__warnings = []
     exec_code__result_var = None
+    exec_code__isolated = self._exec_process_pool is not None
+    if exec_code__isolated:
+      # the worker is killed on timeout so there is no need for cooperative sleeps
+      modify = False
 
-    # Prepare the code
-    exec_code__code, exec_code__errors = self.prepare_b64code(str_b64code, result_vars=exec_code__result_vars)
+    # Prepare the code (decode, check, modify, encapsulate and compile) or get it from cache
+    exec_code__code, exec_code__source, exec_code__errors = self._prepare_exec_code(
+      str_b64code,
+      result_vars=exec_code__result_vars,
+      self_var=self_var,
+      modify=modify,
+    )
 
     if exec_code__errors:
         self.__msg(f"Cannot execute remote code: {exec_code__errors}", color='r')
         return exec_code__result_var, exec_code__errors, exec_code__warnings
 
-    # Optionally modify the code
-    if modify:
-        exec_code__code = self._add_line_after_each_line(code=exec_code__code)
-
     if debug:
-        self.__msg(f"DEBUG EXEC: Executing:\n{exec_code__code}")
-
-    # Add `self` to locals if specified
-    local_vars = locals().copy()
-    if self_var and isinstance(self_var, str) and len(self_var) > 3:
-        local_vars[self_var] = self
-
-    # Handle encapsulating the code in a method if needed
-    if self._can_encapsulate_code_in_method(exec_code__code):
-        exec_code__code = self._encapsulate_code_in_method(exec_code__code, exec_code__arguments=[self_var])
-        exec_code__code = f"{exec_code__code}\nresult = __exec_code__({self_var})"
+        self.__msg(f"DEBUG EXEC: Executing:\n{exec_code__source}")
 
     # Prepare to capture printed output
     self.printed_lines = []
-    local_vars['print'] = self.custom_print
+
+    if exec_code__isolated:
+      # only picklable inputs can be sent to the worker process (prints are captured there)
+      local_vars = {}
+      if self_var and isinstance(self_var, str):
+        local_vars[self_var] = None
+    else:
+      # Add `self` to locals if specified
+      local_vars = locals().copy()
+      if self_var and isinstance(self_var, str) and len(self_var) > 3:
+          local_vars[self_var] = self
+      local_vars['print'] = self.custom_print
 
     # Execute the code with a timeout
-    exec_result = self.execute_code_with_timeout(exec_code__code, timeout, local_vars=local_vars)
+    exec_result = self.execute_code_with_timeout(
+      exec_code__code, timeout, local_vars=local_vars, result_vars=exec_code__result_vars,
+    )
 
     exec_code__result_var = exec_result.get("result_var")
     exec_code__errors = exec_result.get("error")
@@ -520,6 +794,10 @@ class BaseCodeChecker:
     str
         The source code of the function.
     """
+    cache_key = _get_func_cache_key(func, 'source')
+    cached = _FUNC_CODE_CACHE.get(cache_key)
+    if cached is not None:
+      return cached
     plain_code = inspect.getsourcelines(func)[0]
     plain_code = plain_code[1:]
     first_code_line = 0
@@ -529,6 +807,7 @@ class BaseCodeChecker:
     indent = len(plain_code[first_code_line]) - len(plain_code[first_code_line].lstrip())
     plain_code = '\n'.join([line.rstrip()[indent:] for line in plain_code])
 
+    _FUNC_CODE_CACHE.put(cache_key, plain_code)
     return plain_code
   
   def _get_method_data(self, method: callable):
@@ -546,7 +825,11 @@ class BaseCodeChecker:
     tuple
         A tuple containing the name, arguments and base64 code of the method.
     """
-    import inspect
+    cache_key = _get_func_cache_key(method, 'method_data')
+    cached = _FUNC_CODE_CACHE.get(cache_key)
+    if cached is not None:
+      name, args, base64_code = cached
+      return name, list(args), base64_code
 
     name = method.__name__
     args = list(map(str, inspect.signature(method).parameters.values()))
@@ -561,7 +844,9 @@ class BaseCodeChecker:
     source = self.get_function_source_code(method)
     base64_code = self.code_to_base64(source)
 
-    return name, args, base64_code  
+    if base64_code is not None:
+      _FUNC_CODE_CACHE.put(cache_key, (name, tuple(args), base64_code))
+    return name, args, base64_code
 
 
 if __name__ == '__main__':
@@ -1,4 +1,5 @@
 import ast
+from functools import lru_cache
 
 
 class CheckerConstants:
@@ -11,18 +12,87 @@ class CheckerConstants:
   attr = 'attribute'
 
 
+class UnallowedTable:
+  """
+  Precomputed lookup tables for an unallowed identifiers dictionary.
+
+  The entries are split by context into two name->error maps (plus the matching
+  frozensets) so each `ast.Name`/`ast.Attribute` node is classified with a single
+  set membership test. Build it once for a given dictionary and share it.
+  """
+
+  def __init__(self, unallowed_dict: dict):
+    self.source = unallowed_dict
+    self.vars = {}
+    self.attrs = {}
+    for name, handle in unallowed_dict.items():
+      handle_type = handle.get(CheckerConstants.type_key)
+      if handle_type == CheckerConstants.var:
+        self.vars[name] = handle[CheckerConstants.error_key]
+      elif handle_type == CheckerConstants.attr:
+        self.attrs[name] = handle[CheckerConstants.error_key]
+    self.var_names = frozenset(self.vars)
+    self.attr_names = frozenset(self.attrs)
+    return
+
+
+class SafeImportsTrie:
+  """
+  Prefix trie over the dotted components of the safe module names.
+
+  A module is safe if it is one of the safe names or a submodule of one of them
+  (`name == safe` or `name.startswith(safe + '.')`), which is resolved in a
+  number of steps bounded by the depth of the module name.
+  """
+  _terminal = None
+
+  def __init__(self, safe_imports: list):
+    self.root = {}
+    for safe_name in safe_imports or []:
+      node = self.root
+      for part in safe_name.split('.'):
+        node = node.setdefault(part, {})
+      node[self._terminal] = True
+    return
+
+  def is_safe(self, name):
+    if name is None:
+      return False
+    node = self.root
+    for part in name.split('.'):
+      node = node.get(part)
+      if node is None:
+        return False
+      if self._terminal in node:
+        return True
+    return False
+
+
+SAFE_IMPORTS_TRIES_MAX_SIZE = 64
+
+
+@lru_cache(maxsize=SAFE_IMPORTS_TRIES_MAX_SIZE)
+def _build_safe_imports_trie(safe_imports):
+  return SafeImportsTrie(safe_imports)
+
+
+def _get_safe_imports_trie(safe_imports):
+  return _build_safe_imports_trie(tuple(safe_imports or ()))
+
+
 class ASTChecker(ast.NodeVisitor):
   """
   An Abstract Syntax Tree based checker for custom code.
   """
 
-  def __init__(self, unallowed_dict: dict, safe_imports: list):
+  def __init__(self, unallowed_dict, safe_imports: list):
     """
     Constructor for the AST checker.
 
     Parameters
     ----------
-    unallowed_dict - a dictionary for unallowed identifiers.
+    unallowed_dict - a dictionary for unallowed identifiers (or an already
+      built `UnallowedTable` for such a dictionary).
       The dictionary has the indentifier names as keys. The
       Values are dictionaries with keys 'error' and 'type'.
       The error is used for error printing while the type
@@ -50,11 +120,16 @@ class ASTChecker(ast.NodeVisitor):
       safe_imports=['fiz']
       checker = ASTChecker(TEST_UNALLOWED_DICT, safe_imports)
     """
-    self.unallowed_dict = unallowed_dict
+    if isinstance(unallowed_dict, UnallowedTable):
+      self.table = unallowed_dict
+    else:
+      self.table = UnallowedTable(unallowed_dict)
+    self.unallowed_dict = self.table.source
     self.errors = {}
     self.safe_imports = safe_imports
     if self.safe_imports is None:
       self.safe_imports = []
+    self.safe_imports_trie = _get_safe_imports_trie(self.safe_imports)
     return
 
   def add_error(self, node, error):
@@ -91,39 +166,53 @@ class ASTChecker(ast.NodeVisitor):
     -------
     bool - True if the import is safe, False otherwise.
     """
-    for safe_name in self.safe_imports:
-      if name == safe_name:
-        return True
-      if name.startswith(safe_name + '.'):
-        return True
-    return False
-
-  def visit_Import(self, node):
-    for imp_alias in node.names:
-      if not self._is_safe_import(imp_alias.name):
-        self.add_error(node, f'Import forbidden for {imp_alias.name} ')
-
-    self.generic_visit(node)
-    return
+    return self.safe_imports_trie.is_safe(name)
 
-  def visit_ImportFrom(self, node):
-    if not self._is_safe_import(node.module):
-      self.add_error(node, f'Import forbidden for {node.module} ')
-    self.generic_visit(node)
-    return
-
-  def visit_Attribute(self, node):
-    handle = self.unallowed_dict.get(node.attr)
-    if handle is not None and handle[CheckerConstants.type_key] == CheckerConstants.attr:
-      self.add_error(node, handle[CheckerConstants.error_key])
-    self.generic_visit(node)
+  def _walk(self, tree):
+    """
+    Single iterative pre-order walk over the whole tree (same order as the
+    recursive `NodeVisitor` traversal, without per-node method dispatch or
+    generator overhead). This is the only place where the rules are applied.
+    """
+    var_names, variables = self.table.var_names, self.table.vars
+    attr_names, attrs = self.table.attr_names, self.table.attrs
+    add_error, is_safe_import = self.add_error, self._is_safe_import
+    Name, Attribute, Import, ImportFrom, AST = ast.Name, ast.Attribute, ast.Import, ast.ImportFrom, ast.AST
+    stack = [tree]
+    pop, push = stack.pop, stack.append
+    while stack:
+      node = pop()
+      node_type = type(node)
+      if node_type is Name:
+        if node.id in var_names:
+          add_error(node, variables[node.id])
+        continue # only the expression context below a name
+      if node_type is Attribute:
+        if node.attr in attr_names:
+          add_error(node, attrs[node.attr])
+      elif node_type is Import:
+        for imp_alias in node.names:
+          if not is_safe_import(imp_alias.name):
+            add_error(node, f'Import forbidden for {imp_alias.name} ')
+      elif node_type is ImportFrom:
+        if not is_safe_import(node.module):
+          add_error(node, f'Import forbidden for {node.module} ')
+      # push children in reverse so they are popped in source order
+      fields = node._fields
+      for i in range(len(fields) - 1, -1, -1):
+        value = getattr(node, fields[i], None)
+        if isinstance(value, list):
+          for j in range(len(value) - 1, -1, -1):
+            if isinstance(value[j], AST):
+              push(value[j])
+        elif isinstance(value, AST):
+          push(value)
+      # endfor fields
+    # endwhile
     return
 
-  def visit_Name(self, node):
-    handle = self.unallowed_dict.get(node.id)
-    if handle is not None and handle[CheckerConstants.type_key] == CheckerConstants.var:
-      self.add_error(node, handle[CheckerConstants.error_key])
-    self.generic_visit(node)
+  def visit(self, node):
+    self._walk(node)
     return
 
   def validate(self, code: str) -> str:
@@ -141,7 +230,7 @@ class ASTChecker(ast.NodeVisitor):
     """
     try:
       tree = ast.parse(code, type_comments=True)
-      self.visit(tree)
+      self._walk(tree)
       return self.errors
     except Exception as e:
       return {
@@ -0,0 +1,293 @@
+"""
+Process-isolated execution of custom code.
+
+A `CodeExecutionProcessPool` keeps a number of warm (pre-started) worker processes
+that receive compiled custom code over a pipe, execute it and send back the result
+variable and the captured prints. Timeouts are enforced by killing the worker (which
+is then replaced by a fresh one) so even C-level work can be interrupted, and each
+worker can be constrained with an address-space and a per-task CPU-time limit.
+
+Independent snippets run in parallel, one per worker, instead of being serialized
+behind the lock used by the thread-based execution of `BaseCodeChecker`.
+
+Note: the code runs in another process so it has no access to the calling plugin
+object - only self-contained snippets and picklable inputs/results are supported.
+"""
+import io
+import os
+import marshal
+import pickle
+import queue
+import traceback
+import multiprocessing as mp
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+
+WORKER_DIED_ERROR = "Code execution worker died (memory or CPU limit exceeded?)."
+
+
+def _get_vm_size():
+  """
+  Returns the current virtual memory size of this process in bytes (0 if unknown).
+  """
+  try:
+    with open('/proc/self/statm') as fh:
+      return int(fh.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+  except Exception:
+    return 0
+
+
+def _set_memory_limit(max_memory_mb):
+  if resource is None or max_memory_mb is None:
+    return
+  # the limit is relative to what the worker already maps (the interpreter and its imports)
+  limit = _get_vm_size() + int(max_memory_mb * 1024 * 1024)
+  _, hard = resource.getrlimit(resource.RLIMIT_AS)
+  if hard != resource.RLIM_INFINITY:
+    limit = min(limit, hard)
+  resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+  return
+
+
+def _set_cpu_limit(max_cpu_seconds):
+  if resource is None or max_cpu_seconds is None:
+    return
+  # RLIMIT_CPU is cumulative for the process so we move it forward for each task
+  usage = resource.getrusage(resource.RUSAGE_SELF)
+  limit = int(usage.ru_utime + usage.ru_stime + max_cpu_seconds) + 1
+  _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+  if hard != resource.RLIM_INFINITY:
+    limit = min(limit, hard)
+  resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+  return
+
+
+def _code_exec_worker(conn, max_memory_mb, max_cpu_seconds):
+  """
+  Worker process main loop: receives `(code, is_marshaled, local_vars, result_vars)`
+  tasks and replies with the same result dict as `BaseCodeChecker.execute_code_with_timeout`.
+  """
+  _set_memory_limit(max_memory_mb)
+  while True:
+    try:
+      task = conn.recv()
+    except (EOFError, OSError):
+      break
+    if task is None:
+      break
+
+    code, is_marshaled, local_vars, result_vars = task
+    printed_lines = []
+
+    def _print(*args, **kwargs):
+      outstream = io.StringIO()
+      kwargs.pop('file', None)
+      print(*args, file=outstream, **kwargs)
+      printed_lines.append(outstream.getvalue())
+      return
+
+    result = {
+      "result_var": None,
+      "warnings": [],
+      "printed_lines": printed_lines,
+      "error": None,
+    }
+    try:
+      _set_cpu_limit(max_cpu_seconds)
+      if is_marshaled:
+        code = marshal.loads(code)
+      local_vars = dict(local_vars or {})
+      local_vars['print'] = _print
+      exec(code, local_vars)
+      for _var in result_vars:
+        if _var in local_vars:
+          result["result_var"] = local_vars[_var]
+          break
+      # endfor all result vars
+    except BaseException:
+      result["error"] = traceback.format_exc()
+    # end try-except
+
+    try:
+      conn.send(result)
+    except (EOFError, OSError):
+      break
+    except Exception:
+      # most likely the result is not picklable
+      result["result_var"] = None
+      result["error"] = "Result could not be sent back from worker: {}".format(traceback.format_exc())
+      conn.send(result)
+  # endwhile
+  return
+
+
+class _CodeExecWorker:
+  def __init__(self, ctx, max_memory_mb, max_cpu_seconds):
+    self.conn, child_conn = ctx.Pipe(duplex=True)
+    self.process = ctx.Process(
+      target=_code_exec_worker,
+      args=(child_conn, max_memory_mb, max_cpu_seconds),
+      daemon=True,
+    )
+    self.process.start()
+    child_conn.close()
+    return
+
+  def kill(self):
+    try:
+      self.process.kill()
+      self.process.join(timeout=1)
+    except Exception:
+      pass
+    try:
+      self.conn.close()
+    except Exception:
+      pass
+    return
+
+  def stop(self):
+    try:
+      self.conn.send(None)
+      self.process.join(timeout=1)
+    except Exception:
+      pass
+    if self.process.is_alive():
+      self.kill()
+    else:
+      self.conn.close()
+    return
+
+
+class CodeExecutionProcessPool:
+  """
+  Pool of warm worker processes used to run custom code isolated from the caller.
+
+  Parameters
+  ----------
+  n_workers : int, optional
+      Number of worker processes. Defaults to the number of CPUs.
+  max_memory_mb : int, optional
+      Additional address space (in MB) each worker may allocate. No limit if None.
+  max_cpu_seconds : float, optional
+      CPU time allowed for each task. No limit if None.
+  start_method : str, optional
+      The multiprocessing start method. Defaults to 'forkserver' where available, 'spawn'
+      otherwise. 'fork' is not used by default: the replacement workers are started from a
+      running session process and forking its threads (MQTT loop, payloads, logging) can
+      deadlock the child on inherited locks. As with any non-fork start method, scripts
+      creating the pool must guard their entry point with `if __name__ == '__main__':`.
+  """
+
+  def __init__(self, n_workers=None, max_memory_mb=None, max_cpu_seconds=None, start_method=None):
+    if start_method is None:
+      start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+    self.n_workers = n_workers or os.cpu_count() or 1
+    self.max_memory_mb = max_memory_mb
+    self.max_cpu_seconds = max_cpu_seconds
+    self.__ctx = mp.get_context(start_method)
+    if start_method == 'forkserver':
+      # the fork server (if not already running) only preloads the worker module - not the
+      # `__main__` script, which would be re-imported in it
+      self.__ctx.set_forkserver_preload([__name__])
+    self.__idle = queue.Queue()
+    self.__closed = False
+    for _ in range(self.n_workers):
+      self.__idle.put(self.__new_worker())
+    return
+
+  def __new_worker(self):
+    return _CodeExecWorker(self.__ctx, self.max_memory_mb, self.max_cpu_seconds)
+
+  def __release(self, worker, replace=False):
+    if replace:
+      worker.kill()
+      if self.__closed:
+        return
+      worker = self.__new_worker()
+    if self.__closed:
+      worker.stop()
+    else:
+      self.__idle.put(worker)
+    return
+
+  def execute(self, code, timeout=None, local_vars=None, result_vars=None):
+    """
+    Executes `code` (source or compiled code object) in one of the workers.
+
+    Parameters
+    ----------
+    code : str or code
+        The code to execute.
+    timeout : float, optional
+        Wall-clock timeout in seconds after which the worker is killed.
+    local_vars : dict, optional
+        Picklable variables made available to the code.
+    result_vars : list, optional
+        Variable names searched (in order) for the result.
+
+    Returns
+    -------
+    dict
+        Dictionary with `result_var`, `warnings`, `printed_lines` and `error`.
+    """
+    if self.__closed:
+      raise RuntimeError("CodeExecutionProcessPool is shut down")
+    if result_vars is None:
+      result_vars = []
+    is_marshaled = not isinstance(code, str)
+    if is_marshaled:
+      code = marshal.dumps(code)
+    task = (code, is_marshaled, local_vars, list(result_vars))
+
+    worker = self.__idle.get()
+    try:
+      try:
+        # pickling happens before anything is written so the pipe stays usable
+        worker.conn.send(task)
+      except (pickle.PicklingError, TypeError, AttributeError):
+        self.__release(worker)
+        return {
+          "result_var": None,
+          "warnings": [],
+          "printed_lines": [],
+          "error": "Inputs cannot be sent to worker: {}".format(traceback.format_exc()),
+        }
+      if not worker.conn.poll(timeout):
+        self.__release(worker, replace=True)
+        return {
+          "result_var": None,
+          "warnings": [],
+          "printed_lines": [],
+          "error": f"Code execution took longer than {timeout} seconds.",
+        }
+      result = worker.conn.recv()
+    except (EOFError, OSError):
+      self.__release(worker, replace=True)
+      return {
+        "result_var": None,
+        "warnings": [],
+        "printed_lines": [],
+        "error": WORKER_DIED_ERROR,
+      }
+    except BaseException:
+      self.__release(worker, replace=True)
+      raise
+    self.__release(worker)
+    return result
+
+  def shutdown(self):
+    """
+    Stops all idle workers. Busy workers are stopped when their task finishes.
+    """
+    self.__closed = True
+    while True:
+      try:
+        worker = self.__idle.get_nowait()
+      except queue.Empty:
+        break
+      worker.stop()
+    return
@@ -449,6 +449,12 @@ class MQTTWrapper(object):
   def get_thread_name(self):
     return self._thread_name
 
+  def get_thread(self):
+    """
+    Returns the thread of the MQTT network loop (None if not connected).
+    """
+    return getattr(self._mqttc, '_thread', None)
+
   def subscribe(self, max_retries=5):
 
     if self.recv_channel_name is None:
@@ -1,6 +1,6 @@
 from . import base as BASE_CT
 # BC Consts:
-from ..bc.base import BCct as BC_CT
+from .base import BCct as BC_CT
 
 SB_ID = BASE_CT.SB_ID
 EE_ID = BASE_CT.EE_ID
@@ -26,5 +26,7 @@ class SESSION_CT:
   NETSTATS_REPORTER_ALIAS = 'reporter_alias'
   NETSTATS_NR_SUPERVISORS = 'nr_super'
   NETSTATS_ELAPSED = 'elapsed'
+  NETSTATS_STALE = 'stale'
+  NETSTATS_SNAPSHOT_AGE = 'snapshot_age'
   
   
\ No newline at end of file
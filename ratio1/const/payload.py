@@ -1,5 +1,5 @@
 # BC Consts:
-from ..bc.base import BCct as BC_CT
+from .base import BCct as BC_CT
 
 TLBR_POS = 'TLBR_POS'
 PROB_PRC = 'PROB_PRC'
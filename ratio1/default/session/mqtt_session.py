@@ -64,6 +64,12 @@ class MqttSession(GenericSession):
       self._notifications_communicator.subscribe()
     return
 
+  def _get_communication_threads(self):
+    return {
+      'mqtt_' + name: communicator.get_thread()
+      for name, communicator in self.__communicators.items()
+    }
+
   def _communication_close(self, **kwargs):
     self._default_communicator.release()
     self._heartbeats_communicator.release()
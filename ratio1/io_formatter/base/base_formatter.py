@@ -9,6 +9,8 @@ class BaseFormatter(object):
   def __init__(self, log, signature, **kwargs):
     self.signature = signature
     self.log = log
+    self._signature_lower = str(signature).lower()
+    self._timers_section = 'Formatter_' + str(signature)
     super(BaseFormatter, self).__init__()
     return
 
@@ -46,7 +48,9 @@ class BaseFormatter(object):
 
   def encode_output(self, output):
     tm = time()
-    self.log.start_timer('encode', section='Formatter_' + str(self.signature))
+    timed = self.log.DEBUG
+    if timed:
+      self.log.start_timer('encode', section=self._timers_section)
     try:
       encoded_output = self._encode_output(output)
     except Exception as e:
@@ -57,15 +61,19 @@ class BaseFormatter(object):
     # end try-except
 
     elapsed = time() - tm
-    self.log.stop_timer('encode', section='Formatter_' + str(self.signature))
+    if timed:
+      self.log.stop_timer('encode', section=self._timers_section)
     return encoded_output, elapsed
 
   def decode_output(self, encoded_output):
     ee_impl = encoded_output.get(PAYLOAD_DATA.EE_FORMATTER, encoded_output.get(PAYLOAD_DATA.SB_IMPLEMENTATION, None))
-    if ee_impl is None or (isinstance(ee_impl, str) and ee_impl.lower() != self.signature.lower()):
+    if ee_impl is None or (isinstance(ee_impl, str) and ee_impl.lower() != self._signature_lower):
       return encoded_output
 
-    self.log.start_timer('decode', section='Formatter_' + str(self.signature))
+    # the timers are no-ops unless the logger is in DEBUG mode - skip the calls altogether
+    timed = self.log.DEBUG
+    if timed:
+      self.log.start_timer('decode', section=self._timers_section)
     try:
       output = self._decode_output(encoded_output)
     except Exception as e:
@@ -75,7 +83,8 @@ class BaseFormatter(object):
       self.P(msg)
       self.P(traceback.format_exc(), color='r')
     # end try-except
-    self.log.stop_timer('decode', section='Formatter_' + str(self.signature))
+    if timed:
+      self.log.stop_timer('decode', section=self._timers_section)
     if isinstance(output, dict):
       output[PAYLOAD_DATA.EE_FORMATTER] = ee_impl
     return output
@@ -0,0 +1,129 @@
+"""
+Declarative description of "envelope" formatters (the flat message fields are moved
+under one nested key, with some meta groups and the routing info packed in the payload
+path) and the compilation of such a description into the encode/decode functions.
+
+The compiled functions do all the key classification with precomputed sets/dicts, in a
+single pass over the message, instead of per-message `pop`s and prefix scans.
+"""
+from collections import namedtuple
+
+
+# conditions of the `path_fields` rules
+PATH_ALWAYS = None
+PATH_IF_NOT_EVENT = 'IF_NOT_EVENT'  # (PATH_IF_NOT_EVENT, event_type): set unless the message has this event type
+PATH_IF_SET = 'IF_SET'              # (PATH_IF_SET, path_index): set if this path element is not None
+
+
+EnvelopeSpec = namedtuple(
+  "EnvelopeSpec", [
+    "data_key",             # the key holding the nested message data, e.g. 'DATA'
+    "event_key",            # the key of the event type, e.g. 'EE_EVENT_TYPE'
+    "payload_event",        # the event type that has meta groups, e.g. 'PAYLOAD'
+    "drop_on_encode",       # fields removed on encoding (re-added by the transport or the decoder)
+    "meta_groups",          # ((group key, field prefix), ...) - payload only
+    "path_key",             # the key of the routing path, e.g. 'EE_PAYLOAD_PATH'
+    "path_fields",          # ((field, path index, condition), ...) - restored on decoding
+    "payload_path_fields",  # ((field, path index), ...) - payload only, required on encoding
+    "payload_constants",    # ((field, value), ...) - payload only, added on decoding
+  ]
+)
+
+
+def compile_encoder(spec):
+  """
+  Returns `encode(output) -> dict` for the given spec. The input is not modified.
+  """
+  drop = frozenset(spec.drop_on_encode) | {spec.event_key}
+  payload_required = tuple(field for field, _ in spec.payload_path_fields)
+  payload_drop = drop | frozenset(payload_required)
+  group_keys = tuple(group for group, _ in spec.meta_groups)
+  prefix_lens = {len(prefix) for _, prefix in spec.meta_groups}
+  if len(prefix_lens) > 1:
+    raise ValueError("All the meta group prefixes must have the same length: {}".format(spec.meta_groups))
+  prefix_len = prefix_lens.pop() if prefix_lens else 0
+  prefix_to_idx = {prefix: i for i, (_, prefix) in enumerate(spec.meta_groups)}
+  data_key, event_key, payload_event = spec.data_key, spec.event_key, spec.payload_event
+
+  def encode(output):
+    data = {}
+    if output.get(event_key) == payload_event:
+      for field in payload_required:
+        if field not in output:
+          raise KeyError(field)
+      groups = tuple({} for _ in group_keys)
+      for group_key, group in zip(group_keys, groups):
+        data[group_key] = group
+      for k, v in output.items():
+        if k in payload_drop:
+          continue
+        idx = prefix_to_idx.get(k[:prefix_len])
+        if idx is None:
+          data[k] = v
+        else:
+          groups[idx][k] = v
+      # endfor fields
+    else:
+      for k, v in output.items():
+        if k not in drop:
+          data[k] = v
+    # endif payload
+    return {data_key: data}
+
+  return encode
+
+
+def compile_decoder(spec):
+  """
+  Returns `decode(encoded_output) -> dict` for the given spec. The input dict is updated
+  in place and returned.
+  """
+  n_path = 1 + max(
+    [idx for _, idx, _ in spec.path_fields] + [idx for _, idx in spec.payload_path_fields]
+  )
+  default_path = [None] * n_path
+  path_rules = []
+  for field, idx, condition in spec.path_fields:
+    if condition is PATH_ALWAYS:
+      path_rules.append((field, idx, None, None))
+    elif condition[0] == PATH_IF_NOT_EVENT:
+      path_rules.append((field, idx, condition[1], None))
+    elif condition[0] == PATH_IF_SET:
+      path_rules.append((field, idx, None, condition[1]))
+    else:
+      raise ValueError("Unknown path field condition {}".format(condition))
+  # endfor rules
+  path_rules = tuple(path_rules)
+  payload_path_fields = tuple(spec.payload_path_fields)
+  payload_constants = tuple(spec.payload_constants)
+  group_keys = tuple(group for group, _ in spec.meta_groups)
+  data_key, event_key, payload_event, path_key = spec.data_key, spec.event_key, spec.payload_event, spec.path_key
+
+  def decode(encoded_output):
+    path = encoded_output.get(path_key, default_path)
+    if len(path) != n_path:
+      raise ValueError("Invalid {} {}".format(path_key, path))
+    event_type = encoded_output[event_key]
+    for field, idx, unless_event, if_set_idx in path_rules:
+      if unless_event is not None and event_type == unless_event:
+        continue
+      if if_set_idx is not None and path[if_set_idx] is None:
+        continue
+      encoded_output[field] = path[idx]
+    # endfor path fields
+
+    data = encoded_output.pop(data_key)
+    if event_type == payload_event:
+      for field, idx in payload_path_fields:
+        encoded_output[field] = path[idx]
+      for group_key in group_keys:
+        group = data.pop(group_key, None)
+        if group:
+          encoded_output.update(group)
+      for field, value in payload_constants:
+        encoded_output[field] = value
+    # endif payload
+    encoded_output.update(data)
+    return encoded_output
+
+  return decode
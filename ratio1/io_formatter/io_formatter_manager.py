@@ -1,5 +1,3 @@
-from time import time
-
 from ..plugins_manager_mixin import _PluginsManagerMixin
 from ..const import PAYLOAD_DATA
 from ..io_formatter.default import Aixp1Formatter, DefaultFormatter
@@ -15,7 +13,9 @@ class IOFormatterWrapper(_PluginsManagerMixin):
     self.plugin_search_locations = plugin_search_locations
     self.plugin_search_suffix = plugin_search_suffix
 
-    self._last_search_invalid_formatter = {}
+    # names already searched for and not found: never searched again on the message path
+    # (see `reset_invalid_formatters`)
+    self._invalid_formatters = set()
 
     self.__init_formatters()
     return
@@ -54,34 +54,37 @@ class IOFormatterWrapper(_PluginsManagerMixin):
   def get_formatter_by_name(self, name):
     return self._create_formatter(name)
 
+  def reset_invalid_formatters(self, name=None):
+    """
+    Forgets the failed formatter searches (all or only `name`) so they are retried on next use,
+    e.g. after installing new formatter plugins.
+    """
+    names = list(self._invalid_formatters) if name is None else [name]
+    for _name in names:
+      self._invalid_formatters.discard(_name)
+      if self._dct_formatters.get(_name, 0) is None:
+        del self._dct_formatters[_name]
+    return
+
   def _create_formatter(self, name):
     # TODO: change name to maybe_create_formatter
     if name is None or name == '':
       # check if we want to create a default formatter
       return self._dct_formatters['default']
 
-    if name in self._dct_formatters:
-      # formatter already created
-      if self._dct_formatters[name] is None:
-        # formatter is not available
-        if name not in self._last_search_invalid_formatter:
-          self._last_search_invalid_formatter[name] = 0
-        if time() - self._last_search_invalid_formatter[name] < 10 * 60:
-          return self._dct_formatters[name]
-      else:
-        return self._dct_formatters[name]
-    # end if name in self._dct_formatters
+    formatter = self._dct_formatters.get(name)
+    if formatter is not None or name in self._invalid_formatters:
+      # already created or already known as not available
+      return formatter
 
     self.D("Creating formatter '{}'".format(name))
     _cls = self._get_plugin_class(name)
 
-    formatter = None
-
     if _cls is not None:
       formatter = _cls(log=self.log, signature=name.lower())
       self.D("Successfully created IO formatter {}.".format(name))
     else:
-      self._last_search_invalid_formatter[name] = time()
+      self._invalid_formatters.add(name)
     self._dct_formatters[name] = formatter
     return formatter
 
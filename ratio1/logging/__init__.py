@@ -1 +1,7 @@
-from .small_logger import Logger
+def __getattr__(name):
+  # the full Logger (with all the mixins and their numpy/pandas/cv2 imports) is only
+  # imported when used - `ratio1.logging.base_logger` stays cheap for the CLI
+  if name == 'Logger':
+    from .small_logger import Logger
+    return Logger
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,6 @@ import json
 import shutil
 import codecs
 import textwrap
-import numpy as np
 import traceback
 import socket
 import threading
@@ -26,6 +25,9 @@ SDK_HOME_PREV = [
 ]
 
 from .._ver import __VER__
+from ..utils.lazy_import import LazyImport
+
+np = LazyImport("numpy")
 
 _HTML_START = "<HEAD><meta http-equiv='refresh' content='5' ></HEAD><BODY><pre>"
 _HTML_END = "</pre></BODY>"
@@ -6,6 +6,7 @@ from .general_serialization_mixin import _GeneralSerializationMixin
 from .json_serialization_mixin import _JSONSerializationMixin
 from .pickle_serialization_mixin import _PickleSerializationMixin
 from .process_mixin import _ProcessMixin
+from .profiler_mixin import _ProfilerMixin
 from .resource_size_mixin import _ResourceSizeMixin
 from .timers_mixin import _TimersMixin
 from .upload_mixin import _UploadMixin
@@ -0,0 +1,91 @@
+import os
+
+from ...utils.sampling_profiler import SamplingProfiler, DEFAULT_SAMPLE_RATE, DEFAULT_MAX_DEPTH
+
+
+class _ProfilerMixin(object):
+  """
+  Mixin for the opt-in sampling profiler that is attached to `ratio1.Logger`.
+
+  This mixin cannot be instantiated because it is built just to provide some additional
+  functionalities for `ratio1.Logger`
+
+  In this mixin we can use any attribute/method of the Logger.
+  """
+
+  def __init__(self):
+    super(_ProfilerMixin, self).__init__()
+    self._profiler = None
+    return
+
+  @property
+  def profiler_running(self):
+    return self._profiler is not None and self._profiler.is_running
+
+  def start_profiler(self, threads=None, sample_rate=DEFAULT_SAMPLE_RATE, max_depth=DEFAULT_MAX_DEPTH):
+    """
+    Starts sampling the call stacks of the given threads (see `SamplingProfiler`).
+    Stacks aggregated by a previous run are discarded.
+
+    Parameters
+    ----------
+    threads : callable, optional
+        Returns a dict `{label: threading.Thread}` of the threads to profile. By default all threads.
+    sample_rate : float, optional
+        Samples per second, by default 100.
+    max_depth : int, optional
+        Maximum number of frames kept for a stack.
+
+    Returns
+    -------
+    SamplingProfiler
+        The running profiler.
+    """
+    if self.profiler_running:
+      self.P("Sampling profiler already running", color='y')
+      return self._profiler
+    self._profiler = SamplingProfiler(threads=threads, sample_rate=sample_rate, max_depth=max_depth)
+    self._profiler.start()
+    self.P("Sampling profiler started at {} samples/s".format(sample_rate), color='y')
+    return self._profiler
+
+  def stop_profiler(self):
+    """
+    Stops the sampling profiler. The aggregated stacks are still available.
+    """
+    if self._profiler is None:
+      return
+    self._profiler.stop()
+    self.P("Sampling profiler stopped after {} samples in {:.1f}s".format(
+      self._profiler.n_samples, self._profiler.elapsed
+    ), color='y')
+    return
+
+  def get_profiler_folded_stacks(self, threads=None):
+    """
+    Returns the profiled stacks in the flamegraph "folded" format (one `frame;frame;... count`
+    line per distinct stack), optionally only for the given thread labels.
+    """
+    if self._profiler is None:
+      return []
+    return self._profiler.get_folded_stacks(threads=threads)
+
+  def save_profiler_folded_stacks(self, fn=None, threads=None):
+    """
+    Saves the profiled stacks in the flamegraph "folded" format and returns the file path.
+
+    Parameters
+    ----------
+    fn : str, optional
+        The file path. By default a timestamped file in the output folder.
+    threads : list[str], optional
+        Only the stacks of these thread labels.
+    """
+    if self._profiler is None:
+      self.P("Sampling profiler was not started, nothing to save", color='r')
+      return None
+    if fn is None:
+      fn = os.path.join(self.get_output_folder(), "{}_profile.folded".format(self.file_prefix))
+    self._profiler.save_folded_stacks(fn, threads=threads)
+    self.P("Saved {} profiled stacks to '{}'".format(self._profiler.n_samples, fn))
+    return fn
@@ -1,7 +1,8 @@
+import threading
 import traceback
 import numpy as np
 
-from collections import OrderedDict, deque
+from collections import deque
 from time import perf_counter, sleep, time
 
 
@@ -17,6 +18,157 @@ ZERO_THRESHOLD = 5e-4
 
 _OBSOLETE_SECTION_TIME = 3600  # sections older than 1 hour are archived
 
+ROOT_NODE = "ROOT"
+
+
+class _LapsBuffer(object):
+  """
+  Fixed-size ring buffer of float laps, preallocated once per timer so that recording a 
+  lap is a single array write.
+  """
+  __slots__ = ('buffer', 'size', 'count', 'pos')
+
+  def __init__(self, size=MAX_LAPS):
+    self.buffer = np.zeros(size, dtype=np.float64)
+    self.size = size
+    self.count = 0
+    self.pos = 0
+    return
+
+  def append(self, value):
+    pos = self.pos
+    self.buffer[pos] = value
+    pos += 1
+    self.pos = 0 if pos == self.size else pos
+    if self.count < self.size:
+      self.count += 1
+    return
+
+  def values(self):
+    """
+    Returns the recorded laps in chronological order.
+    """
+    if self.count < self.size:
+      return self.buffer[:self.count]
+    return np.roll(self.buffer, -self.pos)
+
+  def last(self):
+    return self.buffer[self.pos - 1] if self.count > 0 else -1
+
+  def mean(self):
+    return self.buffer[:self.count].mean() if self.count > 0 else -1
+
+  def std(self):
+    return self.buffer[:self.count].std() if self.count > 0 else -1
+
+  def __len__(self):
+    return self.count
+
+  def __array__(self, dtype=None, copy=None):
+    values = self.values()
+    return values if dtype is None else values.astype(dtype)
+
+
+class _Timer(object):
+  """
+  The statistics of one timer. The fields are slots for a cheap start/end, while the dict-like 
+  access (`timer['MEAN']`, `timer.get('COUNT', 0)`) of the former dict timers is kept.
+  """
+  __slots__ = (
+    'MEAN', 'M2', 'MAX', 'COUNT', 'START', 'END', 'PASS', 'LEVEL',
+    'START_COUNT', 'STOP_COUNT', 'LAPS', 'HISTORY',
+  )
+
+  def __init__(self):
+    self.MEAN = 0
+    self.M2 = 0 # sum of squared deviations from the mean (Welford)
+    self.MAX = 0
+    self.COUNT = 0
+    self.START = 0
+    self.END = 0
+    self.PASS = True
+    self.LEVEL = 0
+
+    self.START_COUNT = 0
+    self.STOP_COUNT = 0
+
+    self.LAPS = _LapsBuffer(MAX_LAPS)
+    self.HISTORY = {
+      'LAST': [None for _ in range(len(PERIODS))],
+      'DEQUES': [_LapsBuffer(MAX_PERIOD_LAPS) for _ in range(len(PERIODS))],
+    }
+    return
+
+  def __getitem__(self, key):
+    if key not in self.__slots__:
+      raise KeyError(key)
+    return getattr(self, key)
+
+  def __setitem__(self, key, value):
+    if key not in self.__slots__:
+      raise KeyError(key)
+    setattr(self, key, value)
+    return
+
+  def __contains__(self, key):
+    return key in self.__slots__
+
+  def get(self, key, default=None):
+    return getattr(self, key) if key in self.__slots__ else default
+
+  def keys(self):
+    return list(self.__slots__)
+
+  def to_dict(self):
+    return {k: getattr(self, k) for k in self.__slots__}
+
+  def __repr__(self):
+    return repr({k: getattr(self, k) for k in self.__slots__ if k not in ('LAPS', 'HISTORY')})
+
+
+def _laps_from_legacy(values, size):
+  laps = _LapsBuffer(size)
+  for value in list(values)[-size:]:
+    laps.append(value)
+  return laps
+
+
+def _timer_from_legacy(dct_timer):
+  """
+  Converts a timer dict of the former format (laps in deques, no `M2`) to a `_Timer`. The 
+  running variance is estimated from the recorded laps.
+  """
+  timer = _Timer()
+  for key, value in dct_timer.items():
+    if key in ('LAPS', 'HISTORY') or key not in timer:
+      continue
+    timer[key] = value
+  # endfor keys
+  timer.LAPS = _laps_from_legacy(dct_timer.get('LAPS', []), MAX_LAPS)
+  history = dct_timer.get('HISTORY')
+  if history is not None:
+    timer.HISTORY = {
+      'LAST': list(history['LAST']),
+      'DEQUES': [_laps_from_legacy(dq, MAX_PERIOD_LAPS) for dq in history['DEQUES']],
+    }
+  # endif history
+  if 'M2' not in dct_timer and len(timer.LAPS) > 1:
+    timer.M2 = float(timer.LAPS.std()) ** 2 * timer.COUNT
+  return timer
+
+
+def _graph_from_legacy(dct_graph):
+  """
+  Converts a graph of the former format `{node: {"SLOW": OrderedDict, "FAST": OrderedDict}}` 
+  to `{node: {child: None}}`.
+  """
+  graph = {}
+  for node, children in dct_graph.items():
+    graph[node] = dict.fromkeys(list(children.get('SLOW', {})) + list(children.get('FAST', {})))
+  graph.setdefault(ROOT_NODE, {})
+  return graph
+
+
 class _TimersMixin(object):
   """
   Mixin for timers functionalities that are attached to `ratio1.Logger`.
@@ -25,18 +177,32 @@ class _TimersMixin(object):
   functionalities for `ratio1.Logger`
 
   In this mixin we can use any attribute/method of the Logger.
+
+  Each thread has its own stack of opened timers per section, so a section can be timed from 
+  multiple threads. The timer statistics are updated in O(1) (running mean/variance and a 
+  preallocated ring buffer of laps) under a lock, so that concurrent `end_timer` calls on the 
+  same timer do not lose updates. The faulty timers are only searched when the timers are shown 
+  or on `get_faulty_timers`.
+
+  Compatibility notes:
+    - the timers are `_Timer` objects with dict-like access and the graph of a section is 
+      `{node: {child: None}}` (formerly `{node: {"SLOW": OrderedDict, "FAST": OrderedDict}}`). 
+      `import_timers_section` also accepts sections exported in the former format.
+    - `opened_timers` and `timer_level` are read-only views of the calling thread's opened 
+      timers (`{section: deque([sname, ...])}` and `{section: level}`).
   """
 
   def __init__(self):
     super(_TimersMixin, self).__init__()
     self.timers = None
-    self.timer_level = None # no actual purpose following addition of graph
-    self.sections_last_used = {}
-    self.opened_timers = None
+    self.sections_last_used = {} # perf_counter of the last timer end per section
     self.timers_graph = None
     self._timer_error = None
     self.default_timers_section = DEFAULT_SECTION
     self.__timer_mutex = False
+    self.__opened_timers = None
+    # guards the timers statistics and the graph (re-entrant as `P` may be called while held)
+    self.__timers_lock = threading.RLock()
 
     self.start_show_timer = None
 
@@ -49,96 +215,96 @@ class _TimersMixin(object):
     if section in self.timers:
       return
 
-    self.timers[section] = OrderedDict()
-    self.timer_level[section] = 0
-    self.opened_timers[section] = deque()
-    self.timers_graph[section] = OrderedDict()
-    self.timers_graph[section]["ROOT"] = {"SLOW" : OrderedDict(), "FAST" : OrderedDict()}
-    self._timer_error[section] = False
+    with self.__timers_lock:
+      if section in self.timers:
+        return
+      # the graph maps each timer to its children (a dict used as an ordered set)
+      self.timers_graph[section] = {ROOT_NODE: {}}
+      self._timer_error[section] = False
+      self.timers[section] = {}
+    # endwith lock
     return
 
   def reset_timers(self):
     self.timers = {}
-    self.timer_level = {}
-    self.opened_timers = {}
     self.timers_graph = {}
     self._timer_error = {}
+    # per thread: {section: [(sname, start_time), ...]}
+    self.__opened_timers = threading.local()
 
     self._maybe_create_timers_section()
     return
 
+  def __get_opened_timers(self, section):
+    try:
+      return self.__opened_timers.sections[section]
+    except AttributeError:
+      self.__opened_timers.sections = {}
+    except KeyError:
+      pass
+    opened = self.__opened_timers.sections[section] = []
+    return opened
+
+  @property
+  def opened_timers(self):
+    """
+    The timers opened (and not yet ended) by the calling thread: `{section: deque([sname, ...])}`.
+    """
+    sections = getattr(self.__opened_timers, 'sections', {})
+    return {section: deque(sname for sname, _ in opened) for section, opened in sections.items()}
+
+  @property
+  def timer_level(self):
+    """
+    The nesting level of the calling thread's opened timers: `{section: level}`.
+    """
+    sections = getattr(self.__opened_timers, 'sections', {})
+    return {section: len(sections.get(section, [])) for section in self.timers}
+
   @staticmethod
   def get_empty_timer():
-    return {
-      'MEAN': 0,
-      'MAX': 0,
-      'COUNT': 0,
-      'START': 0,
-      'END': 0,
-      'PASS': True,
-      'LEVEL': 0,
-
-      'START_COUNT': 0,
-      'STOP_COUNT': 0,
-      
-      'LAPS' : deque(maxlen=MAX_LAPS),
-      'HISTORY': {
-        'LAST': [None for _ in range(len(PERIODS))],
-        'DEQUES': [deque(maxlen=MAX_PERIOD_LAPS) for _ in range(len(PERIODS))],
-      }
-    }
+    return _Timer()
 
   def restart_timer(self, sname, section=None):
     section = section or self.default_timers_section
-    self.timers[section][sname] = self.get_empty_timer()
-    return
-
-  def _add_in_timers_graph(self, sname, section=None):
-    section = section or self.default_timers_section
-    self.timers[section][sname]['LEVEL'] = self.timer_level[section]
-    if sname not in self.timers_graph[section]:
-      self.timers_graph[section][sname] = {"SLOW" : OrderedDict(), "FAST" : OrderedDict()}
-
-    self.timers_graph[section][sname]["FAST"] = OrderedDict() ## there is no ordered set, so we use OrderedDict with no values
+    with self.__timers_lock:
+      self.timers[section][sname] = self.get_empty_timer()
+      graph = self.timers_graph[section]
+      if sname not in graph:
+        graph[sname] = {}
+    # endwith lock
     return
 
   def start_timer(self, sname, section=None):
     section = section or self.default_timers_section
-    if section == self.default_timers_section:
-      assert self.is_main_thread, "Attempted to run threaded timer '{}' without section".format(sname)
-
-    self._maybe_create_timers_section(section)
+    timers = self.timers.get(section)
+    if timers is None:
+      self._maybe_create_timers_section(section)
+      timers = self.timers[section]
 
     if not self.DEBUG:
       return -1
 
-    if sname not in self.timers[section]:
-      self.restart_timer(sname, section)
-
-    curr_time = perf_counter()
-    self._add_in_timers_graph(sname, section=section)
-    self.timers[section][sname]['START'] = curr_time
-    self.timers[section][sname]['START_COUNT'] += 1
-    if len(self.opened_timers[section]) >= 1:
-      parent = self.opened_timers[section][-1]
-    else:
-      parent = "ROOT"
-    #endif
-
-    self.timers_graph[section][parent]["FAST"][sname] = None
-    self.timers_graph[section][parent]["SLOW"][sname] = None
-
-    self.timer_level[section] += 1
-    self.opened_timers[section].append(sname)
-
-    faulty_timers = self._get_section_faulty_timers(section)
-    if len(faulty_timers) > 0 and not self._timer_error[section]:
-      self.P("Something is wrong with the timers in section '{}':".format(section), color='r')
-      for ft in faulty_timers:
-        self.P("  {}: {}".format(ft, self.timers[section][ft]), color='r')
-      self._timer_error[section] = True
-    #endif
-
+    try:
+      opened = self.__opened_timers.sections[section]
+    except (AttributeError, KeyError):
+      opened = self.__get_opened_timers(section)
+    parent = opened[-1][0] if len(opened) > 0 else ROOT_NODE
+
+    with self.__timers_lock:
+      ctimer = timers.get(sname)
+      if ctimer is None:
+        self.restart_timer(sname, section)
+        ctimer = timers[sname]
+      children = self.timers_graph[section][parent]
+      if sname not in children:
+        children[sname] = None
+      curr_time = perf_counter()
+      ctimer.START = curr_time
+      ctimer.START_COUNT += 1
+      ctimer.LEVEL = len(opened)
+    # endwith lock
+    opened.append((sname, curr_time))
     return curr_time
 
   def get_time_until_now(self, sname, section=None):
@@ -160,13 +326,25 @@ class _TimersMixin(object):
         lst_faulty.append(tmr_name)
     return lst_faulty
 
+  def _maybe_show_faulty_timers(self, section):
+    if self._timer_error.get(section):
+      return
+    faulty_timers = self._get_section_faulty_timers(section)
+    if len(faulty_timers) > 0:
+      self.P("Something is wrong with the timers in section '{}':".format(section), color='r')
+      for ft in faulty_timers:
+        self.P("  {}: {}".format(ft, self.timers[section][ft]), color='r')
+      self._timer_error[section] = True
+    #endif
+    return
+
   def end_timer_no_skip(self, sname, section=None, periodic=False):
     return self.end_timer(sname, skip_first_timing=False, section=section, periodic=periodic)
 
   def get_opened_timer(self, section=None):
     section = section or self.default_timers_section
-    timer = self.opened_timers[section][-1]
-    return timer, perf_counter() - self.timers[section][timer]['START']
+    timer, start = self.__get_opened_timers(section)[-1]
+    return timer, perf_counter() - start
 
   def get_periodic_multiplier(self):
     if self.config_data is None:
@@ -174,11 +352,13 @@ class _TimersMixin(object):
     return self.config_data.get('PERIODIC_MULTIPLIER', DEFAULT_PERIODIC_MULTIPLIER)
 
   def add_periodic_record(self, sname, record, section=None, idx=0, check=False):
+    section = section or self.default_timers_section
     chistory = self.timers[section][sname]['HISTORY']
-    dq_size = len(chistory['DEQUES'][idx])
+    buffer = chistory['DEQUES'][idx]
+    dq_size = len(buffer)
     if check and dq_size > 2:
-      cmean = np.array(chistory['DEQUES'][idx]).mean()
-      cstd = np.std(chistory['DEQUES'][idx])
+      cmean = buffer.mean()
+      cstd = buffer.std()
       cnt = self.timers[section][sname]['COUNT']
       q = self.get_periodic_multiplier()
       limit = cmean + cstd * q
@@ -191,49 +371,79 @@ class _TimersMixin(object):
         )
       # endif warning
     # endif anomaly check
-    chistory['DEQUES'][idx].append(record)
+    buffer.append(record)
     chistory['LAST'][idx] = self.timers[section][sname]['END']
     return
 
+  def __pop_opened_timer(self, opened, sname, ctimer):
+    # the timer is not the last opened one in this thread: close it together with any timer
+    # opened after it and never ended (these remain visible as faulty timers)
+    for i in range(len(opened) - 1, -1, -1):
+      if opened[i][0] == sname:
+        start = opened[i][1]
+        del opened[i:]
+        return start
+    # endfor
+    # started in another thread
+    return ctimer['START']
+
   def end_timer(self, sname, skip_first_timing=False, section=None, periodic=False):
     section = section or self.default_timers_section
-    if sname not in self.timers[section]:
+    try:
+      ctimer = self.timers[section][sname]
+    except KeyError:
       return
     result = 0
-    self.sections_last_used[section] = time()
+    end = perf_counter()
+    self.sections_last_used[section] = end
     if self.DEBUG:
-      self.opened_timers[section].pop()
-      self.timer_level[section] -= 1
-
-      ctimer = self.timers[section][sname]
-      ctimer['STOP_COUNT'] += 1
-      ctimer['END'] = perf_counter()
-      result = ctimer['END'] - ctimer['START']
-      ctimer['LAPS'].append(result)
-      if periodic:
-        chistory = ctimer['HISTORY']
-        for i, period in enumerate(PERIODS):
-          if chistory['LAST'][i] is None:
-            self.add_periodic_record(sname, result, section=section, idx=i)
-          elif ctimer['END'] - chistory['LAST'][i] > period:
-            self.add_periodic_record(sname, result, section=section, idx=i, check=True)
-          # endif periodic record
-        # endfor i, period
-      # endif periodic
-      _count = ctimer['COUNT']
-      _prev_avg = ctimer['MEAN']
-      avg = _count * _prev_avg
-
-      if ctimer['PASS'] and skip_first_timing:
-        ctimer['PASS'] = False
-        return result  # do not record first timing in average nor the max
-
-      ctimer['MAX'] = max(ctimer['MAX'], result)
-
-      ctimer['COUNT'] = _count + 1
-      avg += result
-      avg = avg / ctimer["COUNT"]
-      ctimer['MEAN'] = avg
+      try:
+        opened = self.__opened_timers.sections[section]
+      except (AttributeError, KeyError):
+        opened = self.__get_opened_timers(section)
+      if len(opened) > 0 and opened[-1][0] == sname:
+        start = opened.pop()[1]
+      else:
+        start = self.__pop_opened_timer(opened, sname, ctimer)
+
+      result = end - start
+      with self.__timers_lock:
+        ctimer.STOP_COUNT += 1
+        ctimer.END = end
+        laps = ctimer.LAPS # inlined `_LapsBuffer.append`
+        pos = laps.pos
+        laps.buffer[pos] = result
+        pos += 1
+        laps.pos = 0 if pos == laps.size else pos
+        if laps.count < laps.size:
+          laps.count += 1
+        if periodic:
+          chistory = ctimer.HISTORY
+          for i, period in enumerate(PERIODS):
+            if chistory['LAST'][i] is None:
+              self.add_periodic_record(sname, result, section=section, idx=i)
+            elif end - chistory['LAST'][i] > period:
+              self.add_periodic_record(sname, result, section=section, idx=i, check=True)
+            # endif periodic record
+          # endfor i, period
+        # endif periodic
+
+        if ctimer.PASS and skip_first_timing:
+          ctimer.PASS = False
+          return result  # do not record first timing in average nor the max
+
+        if result > ctimer.MAX:
+          ctimer.MAX = result
+
+        # Welford running mean and variance
+        count = ctimer.COUNT + 1
+        mean = ctimer.MEAN
+        delta = result - mean
+        mean += delta / count
+        ctimer.M2 += delta * (result - mean)
+        ctimer.MEAN = mean
+        ctimer.COUNT = count
+      # endwith lock
     return result
 
   def stop_timer(self, sname, skip_first_timing=False, section=None, periodic=False):
@@ -267,7 +477,7 @@ class _TimersMixin(object):
       return
 
     mean_time = ctimer['MEAN']
-    np_laps = np.array(ctimer['LAPS'])
+    np_laps = ctimer['LAPS'].values()
     if len(np_laps) > 0:
       laps_mean = np_laps.mean()
       laps_std = np_laps.std()
@@ -293,7 +503,7 @@ class _TimersMixin(object):
       return
 
     max_time = ctimer['MAX']
-    current_time = np_laps[-1] if len(np_laps) > 0 else -1 # ctimer['END'] - ctimer['START']
+    current_time = ctimer['LAPS'].last() # ctimer['END'] - ctimer['START']
 
     if not was_recently_seen:
       key = '[' + key[:max_key_size] + ']'
@@ -392,10 +602,11 @@ class _TimersMixin(object):
           if formatted_node is not None:
             logs.append(formatted_node)
           visited.add(node)
-          slow_keys = list(graph[node]["SLOW"].keys())
-          fast_keys = list(graph[node]["FAST"].keys())
-          for neighbour in slow_keys:
-            recently_seen = neighbour in fast_keys
+          timers = self.timers[sect]
+          node_start = timers[node]['START'] if node in timers else None
+          for neighbour in list(graph.get(node, {})):
+            # a child was recently seen if it was started since the last start of its parent
+            recently_seen = node_start is None or timers.get(neighbour, {}).get('START', 0) >= node_start
             dfs(visited, graph, neighbour, recently_seen, logs, sect)
           #endfor
         #endif
@@ -426,15 +637,16 @@ class _TimersMixin(object):
         for section in keys:
           last_see_ago = None
           if section in self.sections_last_used:
-            last_see_ago = time() - self.sections_last_used[section]
+            last_see_ago = perf_counter() - self.sections_last_used[section]
             if last_see_ago > obsolete_section_time:
               old_sections.append(section)
               continue
           lst_logs.append("Section '{}'{}".format(
             section, " last seen {:.1f}s ago".format(last_see_ago) if last_see_ago is not None else ""
           ))
+          self._maybe_show_faulty_timers(section)
           buffer_visited = set()
-          dfs(buffer_visited, self.timers_graph[section], "ROOT", True, lst_logs, section)
+          dfs(buffer_visited, self.timers_graph[section], ROOT_NODE, True, lst_logs, section)
         if len(old_sections) > 0:
           lst_logs.append("Archived {} sections older than {:.1f} hrs.".format(
             len(old_sections), obsolete_section_time / 3600, 
@@ -462,8 +674,17 @@ class _TimersMixin(object):
 
   def get_timer_mean(self, skey, section=None):
     tmr = self.get_timer(skey, section=section)
-    laps = tmr.get('LAPS', [])
-    result = np.mean(laps) if len(laps) > 0 else -1
+    laps = tmr.get('LAPS')
+    result = laps.mean() if laps is not None else -1
+    return result
+
+  def get_timer_std(self, skey, section=None):
+    """
+    Returns the standard deviation of all the recorded timings of the timer (-1 if none).
+    """
+    tmr = self.get_timer(skey, section=section)
+    count = tmr.get('COUNT', 0)
+    result = (tmr['M2'] / count) ** 0.5 if count > 0 else -1
     return result
 
 
@@ -473,6 +694,26 @@ class _TimersMixin(object):
     return result
   
   def import_timers_section(self, dct_timers, dct_timers_graph, section, overwrite=False):
+    """
+    Imports a timers section exported with `export_timers_section`.
+
+    Parameters
+    ----------
+    dct_timers : dict
+      `{sname: timer}`. Timers exported in the former format (plain dicts with deque laps) are 
+      converted to `_Timer`.
+    dct_timers_graph : dict
+      `{node: {child: None}}` or the former `{node: {"SLOW": OrderedDict, "FAST": OrderedDict}}`.
+    section : str
+      The name of the imported section.
+    overwrite : bool, optional
+      Replace the section if it already exists. The default is False.
+
+    Returns
+    -------
+    bool
+      True if the section was imported.
+    """
     if self.__timer_mutex:
       # we skip this import until next time
       self.P("WARNING: Cannot import section '{}' with {} timers while processing sections!".format(
@@ -484,12 +725,27 @@ class _TimersMixin(object):
         section, len(dct_timers)
       ), color='r')
       return False
-    self.timers[section] = dct_timers
-    self.timers_graph[section] = dct_timers_graph
-    self.sections_last_used[section] = time()
+    dct_timers = {
+      sname: timer if isinstance(timer, _Timer) else _timer_from_legacy(timer)
+      for sname, timer in dct_timers.items()
+    }
+    if any(isinstance(children, dict) and ('SLOW' in children or 'FAST' in children)
+           for children in dct_timers_graph.values()):
+      dct_timers_graph = _graph_from_legacy(dct_timers_graph)
+    with self.__timers_lock:
+      self.timers[section] = dct_timers
+      self.timers_graph[section] = dct_timers_graph
+      self._timer_error[section] = False
+    # endwith lock
+    self.sections_last_used[section] = perf_counter()
     return True
   
   def export_timers_section(self, section=None):
+    """
+    Returns the `(timers, graph)` of a section: `{sname: _Timer}` and `{node: {child: None}}` 
+    (formerly plain timer dicts and `{node: {"SLOW": OrderedDict, "FAST": OrderedDict}}`).
+    Returns `(None, None)` if the section does not exist.
+    """
     section = section or self.default_timers_section
     if section not in self.timers:
       self.P("WARNING: Cannot export unexisting timers section '{}'".format(
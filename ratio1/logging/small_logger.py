@@ -7,6 +7,7 @@ from .logger_mixins import (_ClassInstanceMixin,
                             _JSONSerializationMixin,
                             _PickleSerializationMixin,
                             _ProcessMixin,
+                            _ProfilerMixin,
                             _ResourceSizeMixin,
                             _TimersMixin,
                             _UploadMixin,
@@ -24,6 +25,7 @@ class Logger(
   _JSONSerializationMixin,
   _PickleSerializationMixin,
   _ProcessMixin,
+  _ProfilerMixin,
   _ResourceSizeMixin,
   _TimersMixin,
   _UploadMixin,
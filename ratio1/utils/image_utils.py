@@ -0,0 +1,121 @@
+"""
+Decoding of the base64 images carried by the payloads (JPEG/PNG), straight to NumPy.
+
+When OpenCV is installed the compressed bytes are handed to `cv2.imdecode` without any
+intermediate copy (`np.frombuffer` over the base64-decoded buffer) and the decoder writes
+the pixels directly into the resulting array, which is then converted BGR(A)->RGB(A) in
+place. Otherwise PIL is used, as before.
+"""
+import base64
+import io
+import importlib.util
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import numpy as np
+
+from .lazy_import import LazyImport
+
+cv2 = LazyImport("cv2")
+
+_HAS_CV2 = None
+_IMAGE_POOL = None
+_IMAGE_POOL_LOCK = Lock()
+
+
+def has_cv2():
+  """
+  Returns True if OpenCV is installed (checked without importing it).
+  """
+  global _HAS_CV2
+  if _HAS_CV2 is None:
+    _HAS_CV2 = importlib.util.find_spec("cv2") is not None
+  return _HAS_CV2
+
+
+def b64_to_pil_image(base64_img):
+  """
+  Decodes a base64 encoded image into a PIL image.
+  """
+  try:
+    from PIL import Image
+  except ModuleNotFoundError:
+    raise ModuleNotFoundError(
+      "This functionality requires the PIL library. To use this feature, please install it using 'pip install pillow'"
+    )
+  return Image.open(io.BytesIO(base64.b64decode(base64_img)))
+
+
+def b64_to_np_image(base64_img, use_cv2=None):
+  """
+  Decodes a base64 encoded image into a RGB (or RGBA/grayscale) numpy array.
+
+  Parameters
+  ----------
+  base64_img : str | bytes
+      The base64 encoded JPEG/PNG image.
+  use_cv2 : bool, optional
+      Force (True) or avoid (False) the OpenCV decoder. By default OpenCV is used if installed.
+
+  Returns
+  -------
+  np.ndarray
+      The decoded image (HxWxC or HxW), uint8.
+  """
+  if use_cv2 is None:
+    use_cv2 = has_cv2()
+  raw = base64.b64decode(base64_img)
+  if use_cv2:
+    np_image = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if np_image is not None:
+      if np_image.ndim == 3 and np_image.shape[2] == 3:
+        cv2.cvtColor(np_image, cv2.COLOR_BGR2RGB, dst=np_image)
+      elif np_image.ndim == 3 and np_image.shape[2] == 4:
+        cv2.cvtColor(np_image, cv2.COLOR_BGRA2RGBA, dst=np_image)
+      return np_image
+    # endif decoded - otherwise let PIL try (e.g. a format OpenCV was built without)
+  from PIL import Image
+  return np.array(Image.open(io.BytesIO(raw)))
+
+
+def get_image_pool():
+  """
+  Returns the process-wide image thread pool, one worker per CPU (created on first use).
+  OpenCV and PIL release the GIL while decoding/encoding so the frames are processed in parallel.
+  """
+  global _IMAGE_POOL
+  with _IMAGE_POOL_LOCK:
+    if _IMAGE_POOL is None:
+      _IMAGE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="img_pool")
+  return _IMAGE_POOL
+
+
+def map_on_image_pool(func, items, workers=None):
+  """
+  Returns `[func(x) for x in items]`, computed on the shared image pool by at most `workers`
+  threads: the items are split in `workers` contiguous chunks, one pool task each.
+  Runs in the calling thread if `workers` is None or 1 or there is a single item.
+  """
+  if workers is None or workers <= 1 or len(items) <= 1:
+    return [func(x) for x in items]
+  chunk_size = -(-len(items) // workers)
+  chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+  result = []
+  for chunk_result in get_image_pool().map(lambda chunk: [func(x) for x in chunk], chunks):
+    result.extend(chunk_result)
+  return result
+
+
+def decode_images(lst_base64, decode_func, workers=None):
+  """
+  Applies `decode_func` to each non-None item of `lst_base64`, on the shared image pool
+  (at most `workers` threads) if `workers` > 1 and there is more than one image.
+  """
+  idxs = [i for i, b64 in enumerate(lst_base64) if b64 is not None]
+  result = [None] * len(lst_base64)
+  decoded = map_on_image_pool(decode_func, [lst_base64[i] for i in idxs], workers=workers)
+  for i, image in zip(idxs, decoded):
+    result[i] = image
+  return result
@@ -0,0 +1,50 @@
+import importlib
+
+
+class LazyImport:
+  """
+  Stand-in for a module (or an attribute of a module) that is imported on first use,
+  so heavy optional dependencies (pandas, web3, cv2, ...) do not slow down `import ratio1`.
+
+  Parameters
+  ----------
+  module_name : str
+      The module to import, e.g. "pandas".
+  attr_name : str, optional
+      The attribute of the module to stand for, e.g. "Web3" for `from web3 import Web3`.
+
+  Examples
+  --------
+  >>> pd = LazyImport("pandas")
+  >>> Web3 = LazyImport("web3", "Web3")
+  >>> df = pd.DataFrame(...)  # pandas is imported here
+  """
+  def __init__(self, module_name, attr_name=None):
+    object.__setattr__(self, "_module_name", module_name)
+    object.__setattr__(self, "_attr_name", attr_name)
+    object.__setattr__(self, "_target", None)
+    return
+
+  def _resolve(self):
+    target = object.__getattribute__(self, "_target")
+    if target is None:
+      target = importlib.import_module(object.__getattribute__(self, "_module_name"))
+      attr_name = object.__getattribute__(self, "_attr_name")
+      if attr_name is not None:
+        target = getattr(target, attr_name)
+      object.__setattr__(self, "_target", target)
+    return target
+
+  def __getattr__(self, name):
+    return getattr(self._resolve(), name)
+
+  def __call__(self, *args, **kwargs):
+    return self._resolve()(*args, **kwargs)
+
+  def __repr__(self):
+    name = object.__getattribute__(self, "_module_name")
+    attr_name = object.__getattribute__(self, "_attr_name")
+    if attr_name is not None:
+      name = f"{name}.{attr_name}"
+    loaded = object.__getattribute__(self, "_target") is not None
+    return f"<LazyImport {name}{'' if loaded else ' (not loaded)'}>"
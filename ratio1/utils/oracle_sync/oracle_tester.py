@@ -3,10 +3,13 @@ TODO: add signature check for the oracle data
 
 """
 
+import numpy as np
 import requests
+import threading
 import time
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ratio1 import Logger
 from ratio1.bc import DefaultBlockEngine
@@ -24,17 +27,191 @@ class OracleTesterConstants:
   FREQUENCY = "frequency"
   ORACLE_DATA = "oracle_data"
   DEFAULT_MIN_CERTAINTY_PRC = 0.98
+  DEFAULT_MAX_PARALLEL = 16
+  DEFAULT_MAX_REQUESTS_PER_SECOND = 50
+  DEFAULT_REQUEST_TIMEOUT = 10
 
 
 ct = OracleTesterConstants
 
 
+class RateLimiter:
+  """
+  Thread-safe limiter that spaces the calls of `acquire` at least 1 / `max_per_second` apart.
+  """
+  def __init__(self, max_per_second=None):
+    self.min_interval = 1 / max_per_second if max_per_second else 0
+    self.__next_time = 0
+    self.__lock = threading.Lock()
+    return
+
+  def acquire(self):
+    if self.min_interval <= 0:
+      return
+    with self.__lock:
+      now = time.monotonic()
+      wait_time = self.__next_time - now
+      self.__next_time = max(now, self.__next_time) + self.min_interval
+    if wait_time > 0:
+      time.sleep(wait_time)
+    return
+
+
+class AvailabilityStats:
+  """
+  Columnar store of the oracle answers: one row per (node, oracle, epoch) sighting with the
+  availability, certainty and the minimal certainty required by the oracle.
+  Rows are appended per response and materialized as NumPy arrays on demand, so the analyses
+  (min-certainty filtering, disagreement detection, per-epoch histograms) are vectorized.
+  """
+  COLUMNS = ["node", "oracle", "epoch", "avail", "cert", "min_cert", "round"]
+
+  def __init__(self):
+    self.nodes = []       # node code -> node eth address
+    self.oracles = []     # oracle code -> oracle address
+    self.__node_codes = {}
+    self.__oracle_codes = {}
+    self.__chunks = []
+    self.__arrays = None
+    return
+
+  @staticmethod
+  def __get_code(value, codes, values):
+    code = codes.get(value)
+    if code is None:
+      code = len(values)
+      codes[value] = code
+      values.append(value)
+    return code
+
+  def add(self, node_eth_addr, oracle, epochs, avails, certs, min_certainty_prc, round_id=0):
+    n = len(epochs)
+    if n == 0:
+      return
+    node_code = self.__get_code(node_eth_addr, self.__node_codes, self.nodes)
+    oracle_code = self.__get_code(oracle, self.__oracle_codes, self.oracles)
+    self.__chunks.append((
+      np.full(n, node_code, dtype=np.int32),
+      np.full(n, oracle_code, dtype=np.int32),
+      np.asarray(epochs, dtype=np.int64),
+      np.asarray(avails, dtype=np.int64),
+      np.asarray(certs, dtype=np.float64),
+      np.full(n, min_certainty_prc, dtype=np.float64),
+      np.full(n, round_id, dtype=np.int32),
+    ))
+    self.__arrays = None
+    return
+
+  def __len__(self):
+    return sum(len(chunk[0]) for chunk in self.__chunks)
+
+  @property
+  def arrays(self):
+    """
+    Dict of column name -> NumPy array.
+    """
+    if self.__arrays is None:
+      if len(self.__chunks) == 0:
+        dtypes = [np.int32, np.int32, np.int64, np.int64, np.float64, np.float64, np.int32]
+        columns = [np.empty(0, dtype=dtype) for dtype in dtypes]
+      else:
+        columns = [np.concatenate(column) for column in zip(*self.__chunks)]
+      self.__arrays = dict(zip(self.COLUMNS, columns))
+    return self.__arrays
+
+  def certain_mask(self):
+    """
+    Boolean mask of the rows with a certainty at least equal to the oracle minimal certainty.
+    """
+    arrays = self.arrays
+    return arrays["cert"] >= arrays["min_cert"]
+
+  def to_dataframe(self, only_certain=False):
+    import pandas as pd
+    arrays = self.arrays
+    mask = self.certain_mask() if only_certain else slice(None)
+    df = pd.DataFrame({k: v[mask] for k, v in arrays.items()})
+    df["node"] = np.asarray(self.nodes, dtype=object)[df["node"].to_numpy()] if len(df) else []
+    df["oracle"] = np.asarray(self.oracles, dtype=object)[df["oracle"].to_numpy()] if len(df) else []
+    return df
+
+  def get_disagreements(self, only_certain=True):
+    """
+    Returns the (node, epoch) pairs for which different availabilities were reported
+    (by different oracles or by the same oracle in different rounds).
+
+    Returns
+    -------
+    list[tuple]
+        (node eth address, epoch, sorted list of the distinct availabilities)
+    """
+    arrays = self.arrays
+    mask = self.certain_mask() if only_certain else np.ones(len(arrays["node"]), dtype=bool)
+    nodes, epochs, avails = arrays["node"][mask], arrays["epoch"][mask], arrays["avail"][mask]
+    if len(nodes) == 0:
+      return []
+    order = np.lexsort((avails, epochs, nodes))
+    nodes, epochs, avails = nodes[order], epochs[order], avails[order]
+    # group boundaries on (node, epoch)
+    new_group = np.empty(len(nodes), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = (nodes[1:] != nodes[:-1]) | (epochs[1:] != epochs[:-1])
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], len(nodes)) - 1
+    # avails are sorted within each group so a disagreement means first != last
+    bad = np.flatnonzero(avails[starts] != avails[ends])
+    result = []
+    for idx in bad:
+      group_avails = np.unique(avails[starts[idx]:ends[idx] + 1])
+      result.append((self.nodes[nodes[starts[idx]]], int(epochs[starts[idx]]), group_avails.tolist()))
+    return result
+
+  def get_epoch_histograms(self, only_certain=True, max_avail=255):
+    """
+    Per-epoch histogram of the availabilities (each node counted once per epoch and value).
+
+    Returns
+    -------
+    tuple
+        (epochs, histograms) where histograms[i, v] is the number of nodes with availability
+        `v` in epochs[i].
+    """
+    arrays = self.arrays
+    mask = self.certain_mask() if only_certain else np.ones(len(arrays["node"]), dtype=bool)
+    nodes, epochs = arrays["node"][mask], arrays["epoch"][mask]
+    avails = np.clip(arrays["avail"][mask], 0, max_avail)
+    if len(nodes) == 0:
+      return np.empty(0, dtype=np.int64), np.zeros((0, max_avail + 1), dtype=np.int64)
+    # deduplicate (node, epoch, avail) - multiple rounds/oracles reporting the same value
+    triplets = np.unique(np.stack([nodes.astype(np.int64), epochs, avails], axis=1), axis=0)
+    uniq_epochs, epoch_idx = np.unique(triplets[:, 1], return_inverse=True)
+    flat = epoch_idx * (max_avail + 1) + triplets[:, 2]
+    hist = np.bincount(flat, minlength=len(uniq_epochs) * (max_avail + 1))
+    return uniq_epochs, hist.reshape(len(uniq_epochs), max_avail + 1)
+
+
 class OracleTester:
   def __init__(
       self, bce, log,
       max_requests_rounds=ct.MAX_REQUEST_ROUNDS,
-      interval_seconds=ct.DEFAULT_INTERVAL_SECONDS
+      interval_seconds=ct.DEFAULT_INTERVAL_SECONDS,
+      max_parallel=ct.DEFAULT_MAX_PARALLEL,
+      max_requests_per_second=ct.DEFAULT_MAX_REQUESTS_PER_SECOND,
+      request_timeout=ct.DEFAULT_REQUEST_TIMEOUT,
+      base_url=None,
   ):
+    """
+    Parameters
+    ----------
+    max_parallel : int
+        Maximum number of concurrent oracle requests. Default 16.
+    max_requests_per_second : float or None
+        Rate limit of the requests sent to the oracle. None for no limit.
+    request_timeout : float
+        Timeout of each request in seconds.
+    base_url : str or None
+        Overrides the oracle API URL of the network (e.g. a local stub oracle server).
+    """
     self.bc = bce
     self.log = log
     self.TEST_ENDPOINT = ct.TEST_ENDPOINT
@@ -43,6 +220,20 @@ class OracleTester:
     self.request_rounds = 0
     self.max_request_rounds = max_requests_rounds
     self.interval_seconds = interval_seconds
+    self.max_parallel = max(1, max_parallel)
+    self.request_timeout = request_timeout
+    self.base_url = base_url
+    self.rate_limiter = RateLimiter(max_requests_per_second)
+    # columnar view of all the answers of the last `gather`
+    self.availability_stats = AvailabilityStats()
+
+    # one pooled keep-alive session shared by all the (concurrent) requests
+    self.session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+      pool_connections=1, pool_maxsize=self.max_parallel
+    )
+    self.session.mount("http://", adapter)
+    self.session.mount("https://", adapter)
 
     self.node_addr_to_alias = {}
     self.alias_to_node_addr = {}
@@ -68,6 +259,8 @@ class OracleTester:
       str
           The base URL for the oracle API server.
       """
+      if self.base_url is not None:
+        return self.base_url
       network = network or self.bc.evm_network
       res = self.bc.get_network_data(network=network).get(EvmNetData.EE_ORACLE_API_URL_KEY)
       if res is None:
@@ -96,7 +289,8 @@ class OracleTester:
       try:
         if debug:
           self.P(f"Making request to {request_url} with kwargs: {request_kwargs}")
-        response = requests.get(request_url, params=request_kwargs)
+        self.rate_limiter.acquire()
+        response = self.session.get(request_url, params=request_kwargs, timeout=self.request_timeout)
         response.raise_for_status()  # Raise an HTTPError if the status is not 2xx
         return response.json()  # Assuming the response is JSON
       except requests.RequestException as e:
@@ -141,18 +335,16 @@ class OracleTester:
       is_valid = manager_data.get("valid", False)
       min_certainty_prc = manager_data.get("supervisor_min_avail_prc", ct.DEFAULT_MIN_CERTAINTY_PRC)
 
-      current_epochs, current_avails, current_cert = [], [], []
-      for epoch_id, epoch_val in zip(epoch_ids, epoch_vals):
-        current_epochs.append(epoch_id)
-        current_avails.append(epoch_val)
-        current_cert.append(dict_certainty.get(str(epoch_id), 0))
-      # endfor epochs
+      current_epochs = list(epoch_ids or [])
+      current_avails = list(epoch_vals or [])[:len(current_epochs)]
+      current_epochs = current_epochs[:len(current_avails)]
+      current_cert = [dict_certainty.get(str(epoch_id), 0) for epoch_id in current_epochs]
       return current_epochs, current_avails, current_cert, is_valid, min_certainty_prc
 
     def handle_server_data(
         self, oracle_stats_dict: dict,
         sender: str, sender_eth_addr: str, sender_node_alias: str,
-        result: dict
+        result: dict, computed: tuple = None
     ):
       """
       Handle the data received from the oracle server.
@@ -169,6 +361,8 @@ class OracleTester:
           The alias of the sender.
       result : dict
           The result extracted from the response.
+      computed : tuple, optional
+          The output of `compute_epochs_availability_and_certainty` for `result` if already available.
       """
       if sender not in oracle_stats_dict:
         oracle_stats_dict[sender] = {
@@ -180,7 +374,9 @@ class OracleTester:
       # endif first time for this sender
       current_stats = oracle_stats_dict[sender]
       # TODO: maybe automate this (have only the list of keys to go through).
-      current_epochs, current_avails, current_certs, is_valid, min_certainty_prc = self.compute_epochs_availability_and_certainty(result)
+      if computed is None:
+        computed = self.compute_epochs_availability_and_certainty(result)
+      current_epochs, current_avails, current_certs, is_valid, min_certainty_prc = computed
       stats_epochs = current_stats.get("epochs", None)
       stats_avails = current_stats.get("avails", None)
       stats_certs = current_stats.get("certs", None)
@@ -247,12 +443,21 @@ class OracleTester:
       # endif first time for this node
       stats_dict[node_eth_addr][ct.FREQUENCY][sender] = stats_dict[node_eth_addr][ct.FREQUENCY].get(sender, 0) + 1
 
+      computed = self.compute_epochs_availability_and_certainty(result)
+      epochs, avails, certs, _, min_certainty_prc = computed
+      self.availability_stats.add(
+        node_eth_addr=node_eth_addr, oracle=sender,
+        epochs=epochs, avails=avails, certs=certs,
+        min_certainty_prc=min_certainty_prc, round_id=self.request_rounds,
+      )
+
       self.handle_server_data(
         oracle_stats_dict=stats_dict[node_eth_addr][ct.ORACLE_DATA],
         sender=sender,
         sender_eth_addr=sender_eth_addr,
         sender_node_alias=sender_node_alias,
-        result=result
+        result=result,
+        computed=computed,
       )
 
       return stats_dict
@@ -288,50 +493,62 @@ class OracleTester:
     request_kwargs = request_kwargs or {}
     stats_dict = {}
     self.request_rounds = 0
-    while not self.done(rounds):
-      try:
-        self.P(f'Starting request round {self.request_rounds + 1} for {len(nodes)} nodes...')
-        current_url = self.get_base_url(network=network) + self.TEST_ENDPOINT
-        # TODO: maybe shuffle the nodes list in order to avoid
-        #  the same order of requests in each round
-        #  relevant if the number of nodes is divisible by the number of oracles.
-        for node_data in nodes:
-          if isinstance(node_data, str):
-            node_data = {"eth_address": node_data}
-          # endif only eth address provided
-          eth_addr = node_data.get("eth_address", "N/A")
-          node_alias = node_data.get("alias", eth_addr)
-          node_addr = node_data.get("address", eth_addr)
-          self.P(f'\tRequesting data for {node_alias}...')
-          current_kwargs = {
-            "eth_node_addr": eth_addr,
-            **request_kwargs
-          }
-          response = self.make_request(current_url, request_kwargs=current_kwargs, debug=debug)
-          if response:
-            responses.append(response)
-            str_sender = response.get("node_addr")
-            self.P(f"Received response from {str_sender} with keys: {response.get('result').keys()}")
-            stats_dict = self.add_to_stats(
-              stats_dict=stats_dict,
-              response=response,
-              node_data=node_data,
-              debug=debug
-            )
-            if debug:
-              self.P(f'Full response: {response}')
-          else:
-            self.P(f"Request failed for {node_data['alias']}")
-        # endfor nodes
-      except Exception as e:
-        self.P(f"Request failed: {e}")
-      self.request_rounds += 1
-      if debug:
-        self.P(f'Debug mode was enabled. Exiting after one request round.')
-        break
-      time.sleep(self.interval_seconds)
-    # endwhile
-    self.P(f'Finished gathering data for {len(nodes)} nodes and {self.max_request_rounds}.')
+    self.availability_stats = AvailabilityStats()
+    nodes = [
+      {"eth_address": node_data} if isinstance(node_data, str) else node_data
+      for node_data in nodes
+    ]
+    n_workers = min(self.max_parallel, max(1, len(nodes)))
+    with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="oracle_gather") as executor:
+      while not self.done(rounds):
+        try:
+          self.P(f'Starting request round {self.request_rounds + 1} for {len(nodes)} nodes...')
+          current_url = self.get_base_url(network=network) + self.TEST_ENDPOINT
+          # TODO: maybe shuffle the nodes list in order to avoid
+          #  the same order of requests in each round
+          #  relevant if the number of nodes is divisible by the number of oracles.
+          futures = {}
+          for node_data in nodes:
+            eth_addr = node_data.get("eth_address", "N/A")
+            node_alias = node_data.get("alias", eth_addr)
+            self.P(f'\tRequesting data for {node_alias}...')
+            current_kwargs = {
+              "eth_node_addr": eth_addr,
+              **request_kwargs
+            }
+            future = executor.submit(self.make_request, current_url, request_kwargs=current_kwargs, debug=debug)
+            futures[future] = node_data
+          # endfor nodes
+          # the responses are added to the stats as they arrive (in this thread only)
+          for future in as_completed(futures):
+            node_data = futures[future]
+            response = future.result()
+            if response:
+              responses.append(response)
+              str_sender = response.get("node_addr")
+              self.P(f"Received response from {str_sender} with keys: {response.get('result').keys()}")
+              stats_dict = self.add_to_stats(
+                stats_dict=stats_dict,
+                response=response,
+                node_data=node_data,
+                debug=debug
+              ) or stats_dict
+              if debug:
+                self.P(f'Full response: {response}')
+            else:
+              self.P(f"Request failed for {node_data.get('alias', node_data.get('eth_address'))}")
+          # endfor responses
+        except Exception as e:
+          self.P(f"Request failed: {e}")
+        self.request_rounds += 1
+        if debug:
+          self.P(f'Debug mode was enabled. Exiting after one request round.')
+          break
+        if not self.done(rounds):
+          time.sleep(self.interval_seconds)
+      # endwhile
+    # endwith executor
+    self.P(f'Finished gathering data for {len(nodes)} nodes and {self.request_rounds} rounds.')
     return responses, stats_dict
 
   def gather_and_compare(self, nodes, request_kwargs=None, debug=False, rounds=None, network=None):
@@ -367,50 +584,25 @@ class OracleTester:
       rounds=rounds,
       network=network
     )
-    # Statistics for each node of each epoch
-    epochs_nodes_stats = {}
-    # Statistics for each epoch of each node
-    nodes_epochs_stats = {}
     for node_eth_addr, node_data in stats_dict.items():
-      oracle_data = node_data.get(ct.ORACLE_DATA, {})
-      errors = oracle_data.get("errors", [])
-      if len(errors) > 0:
-        self.P(f'#######################{node_eth_addr} errors########################')
-        self.P(f"Errors for {node_eth_addr}:\n" + '\n'.join(errors), color='r')
-        self.P(f'#######################{node_eth_addr} errors########################')
-      # endif
-
-      if node_eth_addr not in nodes_epochs_stats:
-        # This check should not be necessary, but just in case
-        nodes_epochs_stats[node_eth_addr] = {}
-      # endif first time for this node
-
-      epochs_stats = nodes_epochs_stats[node_eth_addr]
-      epochs = oracle_data.get("epochs", []),
-      avails = oracle_data.get("avails", []),
-      certs = oracle_data.get("certs", [])
-      min_certainty_prc = oracle_data.get("stats_min_certainty_prc", ct.DEFAULT_MIN_CERTAINTY_PRC)
-      for epoch, avail, cert in zip(epochs, avails, certs):
-        if epoch not in epochs_nodes_stats:
-          epochs_nodes_stats[epoch] = {}
-        # endif epoch not in stats
-        if epoch not in epochs_stats:
-          epochs_stats[epoch] = {}
-        # endif epoch not in stats
-        node_stats = epochs_nodes_stats[epoch]
-
-        if cert >= min_certainty_prc:
-          if avail not in epochs_stats[epoch]:
-            epochs_stats[epoch][avail] = set()
-          if avail not in node_stats:
-            node_stats[avail] = set()
-          # endif first time encountering this availability
-          epochs_stats[epoch][avail].add(node_eth_addr)
-          node_stats[avail].add(node_eth_addr)
-        # endif valid data
-      # endfor each epoch
-
-
+      for sender, sender_data in node_data.get(ct.ORACLE_DATA, {}).items():
+        errors = sender_data.get("errors", [])
+        if len(errors) > 0:
+          self.P(f'#######################{node_eth_addr} errors########################')
+          self.P(f"Errors of oracle {sender} for {node_eth_addr}:\n" + '\n'.join(errors), color='r')
+          self.P(f'#######################{node_eth_addr} errors########################')
+        # endif errors
+      # endfor oracles
+    # endfor nodes
+
+    # oracles (or rounds) that disagree on the certain availability of a node in an epoch
+    disagreements = self.availability_stats.get_disagreements(only_certain=True)
+    for node_eth_addr, epoch, avails in disagreements:
+      alias = self.node_eth_addr_to_alias.get(node_eth_addr) or node_eth_addr
+      self.P(f"Oracles disagree for {alias} on epoch {epoch}: {avails}", color='r')
+    # endfor disagreements
+    if len(disagreements) == 0:
+      self.P(f"No disagreements between oracles for {len(stats_dict)} nodes.", color='g')
     return responses, stats_dict
 
   def get_current_epoch(self, network=None):
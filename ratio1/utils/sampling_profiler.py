@@ -0,0 +1,187 @@
+"""
+Low-overhead statistical profiler of long running threads.
+
+A daemon thread periodically takes `sys._current_frames()` and, for each profiled thread,
+counts the current call stack (as a tuple of code objects, so a sample costs a walk of the
+frames and a dict update). The aggregated stacks are exported in the "folded" format used by
+flamegraph tools (`flamegraph.pl`, speedscope, inferno):
+
+  thread;outer_function (file.py:10);inner_function (file.py:42) 17
+
+Nothing runs when the profiler is not started.
+"""
+import os
+import sys
+import threading
+
+from time import time as tm
+
+
+DEFAULT_SAMPLE_RATE = 100 # samples per second
+DEFAULT_MAX_DEPTH = 128
+
+
+class SamplingProfiler(object):
+  def __init__(self, threads=None, sample_rate=DEFAULT_SAMPLE_RATE, max_depth=DEFAULT_MAX_DEPTH):
+    """
+    Parameters
+    ----------
+    threads : callable, optional
+        Called before each sample, returns a dict `{label: threading.Thread}` of the threads
+        to profile (threads that are not alive are skipped). By default all the threads except
+        the profiler one are profiled, labeled by their names.
+    sample_rate : float, optional
+        Samples per second, by default 100.
+    max_depth : int, optional
+        Maximum number of frames kept for a stack (the outermost ones are dropped).
+    """
+    if sample_rate <= 0:
+      raise ValueError("The sample rate must be positive, got {}".format(sample_rate))
+    self.__get_threads = threads
+    self.sample_rate = sample_rate
+    self.max_depth = max_depth
+    self.__stacks = {}
+    self.__n_samples = 0
+    self.__start_time = None
+    self.__elapsed = 0
+    self.__stop_event = threading.Event()
+    self.__thread = None
+    return
+
+  @property
+  def is_running(self):
+    return self.__thread is not None and self.__thread.is_alive()
+
+  @property
+  def n_samples(self):
+    return self.__n_samples
+
+  @property
+  def elapsed(self):
+    """
+    Total sampling time in seconds.
+    """
+    if self.__start_time is not None:
+      return self.__elapsed + tm() - self.__start_time
+    return self.__elapsed
+
+  def start(self):
+    if self.is_running:
+      return
+    self.__stop_event.clear()
+    self.__start_time = tm()
+    self.__thread = threading.Thread(target=self.__run, name='ratio1_sampling_profiler', daemon=True)
+    self.__thread.start()
+    return
+
+  def stop(self):
+    """
+    Stops the sampling. The aggregated stacks are kept until `reset`.
+    """
+    if self.__thread is None:
+      return
+    self.__stop_event.set()
+    if self.__thread is not threading.current_thread():
+      self.__thread.join()
+    self.__thread = None
+    self.__elapsed += tm() - self.__start_time
+    self.__start_time = None
+    return
+
+  def reset(self):
+    self.__stacks = {}
+    self.__n_samples = 0
+    self.__elapsed = 0
+    if self.__start_time is not None:
+      self.__start_time = tm()
+    return
+
+  def __get_profiled_threads(self):
+    if self.__get_threads is None:
+      own_ident = threading.get_ident()
+      return {t.ident: t.name for t in threading.enumerate() if t.ident != own_ident}
+    return {
+      thread.ident: label
+      for label, thread in self.__get_threads().items()
+      if thread is not None and thread.ident is not None
+    }
+
+  def _sample(self):
+    max_depth = self.max_depth
+    stacks = self.__stacks
+    frames = sys._current_frames()
+    for ident, label in self.__get_profiled_threads().items():
+      frame = frames.get(ident)
+      if frame is None:
+        continue
+      stack = []
+      while frame is not None and len(stack) < max_depth:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+      # endwhile frames
+      key = (label, tuple(stack))
+      stacks[key] = stacks.get(key, 0) + 1
+    # endfor threads
+    self.__n_samples += 1
+    return
+
+  def __run(self):
+    interval = 1 / self.sample_rate
+    while not self.__stop_event.wait(interval):
+      try:
+        self._sample()
+      except Exception:
+        # a profiled thread or the threads getter failing must not stop the sampling
+        pass
+    # endwhile
+    return
+
+  @staticmethod
+  def __format_code(code, cache):
+    result = cache.get(code)
+    if result is None:
+      name = getattr(code, 'co_qualname', code.co_name)
+      result = "{} ({}:{})".format(name, os.path.basename(code.co_filename), code.co_firstlineno)
+      result = result.replace(';', ':')
+      cache[code] = result
+    return result
+
+  def get_folded_stacks(self, threads=None):
+    """
+    Returns the aggregated stacks as folded lines (root frame first), most sampled first.
+
+    Parameters
+    ----------
+    threads : list[str], optional
+        Only the stacks of these thread labels. By default all of them.
+    """
+    cache = {}
+    lines = {}
+    for (label, stack), count in list(self.__stacks.items()):
+      if threads is not None and label not in threads:
+        continue
+      frames = [self.__format_code(code, cache) for code in reversed(stack)]
+      folded = ';'.join([str(label).replace(';', ':')] + frames)
+      lines[folded] = lines.get(folded, 0) + count
+    # endfor stacks
+    return ["{} {}".format(folded, count) for folded, count in sorted(lines.items(), key=lambda x: -x[1])]
+
+  def get_threads_samples(self):
+    """
+    Returns the number of samples that caught each thread, `{label: count}`.
+    """
+    result = {}
+    for (label, _), count in list(self.__stacks.items()):
+      result[label] = result.get(label, 0) + count
+    return result
+
+  def save_folded_stacks(self, path, threads=None):
+    """
+    Writes the folded stacks to `path` (e.g. for `flamegraph.pl path > flame.svg`) and returns it.
+    """
+    lines = self.get_folded_stacks(threads=threads)
+    with open(path, 'w') as fh:
+      fh.write('\n'.join(lines))
+      if len(lines) > 0:
+        fh.write('\n')
+    return path
@@ -0,0 +1,58 @@
+"""
+Validation throughput of `ASTChecker` over large generated plugin sources.
+
+The per-line cost should stay flat as the source grows (linear validation).
+"""
+import time
+
+from ratio1.code_cheker.base import UNALLOWED_DICT, UNALLOWED_TABLE
+from ratio1.code_cheker.checker import ASTChecker
+
+
+SAFE_IMPORTS = ['numpy', 'pandas', 'ratio1.const', 'os.path']
+
+BLOCK = """
+def process_{i}(plugin, data):
+  import numpy.linalg
+  from ratio1.const import PAYLOAD_DATA
+  result = []
+  for idx, item in enumerate(data):
+    if item is None:
+      continue
+    value = plugin.np.array(item).mean() + idx * {i}
+    result.append({{'idx': idx, 'value': value, 'name': item.name}})
+  plugin.P("Processed {{}} items".format(len(result)))
+  if len(result) > 10:
+    plugin.log.P("too many")
+  return result
+"""
+
+
+def generate_source(n_blocks):
+  return "\n".join(BLOCK.format(i=i) for i in range(n_blocks))
+
+
+def bench(n_blocks, n_runs=5):
+  code = generate_source(n_blocks)
+  n_lines = code.count('\n') + 1
+  timings = {}
+  for name, table in [('dict', UNALLOWED_DICT), ('table', UNALLOWED_TABLE)]:
+    best = None
+    for _ in range(n_runs):
+      start = time.perf_counter()
+      errors = ASTChecker(table, SAFE_IMPORTS).validate(code)
+      elapsed = time.perf_counter() - start
+      best = elapsed if best is None else min(best, elapsed)
+    timings[name] = best
+  # all generated blocks use `plugin.log` which is forbidden
+  assert len(errors) == 1 and len(list(errors.values())[0]) == n_blocks, errors
+  return n_lines, timings
+
+
+if __name__ == '__main__':
+  print("{:>8} {:>10} {:>12} {:>12}".format("lines", "best_ms", "us/line", "table_ms"))
+  for n_blocks in [10, 100, 1_000, 5_000]:
+    n_lines, timings = bench(n_blocks)
+    print("{:>8} {:>10.2f} {:>12.3f} {:>12.2f}".format(
+      n_lines, timings['dict'] * 1000, timings['dict'] / n_lines * 1e6, timings['table'] * 1000
+    ))
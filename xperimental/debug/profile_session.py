@@ -0,0 +1,22 @@
+from ratio1 import Session
+
+
+if __name__ == '__main__':
+  """
+  Profiles a live session for a while and saves the aggregated stacks of its threads
+  (main loop, payloads/heartbeats/notifications processing and the MQTT loops) in the
+  flamegraph "folded" format. Render them with:
+  ```
+  flamegraph.pl <file>.folded > session.svg
+  ```
+  or load the file in https://www.speedscope.app
+  """
+  session = Session(silent=True)
+  session.start_profiler(sample_rate=200)
+  session.wait(seconds=60, close_session_on_timeout=False)
+  session.stop_profiler()
+  fn = session.save_profile()
+  session.P(f"Most sampled stacks of the payloads thread (from {fn}):")
+  for line in session.log.get_profiler_folded_stacks(threads=['payloads'])[:10]:
+    session.P("  " + line)
+  session.close()
@@ -0,0 +1,104 @@
+"""
+Batched balance reads (`Web3BatchReader`) versus one request per call.
+
+By default runs against a stub JSON-RPC server started in-process (no Multicall3, so
+the JSON-RPC batch fallback is exercised). Set `RPC_URL` (e.g. a local Anvil/Hardhat
+node: `anvil` then `RPC_URL=http://127.0.0.1:8545`) to run against a real node.
+"""
+import json
+import os
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from web3 import Web3
+
+from ratio1.bc.evm_batch import (
+  BatchCall, TTLCache, Web3BatchReader, ETH_BALANCE_SIGNATURE, get_selector,
+)
+
+
+N_ADDRESSES = 500
+TOKEN = "0x" + "11" * 20
+
+
+class StubRPC(BaseHTTPRequestHandler):
+  n_http_requests = 0
+
+  def log_message(self, *args):
+    return
+
+  @staticmethod
+  def answer(req):
+    method, params = req["method"], req.get("params", [])
+    result = None
+    if method == "eth_chainId":
+      result = "0x7a69"
+    elif method == "eth_getBalance":
+      result = hex(int(params[0], 16) % 10**18)
+    elif method == "eth_call":
+      data = params[0]["data"]
+      to = params[0]["to"].lower()
+      if to != TOKEN:
+        return {"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32000, "message": "execution reverted"}}
+      if data.startswith("0x" + get_selector("decimals()").hex()):
+        result = "0x" + (18).to_bytes(32, "big").hex()
+      else:
+        result = "0x" + (int(data[-40:], 16) % 10**20).to_bytes(32, "big").hex()
+    return {"jsonrpc": "2.0", "id": req["id"], "result": result}
+
+  def do_POST(self):
+    StubRPC.n_http_requests += 1
+    body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+    if isinstance(body, list):
+      resp = [self.answer(x) for x in body]
+    else:
+      resp = self.answer(body)
+    data = json.dumps(resp).encode()
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+    return
+
+
+if __name__ == '__main__':
+  rpc_url = os.environ.get("RPC_URL")
+  if rpc_url is None:
+    server = HTTPServer(("127.0.0.1", 0), StubRPC)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    rpc_url = f"http://127.0.0.1:{server.server_port}"
+  w3 = Web3(Web3.HTTPProvider(rpc_url))
+  addresses = [w3.to_checksum_address("0x" + os.urandom(20).hex()) for _ in range(N_ADDRESSES)]
+
+  start = time.perf_counter()
+  single = [w3.eth.get_balance(a) for a in addresses]
+  t_single = time.perf_counter() - start
+
+  reader = Web3BatchReader(w3, "stub", cache=TTLCache())
+  calls = [
+    BatchCall(None, ETH_BALANCE_SIGNATURE, ["address"], [a], ["uint256"], a, "eth_balance")
+    for a in addresses
+  ]
+  start = time.perf_counter()
+  batched = reader.execute(calls)
+  t_batch = time.perf_counter() - start
+  start = time.perf_counter()
+  cached = reader.execute(calls)
+  t_cached = time.perf_counter() - start
+
+  assert single == batched == cached, "batched results differ from single calls"
+  print(f"{N_ADDRESSES} ETH balances: single {t_single*1000:.1f} ms, batched {t_batch*1000:.1f} ms "
+        f"({reader.n_requests} requests), cached {t_cached*1000:.2f} ms")
+
+  if "server" in globals():
+    token_calls = [BatchCall(TOKEN, "decimals()", [], [], ["uint8"], TOKEN, "decimals")] + [
+      BatchCall(TOKEN, "balanceOf(address)", ["address"], [a], ["uint256"], a, "r1_balance")
+      for a in addresses
+    ]
+    results = reader.execute(token_calls)
+    assert results[0] == 18
+    assert all(r == int(a[2:], 16) % 10**20 for r, a in zip(results[1:], addresses))
+    print(f"{N_ADDRESSES} token balances OK, total stub HTTP requests: {StubRPC.n_http_requests}")
@@ -0,0 +1,56 @@
+"""
+Batched frame encoding (`np_images_to_base64`) versus one `np_image_to_base64` call per
+frame, on 1080p batches. Requires numpy and pillow.
+"""
+import os
+import time
+
+import numpy as np
+
+from ratio1.logging.logger_mixins.computer_vision_mixin import _ComputerVisionMixin
+
+
+BATCH_SIZES = [4, 16]
+N_RUNS = 3
+SETTINGS = [
+  dict(quality=95, max_height=None),
+  dict(quality=80, max_height=720),
+]
+
+
+def make_frames(n, h=1080, w=1920):
+  # smooth gradients + noise: closer to real frames than pure noise for the JPEG encoder
+  rng = np.random.default_rng(42)
+  yy, xx = np.mgrid[0:h, 0:w]
+  base = np.stack([xx * 255 // w, yy * 255 // h, (xx + yy) * 255 // (w + h)], axis=-1).astype(np.int16)
+  return [
+    np.clip(base + rng.integers(-20, 20, size=(h, w, 3)), 0, 255).astype(np.uint8)
+    for _ in range(n)
+  ]
+
+
+def timeit(func):
+  best = float('inf')
+  for _ in range(N_RUNS):
+    start = time.perf_counter()
+    result = func()
+    best = min(best, time.perf_counter() - start)
+  return best, result
+
+
+if __name__ == '__main__':
+  cv = _ComputerVisionMixin
+  print(f"CPUs: {os.cpu_count()}")
+  for n in BATCH_SIZES:
+    frames = make_frames(n)
+    for setting in SETTINGS:
+      t_single, single = timeit(lambda: [cv.np_image_to_base64(f, **setting) for f in frames])
+      line = f"{n:>3} x 1080p {setting}: single {t_single*1000:8.1f} ms"
+      for workers in [1, 4, os.cpu_count()]:
+        t_batch, batched = timeit(lambda: cv.np_images_to_base64(frames, workers=workers, **setting))
+        assert batched == single, "batched output differs from the single-frame path"
+        line += f" | w={workers}: {t_batch*1000:8.1f} ms ({t_single / t_batch:.1f}x)"
+      if setting['max_height'] is not None:
+        t_fast, _ = timeit(lambda: cv.np_images_to_base64(frames, resample='bilinear', **setting))
+        line += f" | bilinear: {t_fast*1000:8.1f} ms"
+      print(line)
@@ -0,0 +1,56 @@
+"""
+Cold-start import guard for `import ratio1` and the r1ctl entry point.
+
+Runs `python -X importtime` in a fresh interpreter for each target, then checks two things:
+  - the cumulative import time stays under its budget,
+  - none of the heavy dependencies (pandas, web3, ...) is imported.
+Exits with 1 on any regression so it can be used as a CI step:
+
+  python xperimental/import_time/check_import_time.py
+"""
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ["pandas", "web3", "eth_account", "eth_utils", "cv2", "PIL", "paho", "pika"]
+
+# target statement -> (top-level module in the importtime report, budget in ms)
+TARGETS = {
+  "import ratio1"                 : ("ratio1", 50),
+  "import ratio1.cli.cli"         : ("ratio1.cli.cli", 400),
+  "import ratio1.cli.cli_commands": ("ratio1.cli.cli_commands", 400),
+}
+
+
+def import_report(statement):
+  proc = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", statement],
+    capture_output=True, text=True,
+  )
+  if proc.returncode != 0:
+    raise ImportError(proc.stderr.strip().splitlines()[-1])
+  report = {}
+  for line in proc.stderr.splitlines():
+    if not line.startswith("import time:") or "cumulative" in line:
+      continue
+    _, cumulative_us, name = line[len("import time:"):].split("|")
+    report[name.strip()] = int(cumulative_us)
+  return report
+
+
+if __name__ == '__main__':
+  failed = False
+  for statement, (module, budget_ms) in TARGETS.items():
+    try:
+      report = import_report(statement)
+    except ImportError as exc:
+      print(f"[FAIL] {statement:<34} {exc}")
+      failed = True
+      continue
+    elapsed_ms = report.get(module, 0) / 1000
+    heavy = sorted({name.split(".")[0] for name in report} & set(HEAVY_MODULES))
+    ok = elapsed_ms <= budget_ms and len(heavy) == 0
+    failed = failed or not ok
+    print(f"[{'OK' if ok else 'FAIL'}] {statement:<34} {elapsed_ms:8.1f} ms (budget {budget_ms} ms)"
+          f"{'  heavy: ' + ', '.join(heavy) if heavy else ''}")
+  sys.exit(1 if failed else 0)
@@ -0,0 +1,140 @@
+"""
+Decode/encode throughput of the compiled `Aixp1Formatter` versus the previous
+hand-written implementation (kept below as reference), checking that both produce
+the same output.
+
+Usage:
+  python decode_bench.py [corpus.jsonl]
+
+The corpus is a file with one recorded (already decrypted) message per line, e.g. dumped
+from a session `on_payload`/`on_heartbeat` callback with `json.dumps(dict_msg)`. Without
+it a synthetic corpus of payloads, heartbeats and notifications is generated.
+"""
+import json
+import random
+import sys
+import time
+
+from copy import deepcopy
+
+from ratio1.io_formatter.default.aixp1 import Aixp1Formatter
+
+
+N_SYNTHETIC = 5000
+N_RUNS = 5
+
+
+def legacy_encode(output):
+  output = dict(output)
+  event_type = output.pop('EE_EVENT_TYPE', None)
+  for k in [
+    'EE_MESSAGE_ID', 'EE_MESSAGE_SEQ', 'EE_TOTAL_MESSAGES', 'EE_TIMESTAMP', 'EE_ID',
+    'STREAM_NAME', 'SIGNATURE', 'INSTANCE_ID', 'EE_TIMEZONE', 'EE_VERSION', 'EE_TZ',
+    'INITIATOR_ID', 'SESSION_ID',
+  ]:
+    output.pop(k, None)
+  lvl_0_dct = {"DATA": {}}
+  lvl_1_dct = lvl_0_dct['DATA']
+  if event_type == 'PAYLOAD':
+    output.pop('STREAM')
+    output.pop('PIPELINE')
+    lvl_1_dct['PLUGIN_META'] = {}
+    for k in [k for k in output.keys() if k.startswith('_P_')]:
+      lvl_1_dct['PLUGIN_META'][k] = output.pop(k, None)
+    lvl_1_dct['PIPELINE_META'] = {}
+    for k in [k for k in output.keys() if k.startswith('_C_')]:
+      lvl_1_dct['PIPELINE_META'][k] = output.pop(k, None)
+  for k, v in output.items():
+    lvl_1_dct[k] = v
+  return lvl_0_dct
+
+
+def legacy_decode(encoded_output):
+  node_id, pipeline, signature, instance_id = encoded_output.get('EE_PAYLOAD_PATH', [None, None, None, None])
+  encoded_output['EE_ID'] = node_id
+  if encoded_output['EE_EVENT_TYPE'] != 'HEARTBEAT':
+    encoded_output['STREAM_NAME'] = pipeline
+  if pipeline is not None:
+    encoded_output['SIGNATURE'] = signature
+  if instance_id is not None:
+    encoded_output['INSTANCE_ID'] = instance_id
+  lvl_1_dct = encoded_output.pop('DATA')
+  if encoded_output['EE_EVENT_TYPE'] == 'PAYLOAD':
+    encoded_output['STREAM'] = pipeline
+    encoded_output['PIPELINE'] = pipeline
+    for k, v in (lvl_1_dct.pop('PLUGIN_META', {}) or {}).items():
+      encoded_output[k] = v
+    for k, v in (lvl_1_dct.pop('PIPELINE_META', {}) or {}).items():
+      encoded_output[k] = v
+    encoded_output['PLUGIN_CATEGORY'] = 'general'
+  for k, v in lvl_1_dct.items():
+    encoded_output[k] = v
+  return encoded_output
+
+
+def make_synthetic_corpus(n):
+  rnd = random.Random(42)
+  corpus = []
+  for i in range(n):
+    event_type = rnd.choice(['PAYLOAD'] * 6 + ['HEARTBEAT', 'NOTIFICATION'])
+    node, pipeline = f"node-{i % 20}", f"pipe-{i % 50}"
+    signature, instance = ("NET_MON_01", f"inst-{i % 7}") if event_type != 'HEARTBEAT' else (None, None)
+    msg = {
+      'EE_EVENT_TYPE': event_type, 'EE_FORMATTER': 'aixp1',
+      'EE_PAYLOAD_PATH': [node, pipeline if event_type != 'HEARTBEAT' else None, signature, instance],
+      'EE_MESSAGE_ID': f"id-{i}", 'EE_TIMESTAMP': '2025-01-24 14:39:22.555466', 'EE_SENDER': f"0xai_{node}",
+    }
+    data = {f"FIELD_{j}": rnd.random() for j in range(rnd.randint(5, 40))}
+    if event_type == 'PAYLOAD':
+      data['PLUGIN_META'] = {f"_P_META_{j}": j for j in range(15)}
+      data['PIPELINE_META'] = {f"_C_META_{j}": str(j) for j in range(10)}
+    msg['DATA'] = data
+    corpus.append(msg)
+  return corpus
+
+
+def bench(name, func, corpus):
+  best = float('inf')
+  for _ in range(N_RUNS):
+    msgs = deepcopy(corpus)  # decoding works in place
+    start = time.perf_counter()
+    for msg in msgs:
+      func(msg)
+    best = min(best, time.perf_counter() - start)
+  print(f"  {name:<16} {len(corpus) / best:>12,.0f} msg/s")
+  return best
+
+
+class _NoLog:
+  DEBUG = False
+
+  def P(self, *args, **kwargs):
+    print(*args)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    with open(sys.argv[1]) as fh:
+      corpus = [json.loads(line) for line in fh if line.strip()]
+  else:
+    corpus = make_synthetic_corpus(N_SYNTHETIC)
+  corpus = [msg for msg in corpus if 'DATA' in msg]
+  print(f"Corpus: {len(corpus)} aixp1 messages")
+
+  formatter = Aixp1Formatter(log=_NoLog(), signature='aixp1')
+  for msg in corpus:
+    legacy, compiled = legacy_decode(deepcopy(msg)), formatter._decode_output(deepcopy(msg))
+    assert legacy == compiled and list(legacy) == list(compiled), "decoded output differs"
+    assert legacy_encode(legacy) == formatter._encode_output(compiled), "encoded output differs"
+
+  print("Decode:")
+  t_legacy = bench("legacy", legacy_decode, corpus)
+  t_compiled = bench("compiled", formatter._decode_output, corpus)
+  t_full = bench("decode_output", formatter.decode_output, corpus)
+  print(f"  speedup {t_legacy / t_compiled:.2f}x")
+
+  decoded = [formatter._decode_output(deepcopy(msg)) for msg in corpus]
+  print("Encode:")
+  t_legacy = bench("legacy", legacy_encode, decoded)
+  t_compiled = bench("compiled", formatter._encode_output, decoded)
+  print(f"  speedup {t_legacy / t_compiled:.2f}x")
@@ -0,0 +1,90 @@
+"""
+Instrumentation overhead of a `start_timer`/`end_timer` pair (flat, nested, named section
+and from several threads on the same section) and check of the running statistics against
+NumPy on the recorded laps.
+"""
+import threading
+import time
+
+import numpy as np
+
+from ratio1.logging.logger_mixins.timers_mixin import _TimersMixin, MAX_LAPS
+
+
+N_PAIRS = 20_000
+N_RUNS = 30
+N_THREADS = 4
+
+
+class _TimersLog(_TimersMixin):
+  DEBUG = True
+  config_data = None
+
+  def P(self, *args, **kwargs):
+    print(*args)
+
+  def verbose_log(self, msg, **kwargs):
+    print(msg)
+
+  def now_str(self, **kwargs):
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def best_of(func):
+  best = float('inf')
+  for _ in range(N_RUNS):
+    start = time.perf_counter()
+    func()
+    best = min(best, time.perf_counter() - start)
+  return best
+
+
+def flat(log, section=None):
+  start_timer, end_timer = log.start_timer, log.end_timer
+  for _ in range(N_PAIRS):
+    start_timer('flat', section=section)
+    end_timer('flat', section=section)
+  return
+
+
+def nested(log):
+  start_timer, end_timer = log.start_timer, log.end_timer
+  for _ in range(N_PAIRS // 2):
+    start_timer('outer')
+    start_timer('inner')
+    end_timer('inner')
+    end_timer('outer')
+  return
+
+
+def threaded(log):
+  threads = [threading.Thread(target=flat, args=(log, 'threads')) for _ in range(N_THREADS)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  return
+
+
+if __name__ == '__main__':
+  log = _TimersLog()
+  for name, func, n_pairs in [
+    ("flat", lambda: flat(log), N_PAIRS),
+    ("named section", lambda: flat(log, section='named'), N_PAIRS),
+    ("nested", lambda: nested(log), N_PAIRS),
+    (f"{N_THREADS} threads", lambda: threaded(log), N_PAIRS * N_THREADS),
+  ]:
+    print(f"{name:<14} {best_of(func) / n_pairs * 1e6:.2f} us/pair")
+
+  laps = []
+  for i in range(3 * MAX_LAPS):
+    log.start_timer('stats', section='check')
+    time.sleep(1e-5 * (i % 7))
+    laps.append(log.end_timer('stats', section='check'))
+  timer = log.get_timer('stats', section='check')
+  assert timer['COUNT'] == len(laps) and np.isclose(timer['MEAN'], np.mean(laps))
+  assert np.isclose(log.get_timer_std('stats', section='check'), np.std(laps))
+  assert np.allclose(timer['LAPS'].values(), laps[-MAX_LAPS:])
+  assert log.get_timer_count('flat', section='threads') == N_RUNS * N_PAIRS * N_THREADS
+  assert log.get_faulty_timers() == {section: [] for section in log.timers}
+  log.show_timers()
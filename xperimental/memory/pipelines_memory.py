@@ -0,0 +1,96 @@
+"""
+Memory held per tracked remote pipeline: builds N attached `Pipeline`s the way the
+session does when receiving net-config data (`__process_node_pipelines`) and measures
+the allocated memory with tracemalloc. Also measures the per-deploy `Transaction` +
+`Response` objects.
+
+Usage:
+  python pipelines_memory.py [n_pipelines]
+"""
+import gc
+import sys
+import tracemalloc
+
+from ratio1.base.pipeline import Pipeline
+from ratio1.base.transaction import Transaction
+from ratio1.base.responses import PipelineOKResponse, PluginConfigOKResponse
+
+
+N_PIPELINES = 10_000
+N_INSTANCES = 3
+
+
+class _Log:
+  def P(self, *args, **kwargs):
+    return
+
+  def D(self, *args, **kwargs):
+    return
+
+
+def make_configs(n):
+  configs = []
+  for i in range(n):
+    configs.append({
+      'NAME': f"pipeline_{i}",
+      'TYPE': 'VideoStream',
+      'URL': f"rtsp://camera-{i}.local/stream",
+      'CAP_RESOLUTION': 10,
+      'LIVE_FEED': True,
+      'RECONNECTABLE': 'YES',
+      'PLUGINS': [
+        {
+          'SIGNATURE': 'OBJECT_TRACKING_01',
+          'INSTANCES': [
+            {'INSTANCE_ID': f"inst_{j}", 'AI_ENGINE': 'lowres_general_detector', 'PROCESS_DELAY': 1, 'OBJECT_TYPE': ['person']}
+            for j in range(N_INSTANCES)
+          ]
+        }
+      ],
+    })
+  return configs
+
+
+def create_pipeline(config, log, plugins_statuses=None):
+  # same steps as GenericSession.__create_pipeline_from_config
+  pipeline_config = {k.lower(): v for k, v in config.items()}
+  name = pipeline_config.pop('name', None)
+  plugins = pipeline_config.pop('plugins', None)
+  return Pipeline(
+    is_attached=True, session=None, log=log, node_addr="0xai_node", name=name,
+    plugins=plugins, existing_config=pipeline_config, plugins_statuses=plugins_statuses,
+  )
+
+
+def measure(func, n):
+  gc.collect()
+  tracemalloc.start()
+  base, _ = tracemalloc.get_traced_memory()
+  result = func()
+  gc.collect()
+  current, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return (current - base) / n, result
+
+
+if __name__ == '__main__':
+  n = int(sys.argv[1]) if len(sys.argv) > 1 else N_PIPELINES
+  log = _Log()
+  configs = make_configs(n)  # held by the session anyway, excluded from the measure
+
+  per_pipeline, pipelines = measure(lambda: [create_pipeline(c, log) for c in configs], n)
+  print(f"{n} attached pipelines x {N_INSTANCES} instances: {per_pipeline:,.0f} B/pipeline (untouched)")
+
+  per_pipeline_used, _ = measure(lambda: [len(p.lst_plugin_instances) for p in pipelines], n)
+  print(f"  + materialized instances on first use: {per_pipeline_used:,.0f} B/pipeline")
+
+  def make_transactions():
+    return [
+      Transaction(log, "session", lst_required_responses=[
+        PipelineOKResponse("0xai_node", f"pipeline_{i}"),
+        PluginConfigOKResponse("0xai_node", f"pipeline_{i}", "OBJECT_TRACKING_01", "inst_0"),
+      ])
+      for i in range(n)
+    ]
+  per_transaction, _ = measure(make_transactions, n)
+  print(f"{n} transactions with 2 responses: {per_transaction:,.0f} B/transaction")
@@ -0,0 +1,64 @@
+"""
+Node lookups with 10k simulated nodes: the previous dict-scan approach of
+`GenericSession` versus `NodeRegistry`.
+"""
+import random
+import time
+
+from ratio1.base.node_registry import NodeRegistry
+
+
+N_NODES = 10_000
+N_QUERIES = 1_000
+ONLINE_TIMEOUT = 60
+
+
+def timeit(func, n=N_QUERIES):
+  start = time.perf_counter()
+  for _ in range(n):
+    func()
+  return (time.perf_counter() - start) / n * 1e6
+
+
+if __name__ == '__main__':
+  now = time.time()
+  registry = NodeRegistry()
+  last_seen, addr_to_alias = {}, {}
+  # 30% of the nodes are offline (seen more than ONLINE_TIMEOUT ago)
+  seen_times = sorted(now - random.uniform(0, ONLINE_TIMEOUT / 0.7) for _ in range(N_NODES))
+  for i, seen_time in enumerate(seen_times):
+    addr, alias = f"0xai_node_{i}", f"alias-{i}"
+    registry.track(addr, alias=alias, eth_address=f"0x{i:040x}", seen_time=seen_time)
+    last_seen[addr] = seen_time
+    addr_to_alias[addr] = alias
+  can_send = {addr: random.random() < 0.5 for addr in last_seen}
+
+  def old_active():
+    return [k for k, v in last_seen.items() if (time.time() - v) < ONLINE_TIMEOUT]
+
+  def old_check_online():
+    aliases = {v: k for k, v in addr_to_alias.items()}
+    return aliases.get("alias-9999") in old_active()
+
+  def old_allowed():
+    active = old_active()
+    return [n for n in can_send if can_send[n] and n in active]
+
+  def new_check_online():
+    return registry.is_online(registry.resolve("alias-9999"), ONLINE_TIMEOUT)
+
+  def new_allowed():
+    t = time.time()
+    return [n for n, v in can_send.items() if v and registry.is_online(n, ONLINE_TIMEOUT, now=t)]
+
+  assert sorted(old_active()) == sorted(registry.get_online_nodes(ONLINE_TIMEOUT))
+  print(f"{N_NODES} nodes, {len(old_active())} online")
+  print("{:<22} {:>12} {:>12}".format("operation", "old_us", "registry_us"))
+  print("{:<22} {:>12.1f} {:>12.1f}".format(
+    "get_active_nodes", timeit(old_active), timeit(lambda: registry.get_online_nodes(ONLINE_TIMEOUT))
+  ))
+  print("{:<22} {:>12.1f} {:>12.1f}".format("check_node_online", timeit(old_check_online), timeit(new_check_online)))
+  print("{:<22} {:>12.1f} {:>12.1f}".format("get_allowed_nodes", timeit(old_allowed, n=3), timeit(new_allowed, n=20)))
+  print("{:<22} {:>12} {:>12.2f}".format("track (heartbeat)", "-", timeit(
+    lambda: registry.track(f"0xai_node_{random.randrange(N_NODES)}", alias="x"), n=100_000
+  )))
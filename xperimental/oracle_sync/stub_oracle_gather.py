@@ -0,0 +1,68 @@
+"""
+`OracleTester.gather` against a local stub oracle server: sequential (max_parallel=1)
+versus concurrent gathering for a few hundred nodes.
+"""
+import json
+import random
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from ratio1 import Logger
+from ratio1.utils.oracle_sync.oracle_tester import OracleTester
+
+
+N_NODES = 300
+LATENCY = 0.05
+ORACLES = ["0xai_oracle_1", "0xai_oracle_2"]
+
+
+class StubOracle(BaseHTTPRequestHandler):
+  def log_message(self, *args):
+    return
+
+  def do_GET(self):
+    url = urlparse(self.path)
+    params = {k: v[0] for k, v in parse_qs(url.query).items()}
+    time.sleep(LATENCY)
+    start, end = int(params.get("start_epoch", 1)), int(params.get("end_epoch", 5))
+    epochs = list(range(start, end + 1))
+    seed = sum(map(ord, params.get("eth_node_addr", "")))
+    oracle = random.choice(ORACLES)
+    result = {
+      "EE_SENDER": oracle,
+      "EE_ETH_SENDER": "0x" + oracle[-1] * 40,
+      "server_alias": oracle.replace("0xai_", ""),
+      "epochs": epochs,
+      "epochs_vals": [(seed + e) % 256 for e in epochs],
+      "oracle": {"manager": {"certainty": {str(e): 1.0 for e in epochs}, "valid": True}},
+    }
+    data = json.dumps({"node_addr": oracle, "result": result}).encode()
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+    return
+
+
+if __name__ == '__main__':
+  server = ThreadingHTTPServer(("127.0.0.1", 0), StubOracle)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  base_url = f"http://127.0.0.1:{server.server_port}"
+  log = Logger("ORCT", base_folder=".", app_folder="_local_cache", silent=True)
+  nodes = [{"eth_address": "0x" + f"{i:040x}", "alias": f"node-{i}"} for i in range(N_NODES)]
+  kwargs = {"start_epoch": 10, "end_epoch": 20}
+
+  for max_parallel in [1, 32]:
+    tester = OracleTester(
+      bce=None, log=log, base_url=base_url, interval_seconds=0,
+      max_parallel=max_parallel, max_requests_per_second=None,
+    )
+    start = time.perf_counter()
+    responses, stats = tester.gather(nodes=nodes, request_kwargs=kwargs, rounds=1)
+    elapsed = time.perf_counter() - start
+    print(f"max_parallel={max_parallel:2}: {len(responses)} responses, {len(stats)} nodes in {elapsed:.2f}s")
+  server.shutdown()
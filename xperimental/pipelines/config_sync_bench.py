@@ -0,0 +1,98 @@
+"""
+Cost of refreshing the tracked remote pipelines from repeated net-config data (same steps
+as `GenericSession.__process_node_pipelines`): steady state (configs equal to the previously
+received ones, only a compare per pipeline) versus one changed instance per pipeline. Also checks that the
+received configs are not modified and that only the changed instances are updated.
+"""
+import json
+import time
+
+from copy import deepcopy
+
+from ratio1.base.pipeline import Pipeline
+
+
+N_PIPELINES = 5000
+N_INSTANCES = 3
+N_REFRESHES = 5
+
+
+class _Log:
+  def P(self, *args, **kwargs):
+    return
+
+  def D(self, *args, **kwargs):
+    return
+
+
+def make_configs(n, process_delay=1):
+  return [
+    {
+      'NAME': f"pipeline_{i}", 'TYPE': 'VideoStream', 'URL': f"rtsp://camera-{i}.local/stream",
+      'CAP_RESOLUTION': 10, 'INITIATOR_ADDR': '0xai_initiator', 'LAST_UPDATE_TIME': '2025-03-01 10:00:00',
+      'PLUGINS': [{
+        'SIGNATURE': 'OBJECT_TRACKING_01',
+        'INSTANCES': [
+          {'INSTANCE_ID': f"inst_{j}", 'AI_ENGINE': 'lowres_general_detector',
+           'PROCESS_DELAY': process_delay if j == 0 else 1, 'OBJECT_TYPE': ['person']}
+          for j in range(N_INSTANCES)
+        ]
+      }],
+    }
+    for i in range(n)
+  ]
+
+
+def process_node_pipelines(dct_pipelines, configs, log):
+  for config in configs:
+    name = config['NAME']
+    pipeline = dct_pipelines.get(name)
+    if pipeline is not None:
+      pipeline._sync_configuration_with_remote(config=config, plugins_statuses=[])
+    else:
+      pipeline_config = {k.lower(): v for k, v in config.items()}
+      pipeline_config.pop('name')
+      plugins = pipeline_config.pop('plugins')
+      dct_pipelines[name] = Pipeline(
+        is_attached=True, session=None, log=log, node_addr="0xai_node", name=name,
+        plugins=plugins, existing_config=pipeline_config, plugins_statuses=[], remote_config=config,
+      )
+  return
+
+
+def timeit(func):
+  start = time.perf_counter()
+  func()
+  return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+  log = _Log()
+  pipelines = {}
+  process_node_pipelines(pipelines, make_configs(N_PIPELINES), log)
+  for pipeline in pipelines.values():
+    _ = pipeline.lst_plugin_instances  # as if all of them were in use
+
+  refreshes = [make_configs(N_PIPELINES) for _ in range(N_REFRESHES)]
+  snapshot = json.dumps(refreshes)
+  t_same = min(timeit(lambda: process_node_pipelines(pipelines, configs, log)) for configs in refreshes)
+  assert json.dumps(refreshes) == snapshot, "the received configs were modified"
+
+  instances_before = {name: list(p.lst_plugin_instances) for name, p in pipelines.items()}
+  configs_before = {name: [dict(i.config) for i in p.lst_plugin_instances] for name, p in pipelines.items()}
+  changed = [make_configs(N_PIPELINES, process_delay=2 + k) for k in range(N_REFRESHES)]
+  t_changed = min(timeit(lambda: process_node_pipelines(pipelines, configs, log)) for configs in changed)
+  for name, pipeline in pipelines.items():
+    assert pipeline.lst_plugin_instances == instances_before[name], "instances were re-created"
+    assert pipeline.lst_plugin_instances[0].config['PROCESS_DELAY'] == 1 + N_REFRESHES
+    assert [i.config for i in pipeline.lst_plugin_instances[1:]] == configs_before[name][1:]
+
+  removed = deepcopy(changed[-1])
+  for config in removed:
+    config['PLUGINS'][0]['INSTANCES'].pop()
+  process_node_pipelines(pipelines, removed, log)
+  assert all(len(p.lst_plugin_instances) == N_INSTANCES - 1 for p in pipelines.values())
+
+  print(f"{N_PIPELINES} pipelines x {N_INSTANCES} instances, refresh: "
+        f"unchanged {t_same * 1000:.1f} ms ({t_same / N_PIPELINES * 1e6:.1f} us/pipeline), "
+        f"one instance changed {t_changed * 1000:.1f} ms ({t_changed / N_PIPELINES * 1e6:.1f} us/pipeline)")